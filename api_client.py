@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+HTTP client for the StorySage API.
+Wraps a pooled requests.Session with timeouts, exponential backoff with
+full jitter on connection errors and 5xx responses, and pagination that
+yields items page by page so large catalogs are never held in memory.
+
+Pagination understands both styles the API may use:
+  cursor: {"data": [...], "next_cursor": "abc"} (or pagination.next_cursor)
+  pages:  {"data": [...], "pagination": {"page": 1, "total_pages": 5}}
+          or {"data": [...], "has_more": true}
+A response with neither is treated as the only page.
+
+Given a http_cache.ResponseCache, GETs are sent with the cached validators
+and a 304 is returned to the caller as the cached 200 response.
+
+stream_items() decodes each page incrementally (see json_stream) for
+responses too large to hold as Python objects.
+"""
+
+import os
+import random
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.sessions import merge_setting
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_environ_proxies
+
+import json_stream
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+DEFAULT_PAGE_SIZE = 200
+STREAM_CHUNK_SIZE = 64 * 1024
+RETRY_STATUSES = {500, 502, 503, 504}
+CA_BUNDLE_VARS = ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE")
+
+
+class ApiError(Exception):
+    """Raised when a request still fails after all retries"""
+
+
+class EnvCachingSession(requests.Session):
+    """
+    A Session that resolves environment proxies once per scheme, host and
+    proxy environment instead of on every request; requests' lookup (and
+    its no_proxy check) costs more than a small request to a nearby
+    server. Everything else is as requests does it: trust_env is honoured,
+    each host (audio hosts, redirects) gets its own settings, and CA
+    bundle variables and .netrc are still read per request.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._env_proxies = {}
+
+    def merge_environment_settings(self, url, proxies, stream, verify, cert):
+        if not self.trust_env:
+            return super().merge_environment_settings(url, proxies, stream, verify, cert)
+        proxies = dict(proxies or {})
+        parts = urlsplit(url)
+        environ = tuple(sorted((name, value) for name, value in os.environ.items()
+                               if name.lower().endswith("_proxy")))
+        key = (parts.scheme, parts.netloc, proxies.get("no_proxy"), environ)
+        env_proxies = self._env_proxies.get(key)
+        if env_proxies is None:
+            env_proxies = self._env_proxies[key] = get_environ_proxies(url, no_proxy=proxies.get("no_proxy"))
+        for scheme, proxy in env_proxies.items():
+            proxies.setdefault(scheme, proxy)
+        if verify is True or verify is None:
+            verify = next((os.environ[name] for name in CA_BUNDLE_VARS if os.environ.get(name)), verify)
+        return {
+            "proxies": merge_setting(proxies, self.proxies),
+            "stream": merge_setting(stream, self.stream),
+            "verify": merge_setting(verify, self.verify),
+            "cert": merge_setting(cert, self.cert),
+        }
+
+
+class ApiClient:
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, backoff_max=DEFAULT_BACKOFF_MAX,
+                 page_size=DEFAULT_PAGE_SIZE, pool_size=10, session=None, cache=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.page_size = page_size
+        self.cache = cache
+        self.session = session or EnvCachingSession()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.requests_made = 0
+
+    def close(self):
+        if self.cache:
+            self.cache.flush()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _sleep_before_retry(self, attempt):
+        """Full jitter: uniform in [0, min(cap, base * 2^attempt)]"""
+        time.sleep(random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt))))
+
+    def request(self, method, endpoint, **kwargs):
+        """
+        Send a request, retrying connection errors, timeouts and 5xx.
+        4xx responses are not retried. Returns the requests.Response.
+        """
+        url = endpoint if endpoint.startswith("http") else f"{self.base_url}{endpoint}"
+        kwargs.setdefault("timeout", self.timeout)
+        cache_key = None
+        if self.cache and method == "GET":
+            cache_key = requests.Request(method, url, params=kwargs.pop("params", None)).prepare().url
+            url = cache_key
+            kwargs["headers"] = {**self.cache.validators(cache_key), **(kwargs.get("headers") or {})}
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._sleep_before_retry(attempt - 1)
+            try:
+                self.requests_made += 1
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                continue
+            if response.status_code in RETRY_STATUSES:
+                last_error = requests.HTTPError(
+                    f"{response.status_code} Server Error for url: {url}", response=response)
+                response.close()
+                continue
+            response.raise_for_status()
+            if cache_key:
+                return self._through_cache(cache_key, response, kwargs.get("stream", False))
+            return response
+        raise ApiError(f"{method} {url} failed after {self.retries + 1} attempts: {last_error}")
+
+    def _through_cache(self, key, response, stream):
+        if response.status_code == 304:
+            cached = self.cache.open(key) if stream else self.cache.load(key)
+            response.close()
+            if cached is None:
+                # Evicted between sending the validators and the reply
+                return self.request("GET", key, stream=stream)
+            body, headers = cached
+            response.status_code = 200
+            response.headers = CaseInsensitiveDict(headers)
+            response.from_cache = True
+            if stream:
+                response.raw = body
+            else:
+                response._content = body
+        elif response.status_code == 200:
+            if not stream:
+                self.cache.store(key, response.content, response.headers)
+            else:
+                writer = self.cache.writer(key, response.headers)
+                if writer:
+                    response.raw = _TeeBody(response.raw, writer)
+        return response
+
+    def get(self, endpoint, **kwargs):
+        return self.request("GET", endpoint, **kwargs)
+
+    def get_json(self, endpoint, params=None):
+        """GET and decode JSON, unwrapping a top-level 'data' key"""
+        data = self.get(endpoint, params=params).json()
+        return data['data'] if isinstance(data, dict) and 'data' in data else data
+
+    def iter_pages(self, endpoint, params=None, page_size=None):
+        """Yield one list of items per page until the server runs out"""
+        params = dict(params or {})
+        params.setdefault("limit", page_size or self.page_size)
+        page = 1
+        while True:
+            items, cursor, total_pages, has_more = parse_page(self.get(endpoint, params=params).json())
+            yield items
+
+            if cursor:
+                params["cursor"] = cursor
+                continue
+            if (total_pages and page < total_pages) or (total_pages is None and has_more):
+                page += 1
+                params["page"] = page
+                continue
+            return
+
+    def iter_items(self, endpoint, params=None, page_size=None):
+        """Yield items across all pages"""
+        for items in self.iter_pages(endpoint, params, page_size):
+            yield from items
+
+    def stream_items(self, endpoint, params=None, page_size=None):
+        """
+        iter_items(), but each page body is decoded as it arrives, so only
+        one item is held in memory however large the page is. A failure
+        part way through a page is raised rather than retried, since its
+        earlier items have already been yielded.
+        """
+        params = dict(params or {})
+        params.setdefault("limit", page_size or self.page_size)
+        page = 1
+        while True:
+            meta = {}
+            yield from self.stream_page(endpoint, params, meta)
+            _, cursor, total_pages, has_more = parse_page(meta)
+
+            if cursor:
+                params["cursor"] = cursor
+                continue
+            if (total_pages and page < total_pages) or (total_pages is None and has_more):
+                page += 1
+                params["page"] = page
+                continue
+            return
+
+
+    def stream_page(self, endpoint, params=None, meta=None):
+        """
+        Yield the items of one page as its body arrives, storing the
+        body's other top-level keys (pagination) in meta
+        """
+        response = self.get(endpoint, params=params, stream=True)
+        try:
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            yield from json_stream.iter_items(chunks, meta)
+            # Read to EOF so the body is cached and the connection reused
+            for _ in chunks:
+                pass
+        finally:
+            response.close()
+            if getattr(response, "from_cache", False):
+                response.raw.close()
+
+    def get_page(self, endpoint, params=None):
+        """One page as parse_page() returns it, decoded from the stream"""
+        meta = {}
+        items = list(self.stream_page(endpoint, params, meta))
+        _, cursor, total_pages, has_more = parse_page(meta)
+        return items, cursor, total_pages, has_more
+
+
+def parse_page(payload):
+    """
+    Split a page response into (items, next_cursor, total_pages, has_more).
+    A bare list is a single page with no pagination.
+    """
+    if not isinstance(payload, dict):
+        return payload, None, None, False
+    pagination = payload.get('pagination') or {}
+    cursor = payload.get('next_cursor') or pagination.get('next_cursor')
+    total_pages = pagination.get('total_pages')
+    has_more = payload.get('has_more', pagination.get('has_more', False))
+    return payload.get('data', []), cursor, total_pages, has_more
+
+
+class _TeeBody:
+    """
+    Stands in for a streamed response's raw body, copying everything read
+    into a cache writer and committing it once the body is fully read
+    """
+
+    def __init__(self, raw, writer):
+        self.raw = raw
+        self.writer = writer
+
+    def read(self, amt=None, **kwargs):
+        data = self.raw.read(amt, decode_content=True)
+        if data:
+            self.writer.write(data)
+        else:
+            self.writer.commit()
+        return data
+
+    def close(self):
+        # No-op after commit(); drops a partly read body
+        self.writer.abort()
+        self.raw.close()
+
+    def release_conn(self):
+        self.raw.release_conn()
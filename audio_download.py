@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Parallel, resumable download of story audio from the server.
+Fetches each story's original_audio_url into the iOS audio directory over
+a shared connection pool. Interrupted transfers are kept as hidden .part
+files and resumed with an HTTP Range request (guarded by If-Range, so a
+changed file restarts from zero), finished files are checked against the
+story's audio_sha256 or the server's Digest header before being moved
+into place, and an optional token bucket caps total bandwidth.
+
+A download manifest records each file's URL, size, hash and validators so
+later runs send conditional requests and skip unchanged audio.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+import json_stream
+from api_client import ApiError
+from audio_sync import StageReport, StageResult, file_sha256, load_manifest, save_manifest
+
+DOWNLOAD_MANIFEST_NAME = ".download_manifest.json"
+DEFAULT_WORKERS = 4
+CHUNK_SIZE = 64 * 1024
+
+
+class TokenBucket:
+    """
+    Bandwidth cap shared by all download threads. Each read takes its size
+    in tokens; a thread that overdraws the bucket sleeps off the debt.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def digest_header_sha256(headers):
+    """Hex sha256 from a 'Digest: sha-256=<base64>' response header, if any"""
+    for part in headers.get('Digest', '').split(','):
+        algorithm, _, value = part.strip().partition('=')
+        if algorithm.lower() == 'sha-256' and value:
+            try:
+                return base64.b64decode(value).hex()
+            except ValueError:
+                return None
+    return None
+
+
+def iter_audio_sources(stories_path, names=None):
+    """
+    (file name, url, expected sha256) for each story with server audio,
+    decoding stories.json one story at a time. Only names in `names` are
+    yielded when it is given.
+    """
+    with open(stories_path, 'rb') as f:
+        for story in json_stream.iter_items(iter(lambda: f.read(CHUNK_SIZE), b'')):
+            name = story.get('local_audio_file')
+            url = story.get('original_audio_url')
+            if name and url and (names is None or name in names):
+                yield name, url, story.get('audio_sha256')
+
+
+def _part_paths(dest):
+    part = dest.with_name(f".{dest.name}.part")
+    return part, part.with_name(part.name + ".json")
+
+
+def _read_resume_info(info_path, url):
+    """Validators saved when the partial file was started, if it was for this URL"""
+    try:
+        with open(info_path) as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return info if info.get('url') == url else None
+
+
+def _discard_partial(part, info_path):
+    part.unlink(missing_ok=True)
+    info_path.unlink(missing_ok=True)
+
+
+class AudioDownloader:
+    """
+    Downloads files on a thread pool as they are submitted; finish() waits
+    for them, updates the download manifest and returns a StageReport.
+    """
+
+    def __init__(self, client, dest_dir, workers=DEFAULT_WORKERS, max_bytes_per_second=None):
+        self.client = client
+        self.dest_dir = Path(dest_dir)
+        self.dest_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.dest_dir / DOWNLOAD_MANIFEST_NAME
+        self.manifest = load_manifest(self.manifest_path)
+        self.bucket = TokenBucket(max_bytes_per_second) if max_bytes_per_second else None
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._futures = {}
+        self._entries = {}
+        self._start = time.perf_counter()
+
+    def submit(self, name, url, sha256=None):
+        """Queue one file; repeated names (shared audio) are downloaded once"""
+        if name not in self._futures:
+            self._futures[name] = self._pool.submit(self._download, name, url, sha256)
+
+    def finish(self):
+        report = StageReport()
+        report.results = [future.result() for future in self._futures.values()]
+        self._pool.shutdown()
+
+        manifest = dict(self.manifest)
+        manifest.update(self._entries)
+        if manifest != self.manifest:
+            save_manifest(self.manifest_path, manifest)
+            self.manifest = manifest
+        report.elapsed = time.perf_counter() - self._start
+        return report
+
+    def _download(self, name, url, expected_sha256):
+        """Runs on a worker thread; returns a StageResult"""
+        dest = self.dest_dir / name
+        entry = self.manifest.get(name)
+        current = entry and entry.get('url') == url and dest.exists() \
+            and dest.stat().st_size == entry.get('size')
+
+        # Content-addressed: nothing to ask the server
+        if current and expected_sha256 and entry.get('sha256') == expected_sha256:
+            return StageResult(name, "skipped", entry['size'])
+        # A copy staged some other way that already has the right content
+        if not entry and expected_sha256 and dest.exists() and file_sha256(dest) == expected_sha256:
+            self._record(name, url, dest.stat().st_size, expected_sha256, {})
+            return StageResult(name, "skipped", dest.stat().st_size, sha256=expected_sha256)
+
+        attempts = self.client.retries + 1
+        error = ""
+        for attempt in range(attempts):
+            if attempt:
+                self.client._sleep_before_retry(attempt - 1)
+            try:
+                return self._transfer(name, url, dest, expected_sha256, entry if current else None)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status == 404:
+                    return StageResult(name, "missing", error=str(e))
+                if status == 416:
+                    # The partial file no longer fits the remote one; start over
+                    _discard_partial(*_part_paths(dest))
+                    error = str(e)
+                    continue
+                return StageResult(name, "failed", error=str(e))
+            except ApiError as e:
+                return StageResult(name, "failed", error=str(e))
+            except (requests.RequestException, OSError) as e:
+                # Dropped mid-body: keep the .part file and resume from it
+                error = str(e)
+        return StageResult(name, "failed", error=error)
+
+    def _transfer(self, name, url, dest, expected_sha256, entry):
+        part, info_path = _part_paths(dest)
+        # Content-Length and Range offsets count bytes on the wire, so ask
+        # for the file as-is rather than compressed
+        headers = {'Accept-Encoding': 'identity'}
+        offset = 0
+        resume = _read_resume_info(info_path, url) if part.exists() else None
+        if resume and (resume.get('etag') or resume.get('last_modified')):
+            offset = part.stat().st_size
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = resume.get('etag') or resume['last_modified']
+        elif entry and (entry.get('etag') or entry.get('last_modified')):
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        with self.client.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 304:
+                return StageResult(name, "skipped", entry['size'])
+
+            digest = hashlib.sha256()
+            encoded = response.headers.get('Content-Encoding', 'identity').lower() != 'identity'
+            if response.status_code == 206:
+                if not response.headers.get('Content-Range', '').startswith(f"bytes {offset}-"):
+                    _discard_partial(part, info_path)
+                    raise OSError(f"unexpected Content-Range {response.headers.get('Content-Range')!r}")
+                mode = 'ab'
+                with open(part, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                method = "resumed"
+                total = response.headers['Content-Range'].rpartition('/')[2]
+                expected_size = int(total) if total.isdigit() else None
+            else:
+                # Full body: the file changed, or the server ignored the Range
+                mode = 'wb'
+                method = "download"
+                length = response.headers.get('Content-Length')
+                expected_size = int(length) if length and length.isdigit() and not encoded else None
+                # A body compressed anyway can't be measured or resumed in decoded bytes
+                if not encoded:
+                    validators = {"url": url, "etag": response.headers.get('ETag'),
+                                  "last_modified": response.headers.get('Last-Modified')}
+                    with open(info_path, 'w') as f:
+                        json.dump(validators, f)
+                else:
+                    info_path.unlink(missing_ok=True)
+
+            with open(part, mode) as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if self.bucket:
+                        self.bucket.consume(len(chunk))
+                    f.write(chunk)
+                    digest.update(chunk)
+
+            size = part.stat().st_size
+            sha256 = digest.hexdigest()
+            wanted = expected_sha256 or digest_header_sha256(response.headers)
+            if expected_size is not None and size != expected_size:
+                # Short read the server didn't report as an error; resume it
+                raise OSError(f"received {size} of {expected_size} bytes")
+            if wanted and sha256 != wanted:
+                _discard_partial(part, info_path)
+                return StageResult(name, "failed", size, method, error="checksum mismatch")
+
+            resume = _read_resume_info(info_path, url) or {}
+            os.replace(part, dest)
+            info_path.unlink(missing_ok=True)
+            self._record(name, url, size, sha256, resume)
+            return StageResult(name, "copied", size, method, sha256)
+
+    def _record(self, name, url, size, sha256, validators):
+        # Each name is handled by a single worker, so plain assignment is safe
+        self._entries[name] = {
+            "url": url,
+            "size": size,
+            "sha256": sha256,
+            "etag": validators.get('etag'),
+            "last_modified": validators.get('last_modified'),
+        }
+
+
+def download_audio(client, sources, dest_dir, workers=DEFAULT_WORKERS, max_bytes_per_second=None):
+    """Download (name, url, sha256) sources into dest_dir; returns a StageReport"""
+    downloader = AudioDownloader(client, dest_dir, workers, max_bytes_per_second)
+    for name, url, sha256 in sources:
+        downloader.submit(name, url, sha256)
+    return downloader.finish()
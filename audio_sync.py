@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Incremental, parallel audio staging for the iOS resource bundle.
+Keeps a manifest of every file placed in the output directory so unchanged
+audio is skipped instead of re-copied on every extraction run, and copies,
+hashes and verifies the rest across a bounded thread pool.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+MANIFEST_NAME = ".audio_manifest.json"
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_INFLIGHT_BYTES = 256 * 1024 * 1024
+
+# Manifest fields describing the placed file after in-place post-processing
+POSTPROCESS_KEYS = ("dest_size", "dest_sha256")
+
+# Linux FICLONE ioctl (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+
+def file_sha256(path):
+    """Hash a file in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path):
+    """Load the sync manifest, or an empty one if missing or unreadable"""
+    try:
+        with open(manifest_path) as f:
+            data = json.load(f)
+        return data.get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest_path, files):
+    """Write the sync manifest atomically"""
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({"version": 1, "files": files}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def _reflink(src, dst):
+    """Copy-on-write clone of src to dst; returns False if unsupported"""
+    if sys.platform == "darwin":
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        return libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+    if sys.platform.startswith("linux"):
+        import fcntl
+        try:
+            with open(src, 'rb') as s, open(dst, 'wb') as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            return True
+        except OSError:
+            dst.unlink(missing_ok=True)
+            return False
+    return False
+
+
+def place_file(src, dst):
+    """
+    Atomically place src at dst, preferring a reflink, then a hardlink,
+    then a full copy. Returns the method used.
+    """
+    tmp_path = dst.with_name(f".{dst.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    if _reflink(src, tmp_path):
+        method = "reflink"
+    else:
+        try:
+            os.link(src, tmp_path)
+            method = "hardlink"
+        except OSError:
+            shutil.copy2(src, tmp_path)
+            method = "copy"
+
+    os.replace(tmp_path, dst)
+    return method
+
+
+class ByteBudget:
+    """Caps the number of bytes in flight across worker threads"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size):
+        with self._cond:
+            # A file larger than the whole budget may run alone
+            while self.in_flight and self.in_flight + size > self.limit:
+                self._cond.wait()
+            self.in_flight += size
+
+    def release(self, size):
+        with self._cond:
+            self.in_flight -= size
+            self._cond.notify_all()
+
+
+@dataclass
+class StageResult:
+    """Outcome of staging a single file"""
+    name: str
+    status: str  # copied / skipped / missing / failed
+    size: int = 0
+    method: str = ""
+    sha256: str = ""
+    error: str = ""
+
+
+@dataclass
+class StageReport:
+    """Aggregate outcome of a staging run"""
+    results: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def by_status(self, status):
+        return [r for r in self.results if r.status == status]
+
+    @property
+    def copied(self):
+        return self.by_status("copied")
+
+    @property
+    def skipped(self):
+        return self.by_status("skipped")
+
+    @property
+    def missing(self):
+        return self.by_status("missing")
+
+    @property
+    def failed(self):
+        return self.by_status("failed")
+
+    @property
+    def bytes_processed(self):
+        """Bytes read or written, i.e. everything that wasn't a stat-only skip"""
+        return sum(r.size for r in self.results if r.sha256 and r.status != "missing")
+
+    @property
+    def throughput(self):
+        """Bytes per second over the whole run"""
+        return self.bytes_processed / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        mb = self.bytes_processed / (1024 * 1024)
+        return (f"{len(self.copied)} copied, {len(self.skipped)} unchanged, "
+                f"{len(self.removed)} removed, {len(self.missing)} missing, "
+                f"{len(self.failed)} failed "
+                f"({mb:.1f} MB in {self.elapsed:.2f}s, {mb / self.elapsed if self.elapsed else 0:.1f} MB/s)")
+
+
+def _expected_dest_size(entry, src_size):
+    """Post-processing (e.g. MP3 slimming) may leave dest smaller than source"""
+    return entry.get('dest_size', src_size)
+
+
+def _is_unchanged(src_stat, dst, entry):
+    """Cheap stat-only check against the manifest entry"""
+    if not entry or not dst.exists():
+        return False
+    return (entry.get('size') == src_stat.st_size
+            and entry.get('mtime_ns') == src_stat.st_mtime_ns
+            and dst.stat().st_size == _expected_dest_size(entry, src_stat.st_size))
+
+
+def stage_file(name, src, dst, entry, budget, verify=True):
+    """
+    Stage one file. Runs on a worker thread, so it only returns a result
+    and never touches shared state other than the byte budget.
+    """
+    try:
+        src_stat = src.stat()
+    except FileNotFoundError:
+        return StageResult(name, "missing")
+
+    if _is_unchanged(src_stat, dst, entry):
+        return StageResult(name, "skipped", src_stat.st_size, sha256="")
+
+    budget.acquire(src_stat.st_size)
+    try:
+        sha256 = file_sha256(src)
+        if entry and entry.get('sha256') == sha256 and dst.exists() \
+                and dst.stat().st_size == _expected_dest_size(entry, src_stat.st_size):
+            return StageResult(name, "skipped", src_stat.st_size, sha256=sha256)
+
+        method = place_file(src, dst)
+        # Links share the source blocks; only a real copy can diverge
+        if verify and method == "copy" and file_sha256(dst) != sha256:
+            dst.unlink(missing_ok=True)
+            return StageResult(name, "failed", src_stat.st_size, method,
+                               error="checksum mismatch after copy")
+        return StageResult(name, "copied", src_stat.st_size, method, sha256)
+    except OSError as e:
+        return StageResult(name, "failed", src_stat.st_size, error=str(e))
+    finally:
+        budget.release(src_stat.st_size)
+
+
+def sync_audio_files(file_map, dest_dir, prune=True, workers=DEFAULT_WORKERS,
+                     max_inflight_bytes=DEFAULT_MAX_INFLIGHT_BYTES, verify=True, producer=None):
+    """
+    Sync audio into dest_dir across a thread pool.
+
+    file_map maps destination file name -> source path. Files whose size and
+    mtime match the manifest are skipped without being read; files whose
+    stat changed are re-hashed and only replaced if their content differs.
+    Copies are verified against the source hash. With prune, files in
+    dest_dir that are no longer in file_map are removed; without it the
+    manifest keeps the entries of files outside file_map that are still
+    in dest_dir, so syncing a subset doesn't force a recopy of the rest.
+
+    When several tools stage into the same directory, each passes its own
+    producer name: its entries are tagged with it and prune then only
+    removes files this producer placed, leaving everyone else's alone.
+
+    Returns a StageReport with one StageResult per file.
+    """
+    dest_dir = Path(dest_dir)
+    manifest_path = dest_dir / MANIFEST_NAME
+    old_manifest = load_manifest(manifest_path)
+    new_manifest = {}
+    budget = ByteBudget(max_inflight_bytes)
+    report = StageReport()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(stage_file, name, Path(src), dest_dir / name,
+                        old_manifest.get(name), budget, verify)
+            for name, src in file_map.items()
+        ]
+        report.results = [f.result() for f in futures]
+
+    for result in report.results:
+        entry = old_manifest.get(result.name)
+        if result.status in ("copied", "skipped") and result.sha256:
+            src_stat = Path(file_map[result.name]).stat()
+            new_manifest[result.name] = {
+                "source": str(file_map[result.name]),
+                "size": src_stat.st_size,
+                "mtime_ns": src_stat.st_mtime_ns,
+                "sha256": result.sha256,
+            }
+            if producer:
+                new_manifest[result.name]["producer"] = producer
+            if result.status == "skipped" and entry:
+                # Same content as before, so any post-processing still applies
+                for key in POSTPROCESS_KEYS:
+                    if key in entry:
+                        new_manifest[result.name][key] = entry[key]
+        elif entry and (dest_dir / result.name).exists():
+            # Stat-only skips, and missing sources whose last copy is still
+            # in place, keep their entry so a transient gap doesn't force a recopy
+            new_manifest[result.name] = dict(entry, producer=producer) if producer else entry
+
+    if prune and producer:
+        for name, entry in old_manifest.items():
+            if name not in file_map and entry.get('producer') == producer:
+                path = dest_dir / name
+                if path.is_file():
+                    path.unlink()
+                    report.removed.append(name)
+    elif prune:
+        for path in dest_dir.iterdir():
+            if path.is_file() and path.name != MANIFEST_NAME \
+                    and not path.name.startswith('.') and path.name not in file_map:
+                path.unlink()
+                report.removed.append(path.name)
+
+    # Files outside file_map that are still there keep their entries
+    for name, entry in old_manifest.items():
+        if name not in file_map and (dest_dir / name).exists():
+            new_manifest[name] = entry
+
+    if new_manifest != old_manifest:
+        save_manifest(manifest_path, new_manifest)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def remove_audio_files(dest_dir, names, producer=None, manifest_names=(MANIFEST_NAME,)):
+    """
+    Delete names from dest_dir and drop them from each manifest there.
+    With producer, files another producer staged are left in place.
+    Returns the names removed.
+    """
+    dest_dir = Path(dest_dir)
+    owners = load_manifest(dest_dir / MANIFEST_NAME)
+    removed = []
+    for name in names:
+        owner = owners.get(name, {}).get('producer')
+        if producer and owner not in (None, producer):
+            continue
+        (dest_dir / name).unlink(missing_ok=True)
+        removed.append(name)
+
+    if removed:
+        for manifest_name in manifest_names:
+            manifest_path = dest_dir / manifest_name
+            manifest = load_manifest(manifest_path)
+            kept = {name: entry for name, entry in manifest.items() if name not in removed}
+            if kept != manifest:
+                save_manifest(manifest_path, kept)
+    return removed
+
+
+def record_postprocessed(dest_dir, updates):
+    """
+    Record files that were rewritten in place after staging.
+    updates maps name -> (dest_size, dest_sha256). Later syncs then treat
+    the rewritten file as up to date instead of re-copying the source.
+    """
+    manifest_path = Path(dest_dir) / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    for name, (dest_size, dest_sha256) in updates.items():
+        if name in manifest:
+            manifest[name]["dest_size"] = dest_size
+            manifest[name]["dest_sha256"] = dest_sha256
+    save_manifest(manifest_path, manifest)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full stories.json decode + grouping (what LocalDataManager does
+at launch) against an indexed lookup in the SQLite catalog.
+"""
+
+import argparse
+import json
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import sqlite_catalog
+from extract_data import write_stories_json
+from synthetic_catalog import generate_categories, generate_stories
+
+
+def time_it(fn, repeat):
+    """Median wall time of fn over repeat runs, in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def json_decode_and_group(stories_path, category, grade_level):
+    """Decode everything, then group by category and grade like updateGroupedCollections"""
+    with open(stories_path, 'rb') as f:
+        stories = json.load(f)['stories']
+    by_category = {}
+    by_grade = {}
+    for story in stories:
+        by_category.setdefault(story['category'], []).append(story)
+        by_grade.setdefault(story['gradeLevel'], []).append(story)
+    return [s for s in by_category.get(category, []) if s['gradeLevel'] == grade_level]
+
+
+def sqlite_lookup(db_path, category, grade_level):
+    """Open the database and run one indexed query"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return sqlite_catalog.query_stories(conn, category, grade_level)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stories", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        stories_path = tmp / "stories.json"
+        db_path = tmp / "catalog.sqlite"
+
+        write_stories_json(generate_stories(args.stories), stories_path)
+        sqlite_catalog.write_catalog_db(generate_stories(args.stories),
+                                        generate_categories(), db_path)
+
+        category, grade_level = "firefly-forest", "grade_prek"
+        expected = json_decode_and_group(stories_path, category, grade_level)
+        assert [s['id'] for s in sqlite_lookup(db_path, category, grade_level)] == \
+            [s['id'] for s in expected]
+
+        results = {
+            "stories": args.stories,
+            "matches": len(expected),
+            "json_bytes": stories_path.stat().st_size,
+            "sqlite_bytes": db_path.stat().st_size,
+            "json_decode_group_ms": time_it(
+                lambda: json_decode_and_group(stories_path, category, grade_level), args.repeat),
+            "sqlite_indexed_lookup_ms": time_it(
+                lambda: sqlite_lookup(db_path, category, grade_level), args.repeat),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"📚 {results['stories']} stories, {results['matches']} in {category}/{grade_level}")
+    print(f"📄 stories.json:   {results['json_bytes'] / 1024:.0f} KB, "
+          f"decode + group {results['json_decode_group_ms']:.1f} ms")
+    print(f"🗄️  catalog.sqlite: {results['sqlite_bytes'] / 1024:.0f} KB, "
+          f"indexed lookup {results['sqlite_indexed_lookup_ms']:.1f} ms")
+    speedup = results['json_decode_group_ms'] / results['sqlite_indexed_lookup_ms']
+    print(f"⚡ Speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
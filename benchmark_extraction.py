@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Scalability benchmark for the extract_data pipeline.
+Generates synthetic catalogs and MP3 stubs shaped like the real catalog,
+runs each pipeline stage separately and records wall time, peak RSS and
+bytes written per stage. Every catalog size runs in a fresh subprocess so
+peak RSS reflects that size alone.
+
+Usage:
+    python3 benchmark_extraction.py --sizes 1000 10000 100000 --output results.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import synthetic_catalog
+
+# Stages in the order extract_data.main() runs them
+STAGES = [
+    "create_directories",
+    "copy_audio_files",
+    "measure_audio_durations",
+    "create_json_files",
+    "create_sqlite_catalog",
+    "create_search_index",
+    "create_seek_tables",
+    "create_resource_list",
+]
+
+
+def peak_rss_bytes():
+    """Peak RSS of this process and its finished children (e.g. process pools)"""
+    usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is KB on Linux and bytes on macOS
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def tree_bytes(root):
+    """
+    Total size of files under root. Stage output is measured as the growth
+    of this, so hardlinked or reflinked audio counts at its full size.
+    """
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            try:
+                total += os.stat(os.path.join(dirpath, name)).st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+def run_stages(stories, workdir, audio_seconds):
+    """Build a synthetic catalog in workdir and time each stage"""
+    import extract_data
+
+    workdir = Path(workdir)
+    catalog_dir = workdir / "catalog"
+    audio_dir = workdir / "audio_files"
+    output_dir = workdir / "Resources"
+    catalog_dir.mkdir()
+    audio_dir.mkdir()
+
+    start = time.perf_counter()
+    stories_source = catalog_dir / "stories.jsonl"
+    synthetic_catalog.write_stories_jsonl(stories_source, stories)
+    categories_source = catalog_dir / "categories.json"
+    with open(categories_source, 'w') as f:
+        json.dump(synthetic_catalog.generate_categories(), f)
+    _, audio_bytes = synthetic_catalog.write_audio_stubs(
+        synthetic_catalog.generate_stories(stories), audio_dir, audio_seconds)
+    setup_seconds = time.perf_counter() - start
+
+    extract_data.STORIES_SOURCE = stories_source
+    extract_data.CATEGORIES_SOURCE = categories_source
+    extract_data.AUDIO_DIR = audio_dir
+    extract_data.OUTPUT_DIR = output_dir
+    extract_data.OUTPUT_AUDIO_DIR = output_dir / "Audio"
+    extract_data.OUTPUT_DATA_DIR = output_dir / "Data"
+
+    results = []
+    durations = None
+    devnull = open(os.devnull, 'w')
+    for stage in STAGES:
+        fn = getattr(extract_data, stage)
+        args = (durations,) if stage in ("create_json_files", "create_sqlite_catalog") else ()
+        before = tree_bytes(output_dir) if output_dir.exists() else 0
+
+        sys.stdout = devnull
+        try:
+            stage_start = time.perf_counter()
+            value = fn(*args)
+            elapsed = time.perf_counter() - stage_start
+        finally:
+            sys.stdout = sys.__stdout__
+
+        if stage == "measure_audio_durations":
+            durations = value
+        results.append({
+            "stage": stage,
+            "seconds": round(elapsed, 4),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "bytes_written": tree_bytes(output_dir) - before,
+        })
+    devnull.close()
+
+    return {
+        "stories": stories,
+        "audio_seconds": audio_seconds,
+        "source_audio_bytes": audio_bytes,
+        "setup_seconds": round(setup_seconds, 4),
+        "total_seconds": round(sum(r["seconds"] for r in results), 4),
+        "stages": results,
+    }
+
+
+def run_size(stories, audio_seconds, keep):
+    """Run one catalog size in a fresh interpreter"""
+    workdir = tempfile.mkdtemp(prefix=f"storysage-bench-{stories}-")
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker",
+           "--sizes", str(stories), "--audio-seconds", str(audio_seconds), "--workdir", workdir]
+    try:
+        output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        return json.loads(output)
+    finally:
+        if not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--audio-seconds", type=float, default=1.0,
+                        help="length of each MP3 stub (default: 1s, about 16 KB)")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--keep", action="store_true", help="keep the generated work directories")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_stages(args.sizes[0], args.workdir, args.audio_seconds)))
+        return
+
+    runs = []
+    for stories in args.sizes:
+        print(f"⏱️  {stories} stories...", file=sys.stderr)
+        result = run_size(stories, args.audio_seconds, args.keep)
+        runs.append(result)
+        for stage in result["stages"]:
+            print(f"  {stage['stage']:24s} {stage['seconds']:8.3f}s  "
+                  f"rss {stage['peak_rss_bytes'] / 2**20:7.1f} MB  "
+                  f"wrote {stage['bytes_written'] / 2**20:8.1f} MB", file=sys.stderr)
+
+    report = {"python": sys.version.split()[0], "platform": sys.platform, "runs": runs}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pbxproj edits through the shared object graph against the
+per-file whole-text regex rewrites the project scripts used to do.
+Builds a synthetic project by registering N audio files in the real
+StorySage project, then times parsing, a no-op round trip, and adding
+and removing a batch of files each way. The regex removal costs a few
+whole-file passes per file, so it is timed on --regex-edits files and
+scaled up to the batch size.
+
+Usage:
+    python3 benchmark_pbxproj.py --refs 10000 --edits 500 --output results.json
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from pbxproj import PbxProject
+
+PROJECT_FILE = Path(__file__).resolve().parent / "StorySage.xcodeproj" / "project.pbxproj"
+
+
+def time_it(fn, repeat):
+    """Median wall time of fn over repeat runs, in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def synthetic_id(*parts):
+    return hashlib.sha256("/".join(parts).encode()).hexdigest()[:24].upper()
+
+
+def synthetic_project(refs):
+    """The StorySage project with refs extra MP3s in its group and Resources phase"""
+    project = PbxProject.load(PROJECT_FILE)
+    group = project.find_group("StorySage")
+    phase = project.build_phase("PBXResourcesBuildPhase")
+    for i in range(refs):
+        name = f"synthetic-{i:06d}.mp3"
+        project.add_file(group, name, "audio.mp3", phase,
+                         synthetic_id("ref", name), synthetic_id("build", name))
+    return project.to_text()
+
+
+def graph_add(text, names):
+    project = PbxProject(text)
+    group = project.find_group("StorySage")
+    phase = project.build_phase("PBXResourcesBuildPhase")
+    for name in names:
+        project.add_file(group, name, "audio.mp3", phase)
+    return project.to_text()
+
+
+def graph_remove(text, names):
+    project = PbxProject(text)
+    names = set(names)
+    project.remove_files(ref.id for ref in project.isa("PBXFileReference") if ref.get('path') in names)
+    return project.to_text()
+
+
+def regex_add(text, names):
+    """fix_resources.py before the object graph: string splices and a [^}]+ re.sub per batch"""
+    build_files, file_refs, resource_refs = [], [], []
+    for name in names:
+        build_id, file_id = synthetic_id("b", name), synthetic_id("f", name)
+        build_files.append(f"\t\t{build_id} /* {name} in Resources */ = {{isa = PBXBuildFile; "
+                           f"fileRef = {file_id} /* {name} */; }};")
+        file_refs.append(f'\t\t{file_id} /* {name} */ = {{isa = PBXFileReference; '
+                         f'lastKnownFileType = audio.mp3; path = "{name}"; sourceTree = "<group>"; }};')
+        resource_refs.append(f"\t\t\t\t{build_id} /* {name} in Resources */,")
+    end = text.find("/* End PBXBuildFile section */")
+    text = text[:end] + '\n'.join(build_files) + '\n' + text[end:]
+    end = text.find("/* End PBXFileReference section */")
+    text = text[:end] + '\n'.join(file_refs) + '\n' + text[end:]
+    match = re.search(r'/\* Resources \*/ = \{[^}]+files = \(([^)]*)\);', text, re.DOTALL)
+    files = match.group(1).rstrip() + '\n' + '\n'.join(resource_refs)
+    return re.sub(r'(/\* Resources \*/ = \{[^}]+files = \()[^)]*(\);)',
+                  lambda m: f"{m.group(1)}{files}\n\t\t\t{m.group(2)}", text, flags=re.DOTALL)
+
+
+def regex_remove(text, names):
+    """fix_project.py before the object graph: four whole-file re.sub passes per file"""
+    for name in names:
+        escaped = re.escape(name)
+        match = re.search(rf'(\w{{24}}) /\* {escaped} \*/', text)
+        if not match:
+            continue
+        file_id = match.group(1)
+        text = re.sub(rf'\s*\w{{24}} /\* {escaped} in Resources \*/ = {{isa = PBXBuildFile; '
+                      rf'fileRef = {file_id} /\* {escaped} \*/; }};', '', text)
+        text = re.sub(rf'\s*{file_id} /\* {escaped} \*/ = {{isa = PBXFileReference; [^}}]+}};', '', text)
+        text = re.sub(rf'\s*\w{{24}} /\* {escaped} in Resources \*/,', '', text)
+        text = re.sub(rf'\s*{file_id} /\* {escaped} \*/,', '', text)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pbxproj editing approaches")
+    parser.add_argument("--refs", type=int, nargs="+", default=[10000],
+                        help="file references in the synthetic project")
+    parser.add_argument("--edits", type=int, default=500, help="files added and removed per run")
+    parser.add_argument("--regex-edits", type=int, default=10,
+                        help="files removed by the regex baseline, which is projected to --edits")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    runs = []
+    for refs in args.refs:
+        text = synthetic_project(refs)
+        added = [f"added-{i:06d}.mp3" for i in range(args.edits)]
+        removed = [f"synthetic-{i:06d}.mp3" for i in range(0, refs, max(1, refs // args.edits))][:args.edits]
+
+        project = PbxProject(text)
+        for obj in project.objects.values():
+            obj.text = None
+        result = {
+            "refs": refs,
+            "edits": len(added),
+            "bytes": len(text.encode()),
+            "objects": len(project.objects),
+            "roundtrip_identical": PbxProject(text).to_text() == text,
+            "reserialized_identical": project.to_text() == text,
+            "parse_ms": time_it(lambda: PbxProject(text), args.repeat),
+            "graph_add_ms": time_it(lambda: graph_add(text, added), args.repeat),
+            "regex_add_ms": time_it(lambda: regex_add(text, added), args.repeat),
+            "graph_remove_ms": time_it(lambda: graph_remove(text, removed), args.repeat),
+            "regex_remove_ms": time_it(lambda: regex_remove(text, removed[:args.regex_edits]), 1)
+                               * len(removed) / min(len(removed), args.regex_edits),
+        }
+        runs.append(result)
+        print(f"📐 {refs} refs ({result['bytes'] / 2**20:.1f} MB, {result['objects']} objects), "
+              f"{len(added)} edits", file=sys.stderr)
+        print(f"  parse            {result['parse_ms']:9.1f} ms  "
+              f"(round trip identical: {result['roundtrip_identical']}, "
+              f"re-serialized identical: {result['reserialized_identical']})", file=sys.stderr)
+        for action in ("add", "remove"):
+            graph_ms, regex_ms = result[f"graph_{action}_ms"], result[f"regex_{action}_ms"]
+            projected = " (projected)" if action == "remove" and args.regex_edits < len(removed) else ""
+            print(f"  {action:6s} graph     {graph_ms:9.1f} ms   regex {regex_ms:9.1f} ms{projected}  "
+                  f"({regex_ms / graph_ms:.1f}x)", file=sys.stderr)
+
+    report = {"python": sys.version.split()[0], "platform": sys.platform, "runs": runs}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
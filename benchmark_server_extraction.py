@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark extract_server_data.py against mock_api_server.
+For each catalog size and mode the extractor runs in a fresh subprocess
+against a local stand-in server, and the run records wall time, peak RSS
+of the extractor, and requests and body bytes served (per second too).
+With --repeat, later runs reuse the same work directory, so they measure
+the warm path: response cache, incremental state and download manifest.
+
+Usage:
+    python3 benchmark_server_extraction.py --stories 1000 10000 --modes sequential async \\
+        --latency 20 --download-audio --output results.json
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from benchmark_extraction import peak_rss_bytes
+from mock_api_server import MockApiServer
+
+MODES = ["sequential", "async", "incremental"]
+
+
+def run_extractor(url, workdir, mode, download, concurrency, audio_workers):
+    """Point extract_server_data at url and workdir and run it once"""
+    import extract_server_data
+
+    workdir = Path(workdir)
+    extract_server_data.API_BASE_URL = url
+    extract_server_data.API_CONCURRENCY = concurrency
+    extract_server_data.AUDIO_DOWNLOAD_WORKERS = audio_workers
+    extract_server_data.OUTPUT_DIR = workdir / "extracted_data"
+    extract_server_data.API_CACHE_DIR = extract_server_data.OUTPUT_DIR / ".http_cache"
+    extract_server_data.STATE_FILE = extract_server_data.OUTPUT_DIR / ".extract_state"
+    extract_server_data.IOS_PROJECT_DIR = workdir / "Resources"
+    extract_server_data.AUDIO_SOURCE_DIR = workdir / "audio_files"
+
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        extract_server_data.main(async_mode=mode == "async", incremental=mode == "incremental",
+                                 download=download)
+    return {"seconds": round(time.perf_counter() - start, 4), "peak_rss_bytes": peak_rss_bytes()}
+
+
+def run_once(server, workdir, mode, download, concurrency, audio_workers):
+    """One extractor run in a fresh interpreter, with the server's view of it"""
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", "--url", server.url,
+           "--workdir", str(workdir), "--modes", mode, "--concurrency", str(concurrency),
+           "--audio-workers", str(audio_workers)]
+    if download:
+        cmd.append("--download-audio")
+
+    before = dict(server.stats)
+    start = time.perf_counter()
+    output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    wall = time.perf_counter() - start
+    result = json.loads(output)
+
+    requests_made = server.stats["requests"] - before["requests"]
+    bytes_sent = server.stats["bytes_sent"] - before["bytes_sent"]
+    result.update({
+        "requests": requests_made,
+        "errors": server.stats["errors"] - before["errors"],
+        "bytes": bytes_sent,
+        "requests_per_second": round(requests_made / result["seconds"], 1) if result["seconds"] else 0,
+        "bytes_per_second": round(bytes_sent / result["seconds"]) if result["seconds"] else 0,
+        "process_seconds": round(wall, 4),
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark server extraction against a mock API")
+    parser.add_argument("--stories", type=int, nargs="+", default=[1000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["sequential", "async"])
+    parser.add_argument("--repeat", type=int, default=1, help="runs per mode in the same work directory")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--download-audio", action="store_true")
+    parser.add_argument("--audio-workers", type=int, default=4, help="parallel audio downloads")
+    parser.add_argument("--audio-seconds", type=float, default=1.0)
+    parser.add_argument("--pagination", choices=["page", "cursor"], default="page")
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--payload-bytes", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_extractor(args.url, args.workdir, args.modes[0],
+                                       args.download_audio, args.concurrency, args.audio_workers)))
+        return
+
+    runs = []
+    for stories in args.stories:
+        server = MockApiServer(stories, args.audio_seconds, args.pagination,
+                               args.latency / 1000, error_rate=args.error_rate,
+                               payload_bytes=args.payload_bytes)
+        with server:
+            for mode in args.modes:
+                workdir = Path(tempfile.mkdtemp(prefix=f"storysage-server-bench-{stories}-"))
+                try:
+                    for repeat in range(args.repeat):
+                        print(f"⏱️  {stories} stories, {mode}, run {repeat + 1}...", file=sys.stderr)
+                        result = run_once(server, workdir, mode, args.download_audio,
+                                          args.concurrency, args.audio_workers)
+                        result.update({"stories": stories, "mode": mode, "run": repeat + 1})
+                        runs.append(result)
+                        print(f"  {result['seconds']:8.3f}s  {result['requests']:6d} req "
+                              f"({result['requests_per_second']:.0f}/s)  "
+                              f"{result['bytes'] / 2**20:7.1f} MB "
+                              f"({result['bytes_per_second'] / 2**20:.1f} MB/s)  "
+                              f"rss {result['peak_rss_bytes'] / 2**20:.1f} MB", file=sys.stderr)
+                finally:
+                    shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "config": {key: getattr(args, key) for key in
+                   ("concurrency", "download_audio", "audio_workers", "audio_seconds", "pagination",
+                    "latency", "error_rate", "payload_bytes")},
+        "runs": runs,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
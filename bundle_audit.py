@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Find duplicated and drifted resources under StorySage/.
+The same MP3s and JSON files live at the StorySage/ root, under
+StorySage/Data and under StorySage/Resources, and Xcode can end up
+bundling several copies. This hashes every resource once (in parallel,
+with a cache so unchanged files are not re-read), reports duplicate
+content groups and copies that have drifted apart, and can collapse
+everything onto the canonical StorySage/Resources/{Audio,Data} layout.
+Project references to the copies it deletes or moves are re-pointed at
+the canonical files in the same pass.
+
+Usage:
+    python3 bundle_audit.py              # report only
+    python3 bundle_audit.py --collapse   # show the collapse plan
+    python3 bundle_audit.py --collapse --apply
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from audio_sync import file_sha256
+from fix_resources import PROJECT_FILE, add_resource, built_files, resolved_files, resource_group
+from pbxproj import PbxProject
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+APP_DIR = PROJECT_ROOT / "StorySage"
+RESOURCES_DIR = APP_DIR / "Resources"
+CANONICAL_DIRS = {
+    ".mp3": RESOURCES_DIR / "Audio",
+    ".json": RESOURCES_DIR / "Data",
+}
+HASH_CACHE = PROJECT_ROOT / ".bundle_hash_cache.json"
+
+# Compiled or code inputs rather than bundle resources
+SKIP_SUFFIXES = {".swift", ".xcassets"}
+SKIP_NAMES = {"Info.plist", ".DS_Store"}
+
+
+def iter_resources(root=APP_DIR):
+    """Every file under root that Xcode would copy as a resource"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and Path(d).suffix not in SKIP_SUFFIXES]
+        for name in filenames:
+            # Manifests, resume files and other tool state, not resources
+            if name.startswith('.') or name in SKIP_NAMES or Path(name).suffix in SKIP_SUFFIXES:
+                continue
+            yield Path(dirpath) / name
+
+
+def load_hash_cache(path=HASH_CACHE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_hash_cache(cache, path=HASH_CACHE):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def hash_resources(paths, cache, workers=8):
+    """
+    Returns {path: (size, sha256)}. Files whose size and mtime match the
+    cache are not read; the cache is updated in place.
+    """
+    results = {}
+    pending = []
+    for path in paths:
+        stat = path.stat()
+        key = str(path.relative_to(PROJECT_ROOT))
+        entry = cache.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            results[path] = (stat.st_size, entry['sha256'])
+        else:
+            pending.append((path, key, stat))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (path, key, stat), sha256 in zip(pending, pool.map(lambda p: file_sha256(p[0]), pending)):
+            cache[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+            results[path] = (stat.st_size, sha256)
+    return results
+
+
+def find_duplicates(hashes):
+    """Groups of paths with identical content, largest waste first"""
+    groups = {}
+    for path, (size, sha256) in hashes.items():
+        groups.setdefault((sha256, size), []).append(path)
+    duplicates = [(size, sorted(paths)) for (_, size), paths in groups.items() if len(paths) > 1]
+    return sorted(duplicates, key=lambda group: -group[0] * (len(group[1]) - 1))
+
+
+def find_drift(hashes):
+    """Files sharing a name but not content, e.g. a stale stories.json copy"""
+    by_name = {}
+    for path, (_, sha256) in hashes.items():
+        by_name.setdefault(path.name, {}).setdefault(sha256, []).append(path)
+    return {name: versions for name, versions in sorted(by_name.items()) if len(versions) > 1}
+
+
+def canonical_path(path):
+    """Where a resource belongs in the canonical layout, or None"""
+    directory = CANONICAL_DIRS.get(path.suffix)
+    return directory / path.name if directory else None
+
+
+def plan_collapse(hashes):
+    """
+    Actions to collapse resources onto the canonical layout:
+      ("delete", path, target)  exact copy of the canonical file
+      ("move", path, target)    canonical file missing, this copy becomes it
+      ("conflict", path, target) drifted copy; left alone for a human to resolve
+    """
+    actions = []
+    claimed = set()
+    for path in sorted(hashes):
+        target = canonical_path(path)
+        if target is None or path == target:
+            continue
+        if target in hashes:
+            kind = "delete" if hashes[target][1] == hashes[path][1] else "conflict"
+        elif target in claimed:
+            kind = "conflict"
+        else:
+            kind = "move"
+            claimed.add(target)
+        actions.append((kind, path, target))
+    return actions
+
+
+class ProjectRepointer:
+    """
+    Moves the project's references to a collapsed copy onto its target,
+    so the project never points at a file the collapse removed. A
+    reference whose target already has one is dropped with its build
+    files instead (the target's reference is built in its place), since
+    both would copy the same name into the bundle.
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.phase = project.build_phase("PBXResourcesBuildPhase")
+        self.by_path = {}
+        for file_ref, _ in resolved_files(project):
+            self.by_path.setdefault(project.disk_path(file_ref), []).append(file_ref)
+        self.parents = {child_id: group for group in project.isa("PBXGroup")
+                        for child_id in group.get('children', [])}
+        self.moved, self.dropped = [], []
+
+    def repoint(self, path, target):
+        project = self.project
+        file_refs = self.by_path.pop(str(path), [])
+        if not file_refs:
+            return
+        existing = self.by_path.get(str(target))
+        if existing:
+            built = built_files(project, self.phase) if self.phase is not None else set()
+            if any(file_ref.id in built for file_ref in file_refs) and not any(e.id in built for e in existing):
+                add_resource(project, self.parents[existing[0].id], self.phase, target.name,
+                             existing[0].get('lastKnownFileType', ""), existing[0])
+            project.remove_files(file_ref.id for file_ref in file_refs)
+            self.dropped += file_refs
+            return
+        group = resource_group(project, target.parent)
+        for file_ref in file_refs:
+            self.parents[file_ref.id].discard('children', {file_ref.id})
+            group.append('children', file_ref.id)
+            self.parents[file_ref.id] = group
+            file_ref['path'] = target.name
+            file_ref['sourceTree'] = "<group>"
+        self.by_path[str(target)] = file_refs
+        self.moved += file_refs
+
+
+def apply_collapse(actions, project=None):
+    """
+    Carry out the plan. With a project, references to each copy are
+    re-pointed as its file goes; the project is saved even if an action
+    fails, so it matches whatever did happen on disk.
+    """
+    repointer = ProjectRepointer(project) if project is not None else None
+    try:
+        for kind, path, target in actions:
+            if kind == "delete":
+                path.unlink()
+            elif kind == "move":
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, target)
+            else:
+                continue
+            if repointer is not None:
+                repointer.repoint(path, target)
+    finally:
+        if repointer is not None:
+            project.save()
+    return repointer
+
+
+def referenced_copies(project, actions):
+    """Copies in the plan that a project file reference resolves to"""
+    referenced = {project.disk_path(file_ref) for file_ref, _ in resolved_files(project)}
+    return [path for kind, path, _ in actions if kind != "conflict" and str(path) in referenced]
+
+
+def _rel(path):
+    return path.relative_to(PROJECT_ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report duplicated and drifted bundle resources")
+    parser.add_argument("--collapse", action="store_true",
+                        help="plan collapsing resources onto StorySage/Resources")
+    parser.add_argument("--apply", action="store_true", help="carry out the collapse plan")
+    parser.add_argument("--project", type=Path, default=PROJECT_FILE,
+                        help="project.pbxproj whose references follow the collapse")
+    parser.add_argument("--no-project", action="store_true",
+                        help="collapse files only; refused while the project references a copy")
+    args = parser.parse_args()
+
+    cache = load_hash_cache()
+    hashes = hash_resources(list(iter_resources()), cache)
+    live_keys = {str(path.relative_to(PROJECT_ROOT)) for path in hashes}
+    save_hash_cache({key: entry for key, entry in cache.items() if key in live_keys})
+
+    duplicates = find_duplicates(hashes)
+    wasted = sum(size * (len(paths) - 1) for size, paths in duplicates)
+    print(f"🔍 Hashed {len(hashes)} resources under {_rel(APP_DIR)}/")
+
+    print(f"\n📦 Duplicate content groups: {len(duplicates)}")
+    for size, paths in duplicates:
+        print(f"  {size / 1024:.0f} KB x {len(paths)}")
+        for path in paths:
+            print(f"    {_rel(path)}")
+    print(f"  Extra bundle size if every copy is bundled: {wasted / (1024 * 1024):.1f} MB")
+
+    drift = find_drift(hashes)
+    print(f"\n⚠️  Drifted copies: {len(drift)}")
+    for name, versions in drift.items():
+        print(f"  {name}:")
+        for sha256, paths in versions.items():
+            print(f"    {sha256[:12]}  {', '.join(str(_rel(p)) for p in paths)}")
+
+    if not args.collapse:
+        return
+
+    actions = plan_collapse(hashes)
+    print(f"\n🧹 Collapse plan ({len(actions)} actions):")
+    for kind, path, target in actions:
+        print(f"  {kind:8s} {_rel(path)} -> {_rel(target)}")
+
+    if not args.apply:
+        return
+
+    project = PbxProject.load(args.project)
+    if args.no_project:
+        referenced = referenced_copies(project, actions)
+        if referenced:
+            print(f"\n❌ {args.project} still references {len(referenced)} copies the collapse removes:")
+            for path in referenced[:10]:
+                print(f"    {_rel(path)}")
+            print("Run without --no-project to re-point them in the same pass.")
+            sys.exit(1)
+        project = None
+
+    repointer = apply_collapse(actions, project)
+    print("\n✅ Collapsed. Conflicts were left in place.")
+    if repointer is not None:
+        print(f"Re-pointed {len(repointer.moved)} and dropped {len(repointer.dropped)} "
+              f"project references in {args.project}")
+
+
+if __name__ == "__main__":
+    main()
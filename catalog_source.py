@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Lazily-loaded story catalog for the extraction scripts.
+Stories live in catalog/stories.jsonl (one story per line) or in a
+directory with one JSON file per story; categories live in
+catalog/categories.json. Stories are parsed and validated one at a time
+as they are iterated, so nothing is loaded until a stage asks for it.
+"""
+
+import json
+import os
+from pathlib import Path
+
+CATALOG_DIR = Path(__file__).resolve().parent / "catalog"
+STORIES_SOURCE = CATALOG_DIR / "stories.jsonl"
+CATEGORIES_SOURCE = CATALOG_DIR / "categories.json"
+
+STORY_FIELDS = {
+    "id": str,
+    "title": str,
+    "description": str,
+    "category": str,
+    "gradeLevel": str,
+    "duration": int,
+    "audioFile": str,
+    "keyLessons": list,
+    "tags": list,
+}
+
+CATEGORY_FIELDS = {
+    "id": str,
+    "name": str,
+    "description": str,
+    "color": str,
+    "icon": str,
+    "gradeLevels": list,
+}
+
+# Sources that have already passed a full validation pass, keyed by
+# (path, mtime_ns) so an edited source is validated again
+_validated = set()
+
+
+def _check_fields(entry, fields, where):
+    for key, expected in fields.items():
+        if key not in entry:
+            raise ValueError(f"{where}: missing field '{key}'")
+        if not isinstance(entry[key], expected) or isinstance(entry[key], bool):
+            raise ValueError(f"{where}: field '{key}' should be {expected.__name__}, "
+                             f"got {type(entry[key]).__name__}")
+
+
+def validate_story(story, where="story"):
+    """Check a single story's shape; raises ValueError on the first problem"""
+    _check_fields(story, STORY_FIELDS, where)
+    if not story['audioFile'].endswith('.mp3'):
+        raise ValueError(f"{where}: audioFile '{story['audioFile']}' is not an .mp3")
+    if story['duration'] <= 0:
+        raise ValueError(f"{where}: duration must be positive")
+    for key in ("keyLessons", "tags"):
+        if not all(isinstance(item, str) for item in story[key]):
+            raise ValueError(f"{where}: {key} must be a list of strings")
+
+
+def _source_key(path):
+    return (str(path), os.stat(path).st_mtime_ns)
+
+
+def _iter_raw_stories(source):
+    """Yield (location, story) pairs from a JSONL file or a per-story directory"""
+    if source.is_dir():
+        for path in sorted(source.glob("*.json")):
+            with open(path, encoding='utf-8') as f:
+                yield str(path), json.load(f)
+        return
+
+    with open(source, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if line:
+                yield f"{source}:{line_no}", json.loads(line)
+
+
+def iter_stories(source=None):
+    """
+    Stream stories from the catalog source.
+    The first full pass over an unchanged source validates every entry and
+    checks ids for uniqueness; later passes skip validation.
+    """
+    source = Path(source or STORIES_SOURCE)
+    key = _source_key(source)
+    if key in _validated:
+        for _, story in _iter_raw_stories(source):
+            yield story
+        return
+
+    seen_ids = set()
+    for where, story in _iter_raw_stories(source):
+        validate_story(story, where)
+        if story['id'] in seen_ids:
+            raise ValueError(f"{where}: duplicate story id '{story['id']}'")
+        seen_ids.add(story['id'])
+        yield story
+    _validated.add(key)
+
+
+def load_categories(source=None):
+    """Load and validate the category list"""
+    source = Path(source or CATEGORIES_SOURCE)
+    with open(source, encoding='utf-8') as f:
+        data = json.load(f)
+    for index, category in enumerate(data['categories']):
+        _check_fields(category, CATEGORY_FIELDS, f"{source}: categories[{index}]")
+    return data
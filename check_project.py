@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Integrity scan for project.pbxproj.
+The old regex edits in fix_project.py could leave build phases listing
+build files that are gone, groups listing deleted children and objects
+nothing points at any more. This builds the reference graph once and
+finds, in time linear in the size of the project:
+
+  dangling-reference   an object refers to an ID that isn't defined
+  unreachable-object   nothing reaches the object from the root object
+  duplicate-resource   a Resources phase copies the same file (or name) twice
+  missing-file         a file reference's path, resolved through its groups, isn't on disk
+  unregistered-file    no file reference resolves to a file in Resources/Audio or
+                       Resources/Data (the ones next to the project's .xcodeproj by default)
+  unbuilt-file         (note) a file reference that no build phase or target uses
+  skipped-directory    (note) a resource directory that doesn't exist, so wasn't compared
+
+--prune drops dangling references, unreachable objects, duplicate
+resources and missing files in a single write. Unregistered files are
+left to fix_resources.py / watch_resources.py, and unbuilt files (Info.plist,
+preview assets) are often intended, so those are only reported.
+
+Usage:
+    python3 check_project.py
+    python3 check_project.py --prune
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from fix_resources import PROJECT_FILE, registered_files, resolved_files
+from pbxproj import PbxProject
+from validate_catalog import DEFAULT_LIMIT, audio_index
+from watch_resources import AUDIO_DIR, DATA_DIR, WATCHED
+
+# Properties that hold object IDs; anything else is only treated as a
+# reference when it resolves or has the shape of an ID
+REFERENCE_KEYS = {
+    "buildConfigurationList", "buildConfigurations", "buildPhases", "buildRules", "children",
+    "containerPortal", "dependencies", "fileRef", "files", "mainGroup", "packageProductDependencies",
+    "packageReferences", "productRef", "productRefGroup", "productReference", "target", "targetProxy",
+    "targets",
+}
+# May name an object in another project, so never dangling
+EXTERNAL_KEYS = {"remoteGlobalIDString"}
+ID_SHAPE = re.compile(r'[0-9A-F]{24}')
+NOTE_KINDS = {"unbuilt-file", "skipped-directory"}
+PRUNABLE_KINDS = {"dangling-reference", "unreachable-object", "duplicate-resource", "missing-file"}
+GROUP_ISAS = {"PBXGroup", "PBXVariantGroup", "XCVersionGroup"}
+
+
+def resource_dirs(project_file, audio_dir=None, data_dir=None):
+    """
+    Watched-directory map for the checkout project_file belongs to:
+    <checkout>/StorySage/Resources/{Audio,Data} unless given explicitly.
+    """
+    resources = Path(project_file).resolve().parent.parent / "StorySage" / "Resources"
+    return {
+        Path(audio_dir or resources / "Audio").resolve(): WATCHED[AUDIO_DIR],
+        Path(data_dir or resources / "Data").resolve(): WATCHED[DATA_DIR],
+    }
+
+
+def _label(obj):
+    return f"{obj.id} ({obj.comment or obj.isa})"
+
+
+class ProjectScanner:
+    """
+    Collects findings as (kind, subject, detail) and, alongside them, the
+    edits --prune would make. Every check is a pass over the objects or
+    the reference graph with dict and set lookups.
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.findings = []
+        # Object ID -> IDs it refers to that exist
+        self.edges = {}
+        # Object ID -> {property: dangling IDs}
+        self.dangling = defaultdict(dict)
+        # IDs referred to by something other than a group
+        self.used = set()
+        # Objects --prune removes outright, and list entries it drops
+        self.remove = set()
+        self.dedupe = set()
+
+    def add(self, kind, subject, detail):
+        self.findings.append((kind, subject, detail))
+
+    def build_graph(self):
+        objects = self.project.objects
+        for obj in objects.values():
+            refs = []
+            for key, value in obj.props.items():
+                values = value if isinstance(value, list) else [value]
+                for ref in values:
+                    if not isinstance(ref, str) or key == "isa":
+                        continue
+                    if ref in objects:
+                        refs.append(ref)
+                    elif key in REFERENCE_KEYS or (key not in EXTERNAL_KEYS and ID_SHAPE.fullmatch(ref)):
+                        self.dangling[obj.id].setdefault(key, set()).add(ref)
+                        self.add("dangling-reference", _label(obj), f"{key} -> {ref}")
+            self.edges[obj.id] = refs
+            if obj.isa not in GROUP_ISAS:
+                self.used.update(refs)
+
+        # A build file for a file that's gone can only be dropped
+        for object_id, keys in self.dangling.items():
+            if "fileRef" in keys and objects[object_id].isa == "PBXBuildFile":
+                self.remove.add(object_id)
+
+    def check_reachable(self):
+        root_id = self.project.root.get('rootObject')
+        seen = {root_id} if root_id in self.project.objects else set()
+        stack = list(seen)
+        while stack:
+            for ref in self.edges.get(stack.pop(), ()):
+                if ref not in seen:
+                    seen.add(ref)
+                    stack.append(ref)
+        for object_id, obj in self.project.objects.items():
+            if object_id not in seen:
+                self.add("unreachable-object", _label(obj), "not reachable from the root object")
+                self.remove.add(object_id)
+
+    def check_unbuilt(self):
+        for file_ref in self.project.isa("PBXFileReference"):
+            if file_ref.id not in self.used and file_ref.id not in self.remove:
+                self.add("unbuilt-file", _label(file_ref), "only listed in groups")
+
+    def check_resources(self):
+        objects = self.project.objects
+        for phase in self.project.isa("PBXResourcesBuildPhase"):
+            build_ids, file_ids, names = set(), {}, {}
+            for build_id in phase.get('files', []):
+                if build_id in build_ids:
+                    self.add("duplicate-resource", _label(phase), f"{build_id} is listed twice")
+                    self.dedupe.add(phase.id)
+                    continue
+                build_ids.add(build_id)
+                build_file = objects.get(build_id)
+                file_ref = objects.get(build_file.get('fileRef')) if build_file is not None else None
+                if file_ref is None or build_id in self.remove:
+                    continue
+                name = file_ref.get('name') or file_ref.get('path', '').rsplit('/', 1)[-1]
+                if file_ref.id in file_ids:
+                    self.add("duplicate-resource", _label(build_file),
+                             f"copies {name} again (also {file_ids[file_ref.id]})")
+                    self.remove.add(build_id)
+                elif name in names:
+                    self.add("duplicate-resource", _label(build_file),
+                             f"another file named {name} is already copied by {names[name]}")
+                    self.remove.add(build_id)
+                else:
+                    file_ids[file_ref.id] = build_id
+                    names[name] = build_id
+
+    def check_disk(self, watched=WATCHED):
+        """
+        Every file reference against the exact path it resolves to through
+        its parent groups, and the watched directories against the
+        references that resolve into them
+        """
+        project = self.project
+        for file_ref, path in resolved_files(project):
+            disk_path = project.disk_path(file_ref)
+            if disk_path is not None and file_ref.id not in self.remove and not os.path.exists(disk_path):
+                self.add("missing-file", _label(file_ref), f"{path} is not on disk")
+                self.remove.add(file_ref.id)
+        for directory, (suffix, _) in watched.items():
+            if not Path(directory).is_dir():
+                # Nothing to compare against; don't report everything as unregistered
+                self.add("skipped-directory", str(directory), "does not exist, disk check skipped")
+                continue
+            registered, elsewhere = registered_files(project, directory, suffix)
+            on_disk = {name for name in audio_index(directory) if name.endswith(suffix)}
+            for name in sorted(on_disk - registered.keys()):
+                if name in elsewhere:
+                    detail = f"in {directory}, but the project uses {project.source_path(elsewhere[name][0])}"
+                else:
+                    detail = f"in {directory} but not in the project"
+                self.add("unregistered-file", name, detail)
+
+    def scan(self, watched=WATCHED):
+        self.build_graph()
+        self.check_reachable()
+        self.check_resources()
+        self.check_disk(watched)
+        self.check_unbuilt()
+        return self
+
+    def by_kind(self):
+        grouped = defaultdict(list)
+        for kind, subject, detail in self.findings:
+            grouped[kind].append((subject, detail))
+        return grouped
+
+    def prune(self):
+        """Apply the fixes the scan collected in one pass; returns how many objects went"""
+        project = self.project
+        gone = set(self.remove)
+        # Build files of removed file references go with them
+        for build_file in project.isa("PBXBuildFile"):
+            if build_file.get('fileRef') in gone:
+                gone.add(build_file.id)
+        for obj in project.objects.values():
+            dangling = self.dangling.get(obj.id)
+            drop = gone.union(*dangling.values()) if dangling else gone
+            for key, value in obj.props.items():
+                if isinstance(value, list) and drop.intersection(value):
+                    obj.discard(key, drop)
+            if obj.id in self.dedupe:
+                obj['files'] = list(dict.fromkeys(obj['files']))
+        project.remove(*gone)
+        return len(gone)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find dangling, unreachable, duplicate and missing pbxproj entries")
+    parser.add_argument("--project", type=Path, default=PROJECT_FILE, help="project.pbxproj to check")
+    parser.add_argument("--prune", action="store_true",
+                        help="remove dangling references, unreachable objects, duplicates and missing files")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT,
+                        help=f"findings listed per kind, 0 for all (default: {DEFAULT_LIMIT})")
+    parser.add_argument("--audio-dir", type=Path,
+                        help="default: StorySage/Resources/Audio next to the project's .xcodeproj")
+    parser.add_argument("--data-dir", type=Path,
+                        help="default: StorySage/Resources/Data next to the project's .xcodeproj")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        project = PbxProject.load(args.project)
+        scanner = ProjectScanner(project).scan(resource_dirs(args.project, args.audio_dir, args.data_dir))
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read the project: {e}")
+        sys.exit(2)
+    elapsed = time.perf_counter() - start
+
+    print(f"🔍 Scanned {len(project.objects)} objects in {elapsed:.2f}s")
+    grouped = scanner.by_kind()
+    for kind, items in sorted(grouped.items()):
+        marker = "ℹ️ " if kind in NOTE_KINDS else "❌"
+        print(f"\n{marker} {kind}: {len(items)}")
+        shown = items if args.limit <= 0 else items[:args.limit]
+        for subject, detail in shown:
+            print(f"    {subject}: {detail}")
+        if len(shown) < len(items):
+            print(f"    ... and {len(items) - len(shown)} more")
+
+    problems = [kind for kind in grouped if kind not in NOTE_KINDS]
+    if not problems:
+        print("\n✅ No integrity problems")
+        return
+
+    if args.prune and PRUNABLE_KINDS.intersection(problems):
+        removed = scanner.prune()
+        project.save()
+        print(f"\n✂️  Pruned {removed} objects and their references from {args.project}")
+        problems = [kind for kind in problems if kind not in PRUNABLE_KINDS]
+        if not problems:
+            return
+        print("Unregistered files can be added with fix_resources.py or watch_resources.py")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
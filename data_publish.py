@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Checksum-gated, all-or-nothing publish of generated data files.
+Each file is compared by sha256 with the copy already published and only
+changed files are written, so unchanged files keep their mtimes and Xcode
+does not re-copy them into the bundle. The new set is staged in a hidden
+sibling directory, with every file that isn't being replaced hardlinked in,
+and swapped with the destination directory in one rename, so a crash
+leaves either the old set or the new one and never a mix of the two.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import json_stream
+from audio_sync import CHUNK_SIZE, file_sha256
+
+# renameat2() / renamex_np() flags for swapping two paths atomically
+RENAME_EXCHANGE = 2
+RENAME_SWAP = 2
+AT_FDCWD = -100
+
+
+@dataclass
+class PublishedFile:
+    name: str
+    status: str  # "added", "changed" or "unchanged"
+    old_size: int = 0
+    new_size: int = 0
+    detail: str = ""
+
+
+@dataclass
+class PublishReport:
+    """What a publish run changed in the destination directory"""
+    files: list = field(default_factory=list)
+    method: str = ""  # how the new set was swapped in; "" if nothing was written
+
+    def by_status(self, status):
+        return [f for f in self.files if f.status == status]
+
+    @property
+    def written(self):
+        return [f for f in self.files if f.status != "unchanged"]
+
+    def summary(self):
+        delta = sum(f.new_size - f.old_size for f in self.written)
+        return (f"{len(self.by_status('added'))} added, {len(self.by_status('changed'))} changed, "
+                f"{len(self.by_status('unchanged'))} unchanged ({delta / 1024:+.1f} KB)")
+
+    def lines(self):
+        """One line per written file, e.g. 'stories.json  ~  +2 -1 ~5 items  (+1.2 KB)'"""
+        marks = {"added": "+", "changed": "~"}
+        width = max((len(f.name) for f in self.written), default=0)
+        return [f"  {marks[f.status]} {f.name:<{width}}  {f.detail + '  ' if f.detail else ''}"
+                f"({(f.new_size - f.old_size) / 1024:+.1f} KB)"
+                for f in self.written]
+
+
+def _sibling(dest_dir, suffix):
+    return dest_dir.with_name(f".{dest_dir.name}.{suffix}")
+
+
+def exchange_dirs(a, b):
+    """Atomically swap two paths; returns False if the platform can't"""
+    import ctypes
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        if sys.platform == "darwin":
+            return libc.renamex_np(os.fsencode(a), os.fsencode(b), RENAME_SWAP) == 0
+        if sys.platform.startswith("linux"):
+            return libc.renameat2(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b),
+                                  RENAME_EXCHANGE) == 0
+    except (OSError, AttributeError):
+        # No such libc symbol (old glibc, musl)
+        pass
+    return False
+
+
+def recover(dest_dir):
+    """
+    Finish or discard a publish that was interrupted. The previous set is
+    only moved aside once the staged one is complete, so a missing
+    destination with both left over is rolled forward; any other leftovers
+    are removed.
+    """
+    dest_dir = Path(dest_dir)
+    staging, backup = _sibling(dest_dir, "staging"), _sibling(dest_dir, "old")
+    if not dest_dir.exists() and backup.exists():
+        os.rename(staging if staging.exists() else backup, dest_dir)
+    shutil.rmtree(staging, ignore_errors=True)
+    shutil.rmtree(backup, ignore_errors=True)
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).digest()
+
+
+def _entry_digests(path):
+    """
+    Items keyed for diffing, as {key: content digest}: by id for a list of
+    objects, by key for an object. A list is decoded one item at a time,
+    so only the digests of a large stories.json are held in memory.
+    """
+    meta = {}
+    digests = {}
+    with open(path, 'rb') as f:
+        chunks = iter(lambda: f.read(CHUNK_SIZE), b'')
+        # key=None: an object's keys all go to meta rather than being streamed
+        for item in json_stream.iter_items(chunks, meta, key=None):
+            if not isinstance(item, dict) or 'id' not in item:
+                return None, None
+            digests[item['id']] = _digest(item)
+    if digests:
+        return digests, "items"
+    return {key: _digest(value) for key, value in meta.items()}, "keys" if meta else "items"
+
+
+def json_diff(old_path, new_path):
+    """'+added -removed ~changed items' between two JSON files, or '' if not comparable"""
+    try:
+        old, _ = _entry_digests(old_path)
+        new, unit = _entry_digests(new_path)
+    except (OSError, ValueError):
+        return ""
+    if old is None or new is None:
+        return ""
+    added = sum(1 for key in new if key not in old)
+    removed = sum(1 for key in old if key not in new)
+    changed = sum(1 for key, value in new.items() if key in old and old[key] != value)
+    return f"+{added} -{removed} ~{changed} {unit}"
+
+
+def publish_files(sources, dest_dir):
+    """
+    Publish source files into dest_dir under their own names. Files in
+    dest_dir that aren't among the sources are left alone. Returns a
+    PublishReport; dest_dir is not touched at all if nothing changed.
+    """
+    dest_dir = Path(dest_dir)
+    dest_dir.parent.mkdir(parents=True, exist_ok=True)
+    recover(dest_dir)
+
+    sources = {src.name: src for src in sorted(map(Path, sources), key=lambda p: p.name)}
+    report = PublishReport()
+    for src in sources.values():
+        dest = dest_dir / src.name
+        new_size = src.stat().st_size
+        if not dest.exists():
+            report.files.append(PublishedFile(src.name, "added", 0, new_size))
+            continue
+        old_size = dest.stat().st_size
+        if old_size == new_size and file_sha256(dest) == file_sha256(src):
+            report.files.append(PublishedFile(src.name, "unchanged", old_size, new_size))
+            continue
+        detail = json_diff(dest, src) if src.suffix == ".json" else ""
+        report.files.append(PublishedFile(src.name, "changed", old_size, new_size, detail))
+
+    if not report.written:
+        return report
+
+    staging = _sibling(dest_dir, "staging")
+    if dest_dir.exists():
+        shutil.copytree(dest_dir, staging, copy_function=_link_or_copy)
+    else:
+        staging.mkdir()
+    for published in report.written:
+        target = staging / published.name
+        # Never write through a hardlink into the live copy
+        target.unlink(missing_ok=True)
+        shutil.copy2(sources[published.name], target)
+        with open(target, 'rb') as f:
+            os.fsync(f.fileno())
+
+    if not dest_dir.exists():
+        os.rename(staging, dest_dir)
+        report.method = "rename"
+    elif exchange_dirs(staging, dest_dir):
+        # staging now holds the previous set
+        shutil.rmtree(staging)
+        report.method = "exchange"
+    else:
+        backup = _sibling(dest_dir, "old")
+        os.rename(dest_dir, backup)
+        os.rename(staging, dest_dir)
+        shutil.rmtree(backup)
+        report.method = "rename"
+    return report
@@ -4,30 +4,71 @@ Extract story data from StorySage server for iOS app embedding.
 This script fetches all stories and categories from the API and saves them as JSON files.
 """
 
+import argparse
+import asyncio
+import hashlib
 import json
-import requests
 import os
-import shutil
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
+from api_client import ApiClient
+from audio_download import DOWNLOAD_MANIFEST_NAME, AudioDownloader, download_audio, iter_audio_sources
+from audio_sync import MANIFEST_NAME, remove_audio_files, sync_audio_files
+from data_publish import publish_files
+from http_cache import ResponseCache
+
 # Configuration
 API_BASE_URL = "http://localhost:5010"
+API_TIMEOUT = (5, 30)  # (connect, read) seconds
+API_RETRIES = 4
+API_PAGE_SIZE = 200
+API_CONCURRENCY = 8  # requests in flight at once in --async mode
+# Per-story resources merged into each story in --async mode,
+# e.g. {"segments": "/api/stories/{id}/segments"}
+STORY_DETAIL_ENDPOINTS = {}
 OUTPUT_DIR = Path("extracted_data")
+API_CACHE_DIR = OUTPUT_DIR / ".http_cache"  # None disables conditional requests
+API_CACHE_TTL = 7 * 24 * 3600  # drop entries not revalidated for a week
+API_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# High-water mark of the last story extraction, for --incremental runs.
+# No .json suffix so it is never copied into the app bundle.
+STATE_FILE = OUTPUT_DIR / ".extract_state"
+# The server returns stories changed after this timestamp, deleted ones as
+# tombstones ({"id": ..., "deleted": true} or with deleted_at set)
+DELTA_PARAM = "updated_since"
 AUDIO_SOURCE_DIR = Path("../audio_files")
+AUDIO_DOWNLOAD_WORKERS = 4  # parallel connections for --download-audio
+AUDIO_MAX_BYTES_PER_SECOND = None  # shared bandwidth cap for --download-audio
 IOS_PROJECT_DIR = Path("StorySage/Resources")
+AUDIO_PRODUCER = "extract_server_data"  # owner tag in the shared audio manifest
+GRADE_LEVELS = ["grade_prek", "grade_k", "grade_1", "grade_2"]
+
+_client = None
+
+def get_client():
+    """Shared API client so every request reuses the same connection pool"""
+    global _client
+    if _client is None:
+        cache = None
+        if API_CACHE_DIR:
+            cache = ResponseCache(API_CACHE_DIR, ttl=API_CACHE_TTL, max_bytes=API_CACHE_MAX_BYTES)
+        _client = ApiClient(API_BASE_URL, timeout=API_TIMEOUT, retries=API_RETRIES,
+                            page_size=API_PAGE_SIZE, pool_size=max(10, API_CONCURRENCY),
+                            cache=cache)
+    return _client
 
 def fetch_api_data(endpoint):
     """Fetch data from API endpoint"""
     try:
-        response = requests.get(f"{API_BASE_URL}{endpoint}")
-        response.raise_for_status()
-        data = response.json()
-        return data.get('data', []) if 'data' in data else data
+        return get_client().get_json(endpoint)
     except Exception as e:
         print(f"Error fetching {endpoint}: {e}")
         return None
 
-def extract_categories():
+def extract_categories(aggregator=None):
     """Extract all categories"""
     print("Extracting categories...")
     categories = fetch_api_data("/api/categories")
@@ -36,116 +77,502 @@ def extract_categories():
         with open(output_file, 'w') as f:
             json.dump(categories, f, indent=2)
         print(f"Saved {len(categories)} categories to {output_file}")
+        if aggregator:
+            aggregator.add_categories(categories)
     return categories
 
-def extract_stories():
-    """Extract all stories"""
-    print("Extracting stories...")
-    stories = fetch_api_data("/api/stories")
-    if stories:
-        # Create audio mapping
-        audio_mapping = {}
+def localize_audio_url(story, audio_mapping):
+    """Point a story's audio_url at the bundled file and record the mapping"""
+    if story.get('audio_url'):
+        # Extract filename from URL
+        audio_filename = story['audio_url'].split('/')[-1]
         
-        # Update story audio URLs to local references
-        for story in stories:
-            if story.get('audio_url'):
-                # Extract filename from URL
-                audio_filename = story['audio_url'].split('/')[-1]
-                # Map to actual file if it exists
-                if 'audio_files' in story['audio_url']:
-                    # This is already pointing to a file
-                    parts = story['audio_url'].split('/')
-                    if len(parts) > 1:
-                        audio_filename = parts[-1]
-                
-                # Update to local reference
-                story['local_audio_file'] = audio_filename
-                audio_mapping[story['id']] = audio_filename
-                
-                # Keep original URL for reference
-                story['original_audio_url'] = story['audio_url']
-                story['audio_url'] = audio_filename  # Update to just filename
+        # Update to local reference
+        story['local_audio_file'] = audio_filename
+        audio_mapping[story['id']] = audio_filename
         
-        output_file = OUTPUT_DIR / "stories.json"
-        with open(output_file, 'w') as f:
-            json.dump(stories, f, indent=2)
-        print(f"Saved {len(stories)} stories to {output_file}")
+        # Keep original URL for reference
+        story['original_audio_url'] = story['audio_url']
+        story['audio_url'] = audio_filename  # Update to just filename
+    return story
+
+class JsonArrayWriter:
+    """
+    Writes a JSON array one item at a time.
+    Output is byte-identical to json.dump(items, f, indent=2).
+    """
+    
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+    
+    def write(self, item):
+        self.f.write(',\n' if self.count else '[\n')
+        self.f.write('\n'.join('  ' + line for line in json.dumps(item, indent=2).split('\n')))
+        self.count += 1
+    
+    def close(self):
+        self.f.write('\n]' if self.count else '[]')
+
+class MetadataAggregator:
+    """
+    Collects the metadata.json statistics while categories, stories and
+    audio pass through extraction, so nothing is read back from disk.
+    """
+    
+    def __init__(self):
+        self.categories_count = 0
+        self.stories_count = 0
+        self.by_grade = Counter()
+        self.by_category = Counter()
+        self.by_tag = Counter()
+        self.by_category_and_grade = defaultdict(Counter)
+        self.total_duration = 0
+        self.duration_by_grade = Counter()
+        self.duration_by_category = Counter()
+        self.audio_files = set()
+        self.audio_sizes = {}
+    
+    def add_categories(self, categories):
+        self.categories_count = len(categories or [])
+    
+    def add_story(self, story):
+        grade = story.get('grade_level') or story.get('gradeLevel') or 'unknown'
+        category = story.get('category') or story.get('category_id') or 'unknown'
+        duration = story.get('duration') or 0
         
-        # Save audio mapping
-        mapping_file = OUTPUT_DIR / "audio_mapping.json"
-        with open(mapping_file, 'w') as f:
-            json.dump(audio_mapping, f, indent=2)
-        print(f"Saved audio mapping to {mapping_file}")
+        self.stories_count += 1
+        self.by_grade[grade] += 1
+        self.by_category[category] += 1
+        self.by_category_and_grade[category][grade] += 1
+        self.by_tag.update(story.get('tags') or [])
+        self.total_duration += duration
+        self.duration_by_grade[grade] += duration
+        self.duration_by_category[category] += duration
+        if story.get('local_audio_file'):
+            self.audio_files.add(story['local_audio_file'])
+    
+    def add_audio_report(self, report):
+        """Sizes of staged audio, so metadata doesn't have to stat those files"""
+        for result in report.results:
+            if result.status in ("copied", "skipped"):
+                self.audio_sizes[result.name] = result.size
+    
+    def metadata(self, audio_dir):
+        audio_bytes = 0
+        audio_count = 0
+        for name in self.audio_files:
+            size = self.audio_sizes.get(name)
+            if size is None:
+                # Not staged this run (e.g. --incremental); it may still be in place
+                try:
+                    size = (audio_dir / name).stat().st_size
+                except OSError:
+                    continue
+            audio_count += 1
+            audio_bytes += size
         
-    return stories
+        return {
+            "version": "1.0",
+            "extraction_date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "categories_count": self.categories_count,
+            "stories_count": self.stories_count,
+            "total_audio_files": audio_count,
+            "total_audio_bytes": audio_bytes,
+            "total_duration": self.total_duration,
+            "grade_levels": GRADE_LEVELS,
+            "stories_by_grade": dict(self.by_grade),
+            "stories_by_category": dict(self.by_category),
+            "stories_by_tag": dict(self.by_tag.most_common()),
+            "stories_by_category_and_grade": {
+                category: dict(grades) for category, grades in self.by_category_and_grade.items()
+            },
+            "duration_by_grade": dict(self.duration_by_grade),
+            "duration_by_category": dict(self.duration_by_category),
+        }
+
+def extract_stories(aggregator=None):
+    """
+    Extract all stories. Each story is decoded from the response as it
+    arrives and written straight to disk, so memory use does not grow
+    with the size of the catalog.
+    """
+    print("Extracting stories...")
+    audio_mapping = {}
+    output_file = OUTPUT_DIR / "stories.json"
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    
+    high_water = ""
+    
+    try:
+        with open(tmp_file, 'w') as f:
+            writer = JsonArrayWriter(f)
+            for story in get_client().stream_items("/api/stories"):
+                high_water = max(high_water, story_timestamp(story))
+                writer.write(localize_audio_url(story, audio_mapping))
+                if aggregator:
+                    aggregator.add_story(story)
+            writer.close()
+    except Exception as e:
+        print(f"Error fetching /api/stories: {e}")
+        tmp_file.unlink(missing_ok=True)
+        return 0
+    
+    return publish_stories(tmp_file, writer.count, audio_mapping, high_water)
+
+def publish_stories(tmp_file, count, audio_mapping, high_water=""):
+    """
+    Move a fully written stories file into place, save the audio mapping
+    and record the high-water mark for the next incremental run
+    """
+    if not count:
+        tmp_file.unlink()
+        return 0
+    
+    output_file = OUTPUT_DIR / "stories.json"
+    os.replace(tmp_file, output_file)
+    print(f"Saved {count} stories to {output_file}")
+    
+    # Save audio mapping
+    mapping_file = OUTPUT_DIR / "audio_mapping.json"
+    with open(mapping_file, 'w') as f:
+        json.dump(audio_mapping, f, indent=2)
+    print(f"Saved audio mapping to {mapping_file}")
+    
+    save_state({"high_water_mark": high_water})
+    return count
+
+def story_timestamp(story):
+    """ISO timestamp a story was last changed at, for the high-water mark"""
+    return story.get('updated_at') or story.get('created_at') or ""
+
+def is_tombstone(story):
+    return bool(story.get('deleted') or story.get('deleted_at'))
+
+def load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-def copy_audio_files():
-    """Copy audio files to iOS project structure"""
+def save_state(state):
+    """Update the given keys of the state file, keeping the others"""
+    state = {**load_state(), **state}
+    tmp_file = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_file, STATE_FILE)
+
+def metadata_digest(metadata):
+    """Hash of the metadata apart from its extraction date"""
+    content = json.dumps({**metadata, "extraction_date": None}, sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def can_extract_incrementally():
+    """A previous run left both a high-water mark and a stories.json to merge into"""
+    return bool(load_state().get('high_water_mark')) and (OUTPUT_DIR / "stories.json").exists()
+
+def extract_stories_incremental(aggregator=None):
+    """
+    Fetch only stories changed since the last run and merge them by id into
+    stories.json and audio_mapping.json. Changed stories keep their place,
+    new ones are appended and tombstones remove theirs.
+    Returns (story_count, changed_ids, deleted_ids, orphaned_audio), the
+    last being audio files that only tombstoned stories referred to.
+    """
+    since = load_state()['high_water_mark']
+    print(f"Extracting stories changed since {since}...")
+    stories_file = OUTPUT_DIR / "stories.json"
+    mapping_file = OUTPUT_DIR / "audio_mapping.json"
+    
+    with open(stories_file) as f:
+        stories = {story['id']: story for story in json.load(f)}
+    try:
+        with open(mapping_file) as f:
+            audio_mapping = json.load(f)
+    except (OSError, ValueError):
+        audio_mapping = {}
+    
+    changed, deleted = [], []
+    deleted_audio = set()
+    high_water = since
+    try:
+        for story in get_client().stream_items("/api/stories", params={DELTA_PARAM: since}):
+            high_water = max(high_water, story_timestamp(story))
+            # audio_mapping.json keys are the ids as strings
+            key = str(story['id'])
+            if is_tombstone(story):
+                audio = audio_mapping.pop(key, None)
+                if audio:
+                    deleted_audio.add(audio)
+                if stories.pop(story['id'], None) is not None:
+                    deleted.append(story['id'])
+                continue
+            
+            story_mapping = {}
+            stories[story['id']] = localize_audio_url(story, story_mapping)
+            if story_mapping:
+                audio_mapping[key] = story_mapping[story['id']]
+            else:
+                audio_mapping.pop(key, None)
+            changed.append(story['id'])
+    except Exception as e:
+        print(f"Error fetching /api/stories: {e}")
+        return 0, [], [], set()
+    
+    if changed or deleted:
+        tmp_file = stories_file.with_name(stories_file.name + ".tmp")
+        with open(tmp_file, 'w') as f:
+            writer = JsonArrayWriter(f)
+            for story in stories.values():
+                writer.write(story)
+            writer.close()
+        os.replace(tmp_file, stories_file)
+        
+        tmp_file = mapping_file.with_name(mapping_file.name + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(audio_mapping, f, indent=2)
+        os.replace(tmp_file, mapping_file)
+    
+    if aggregator:
+        for story in stories.values():
+            aggregator.add_story(story)
+    
+    save_state({"high_water_mark": high_water})
+    print(f"Merged {len(changed)} changed and {len(deleted)} deleted stories "
+          f"({len(stories)} total) into {stories_file}")
+    # Shared audio stays while any remaining story still uses it
+    orphaned_audio = deleted_audio - set(audio_mapping.values())
+    return len(stories), changed, deleted, orphaned_audio
+
+def copy_audio_files(story_ids=None):
+    """
+    Copy audio files to iOS project structure.
+    Given story_ids, only those stories' files (per audio_mapping.json) are staged.
+    """
     print("\nCopying audio files...")
     
     audio_dir = IOS_PROJECT_DIR / "Audio"
     audio_dir.mkdir(parents=True, exist_ok=True)
     
     if AUDIO_SOURCE_DIR.exists():
-        mp3_files = list(AUDIO_SOURCE_DIR.glob("*.mp3"))
-        print(f"Found {len(mp3_files)} MP3 files")
+        file_map = {mp3_file.name: mp3_file for mp3_file in AUDIO_SOURCE_DIR.glob("*.mp3")}
+        if story_ids is not None:
+            with open(OUTPUT_DIR / "audio_mapping.json") as f:
+                audio_mapping = json.load(f)
+            wanted = {audio_mapping[str(story_id)] for story_id in story_ids
+                      if str(story_id) in audio_mapping}
+            file_map = {name: path for name, path in file_map.items() if name in wanted}
+        print(f"Found {len(file_map)} MP3 files")
         
-        for mp3_file in mp3_files:
-            dest_file = audio_dir / mp3_file.name
-            shutil.copy2(mp3_file, dest_file)
-            print(f"Copied {mp3_file.name}")
+        # Other tools also write into this directory, so only files staged
+        # from here are pruned, and only by a full sync
+        report = sync_audio_files(file_map, audio_dir, prune=story_ids is None, producer=AUDIO_PRODUCER)
+        for result in report.failed:
+            print(f"Failed {result.name}: {result.error}")
         
-        print(f"\nAll audio files copied to {audio_dir}")
+        print(f"Audio: {report.summary()}")
+        print(f"\nAll audio files staged in {audio_dir}")
+        return report
     else:
         print(f"Warning: Audio source directory {AUDIO_SOURCE_DIR} not found")
+        return None
+
+def remove_orphaned_audio(names, report=None):
+    """Delete audio only tombstoned stories used, along with its manifest entries"""
+    if not names:
+        return []
+    removed = remove_audio_files(IOS_PROJECT_DIR / "Audio", sorted(names), producer=AUDIO_PRODUCER,
+                                 manifest_names=(MANIFEST_NAME, DOWNLOAD_MANIFEST_NAME))
+    for name in removed:
+        print(f"Removed {name} (story deleted)")
+    if report is not None:
+        report.removed.extend(removed)
+    return removed
+
+def create_audio_client():
+    """Audio gets its own uncached client so MP3s never land in the API response cache"""
+    return ApiClient(API_BASE_URL, timeout=API_TIMEOUT, retries=API_RETRIES,
+                     pool_size=AUDIO_DOWNLOAD_WORKERS)
+
+def print_audio_report(report):
+    for result in report.failed + report.missing:
+        print(f"Failed {result.name}: {result.error}")
+    print(f"Audio: {report.summary()}")
 
-def generate_metadata():
+def download_audio_files(story_ids=None):
+    """
+    Download the files referenced by audio_mapping.json from each story's
+    original_audio_url. Given story_ids, only those stories' files.
+    """
+    print("\nDownloading audio files...")
+    try:
+        with open(OUTPUT_DIR / "audio_mapping.json") as f:
+            audio_mapping = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: no audio mapping to download from: {e}")
+        return None
+    if story_ids is not None:
+        audio_mapping = {key: audio_mapping[key] for key in map(str, story_ids) if key in audio_mapping}
+    
+    client = create_audio_client()
+    with client:
+        report = download_audio(client,
+                                iter_audio_sources(OUTPUT_DIR / "stories.json", set(audio_mapping.values())),
+                                IOS_PROJECT_DIR / "Audio", AUDIO_DOWNLOAD_WORKERS,
+                                AUDIO_MAX_BYTES_PER_SECOND)
+    print_audio_report(report)
+    return report
+
+def fetch_story_page(params):
+    """One page of /api/stories as (items, next_cursor, total_pages, has_more)"""
+    return get_client().get_page("/api/stories", params)
+
+async def iter_story_pages_async(call, concurrency):
+    """
+    Yield pages of stories in order.
+    When the first page reports total_pages, up to `concurrency` later pages
+    are requested at once; cursor and has_more pages can only be found one
+    at a time, so the next one is requested before the current one is yielded.
+    """
+    params = {"limit": API_PAGE_SIZE}
+    items, cursor, total_pages, has_more = await call(fetch_story_page, params)
+    pending = deque()
+    try:
+        if total_pages and not cursor:
+            next_page = 2
+            while True:
+                while len(pending) < concurrency and next_page <= total_pages:
+                    pending.append(asyncio.ensure_future(
+                        call(fetch_story_page, {**params, "page": next_page})))
+                    next_page += 1
+                yield items
+                if not pending:
+                    return
+                items = (await pending.popleft())[0]
+        
+        page = 1
+        while True:
+            if cursor:
+                pending.append(asyncio.ensure_future(
+                    call(fetch_story_page, {**params, "cursor": cursor})))
+            elif has_more:
+                page += 1
+                pending.append(asyncio.ensure_future(
+                    call(fetch_story_page, {**params, "page": page})))
+            yield items
+            if not pending:
+                return
+            items, cursor, _, has_more = await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def fetch_story_details_async(story, call):
+    """Merge every STORY_DETAIL_ENDPOINTS resource into one story"""
+    keys = list(STORY_DETAIL_ENDPOINTS)
+    details = await asyncio.gather(*(
+        call(fetch_api_data, STORY_DETAIL_ENDPOINTS[key].format(id=story['id'])) for key in keys))
+    for key, detail in zip(keys, details):
+        if detail is not None:
+            story[key] = detail
+
+async def extract_stories_async(call, concurrency, downloader=None, aggregator=None):
+    """
+    extract_stories(), with pages and per-story details fetched concurrently.
+    Each story's audio is handed to downloader as soon as the story arrives.
+    """
+    print("Extracting stories...")
+    audio_mapping = {}
+    tmp_file = OUTPUT_DIR / "stories.json.tmp"
+    high_water = ""
+    
+    try:
+        with open(tmp_file, 'w') as f:
+            writer = JsonArrayWriter(f)
+            async for page in iter_story_pages_async(call, concurrency):
+                if STORY_DETAIL_ENDPOINTS:
+                    await asyncio.gather(*(fetch_story_details_async(story, call) for story in page))
+                for story in page:
+                    high_water = max(high_water, story_timestamp(story))
+                    writer.write(localize_audio_url(story, audio_mapping))
+                    if aggregator:
+                        aggregator.add_story(story)
+                    if downloader and story.get('local_audio_file') and story.get('original_audio_url'):
+                        downloader.submit(story['local_audio_file'], story['original_audio_url'],
+                                          story.get('audio_sha256'))
+            writer.close()
+    except Exception as e:
+        print(f"Error fetching /api/stories: {e}")
+        tmp_file.unlink(missing_ok=True)
+        return 0
+    
+    return publish_stories(tmp_file, writer.count, audio_mapping, high_water)
+
+async def extract_async(concurrency=None, download=False, aggregator=None):
+    """
+    Fetch categories, story pages and story details while audio is staged.
+    At most `concurrency` API requests are in flight; the blocking client
+    runs on a thread pool so the shared connection pool is reused. With
+    download, audio is fetched from the server as stories arrive instead
+    of being copied from AUDIO_SOURCE_DIR.
+    Returns (categories, story_count).
+    """
+    concurrency = concurrency or API_CONCURRENCY
+    loop = asyncio.get_running_loop()
+    limiter = asyncio.Semaphore(concurrency)
+    downloader = None
+    if download:
+        print("\nDownloading audio files...")
+        downloader = AudioDownloader(create_audio_client(), IOS_PROJECT_DIR / "Audio",
+                                     AUDIO_DOWNLOAD_WORKERS, AUDIO_MAX_BYTES_PER_SECOND)
+    
+    with ThreadPoolExecutor(max_workers=concurrency + 1) as pool:
+        async def call(fn, *args):
+            async with limiter:
+                return await loop.run_in_executor(pool, fn, *args)
+        
+        tasks = [call(extract_categories, aggregator),
+                 extract_stories_async(call, concurrency, downloader, aggregator)]
+        if not downloader:
+            tasks.append(loop.run_in_executor(pool, copy_audio_files))
+        categories, story_count, *audio = await asyncio.gather(*tasks)
+        
+        if downloader:
+            with downloader.client:
+                report = await loop.run_in_executor(pool, downloader.finish)
+            print_audio_report(report)
+        else:
+            report = audio[0]
+    if aggregator and report:
+        aggregator.add_audio_report(report)
+    return categories, story_count
+
+def generate_metadata(aggregator):
     """Generate metadata file with summary information"""
     print("\nGenerating metadata...")
     
-    metadata = {
-        "version": "1.0",
-        "extraction_date": str(Path.cwd()),
-        "categories_count": 0,
-        "stories_count": 0,
-        "total_audio_files": 0,
-        "grade_levels": ["grade_prek", "grade_k", "grade_1", "grade_2"]
-    }
-    
-    # Count categories
-    categories_file = OUTPUT_DIR / "categories.json"
-    if categories_file.exists():
-        with open(categories_file) as f:
-            categories = json.load(f)
-            metadata["categories_count"] = len(categories)
-    
-    # Count stories
-    stories_file = OUTPUT_DIR / "stories.json"
-    if stories_file.exists():
-        with open(stories_file) as f:
-            stories = json.load(f)
-            metadata["stories_count"] = len(stories)
-            
-            # Group by grade level
-            grade_counts = {}
-            for story in stories:
-                grade = story.get('grade_level', 'unknown')
-                grade_counts[grade] = grade_counts.get(grade, 0) + 1
-            metadata["stories_by_grade"] = grade_counts
-    
-    # Count audio files
-    audio_dir = IOS_PROJECT_DIR / "Audio"
-    if audio_dir.exists():
-        metadata["total_audio_files"] = len(list(audio_dir.glob("*.mp3")))
+    metadata = aggregator.metadata(IOS_PROJECT_DIR / "Audio")
     
     metadata_file = OUTPUT_DIR / "metadata.json"
-    with open(metadata_file, 'w') as f:
+    # Keep the previous date if nothing else changed, so an unchanged
+    # catalog republishes nothing to the iOS project
+    state = load_state()
+    digest = metadata_digest(metadata)
+    if state.get('metadata_sha256') == digest and state.get('extraction_date'):
+        metadata["extraction_date"] = state['extraction_date']
+    
+    tmp_file = metadata_file.with_name(metadata_file.name + ".tmp")
+    with open(tmp_file, 'w') as f:
         json.dump(metadata, f, indent=2)
+    os.replace(tmp_file, metadata_file)
+    save_state({"metadata_sha256": digest, "extraction_date": metadata["extraction_date"]})
     print(f"Saved metadata to {metadata_file}")
     
     return metadata
 
-def main():
+def main(async_mode=False, incremental=False, download=False):
     """Main extraction process"""
     print("StorySage Data Extraction Tool")
     print("=" * 50)
@@ -154,31 +581,80 @@ def main():
     OUTPUT_DIR.mkdir(exist_ok=True)
     IOS_PROJECT_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Extract data
-    categories = extract_categories()
-    stories = extract_stories()
-    
-    # Copy audio files
-    copy_audio_files()
-    
-    # Generate metadata
-    metadata = generate_metadata()
+    if incremental and not can_extract_incrementally():
+        print("No previous extraction to update, running a full extraction")
+        incremental = False
     
-    # Copy JSON files to iOS project
-    data_dir = IOS_PROJECT_DIR / "Data"
-    data_dir.mkdir(exist_ok=True)
+    aggregator = MetadataAggregator()
+    if incremental:
+        extract_categories(aggregator)
+        story_count, changed_ids, _, orphaned_audio = extract_stories_incremental(aggregator)
+        
+        # Only the changed stories can have new audio, and only tombstoned
+        # ones can leave audio behind
+        if download:
+            audio_report = download_audio_files(changed_ids)
+        else:
+            audio_report = copy_audio_files(changed_ids)
+        remove_orphaned_audio(orphaned_audio, audio_report)
+    elif async_mode:
+        _, story_count = asyncio.run(extract_async(download=download, aggregator=aggregator))
+        audio_report = None
+    else:
+        # Extract data
+        extract_categories(aggregator)
+        story_count = extract_stories(aggregator)
+        
+        # Copy audio files
+        if download:
+            audio_report = download_audio_files()
+        else:
+            audio_report = copy_audio_files()
+    if audio_report:
+        aggregator.add_audio_report(audio_report)
     
-    for json_file in OUTPUT_DIR.glob("*.json"):
-        dest_file = data_dir / json_file.name
-        shutil.copy2(json_file, dest_file)
-        print(f"Copied {json_file.name} to iOS project")
+    # Generate metadata from what passed through extraction
+    if story_count:
+        metadata = generate_metadata(aggregator)
+    else:
+        print("\nNo stories extracted, leaving metadata.json as it was")
+        metadata = {}
     
+    # Publish changed JSON files to the iOS project as one set
+    report = publish_files(OUTPUT_DIR.glob("*.json"), IOS_PROJECT_DIR / "Data")
+    print(f"\niOS data: {report.summary()}")
+    for line in report.lines():
+        print(line)
+
     print("\n" + "=" * 50)
     print("Extraction complete!")
     print(f"Categories: {metadata.get('categories_count', 0)}")
     print(f"Stories: {metadata.get('stories_count', 0)}")
     print(f"Audio files: {metadata.get('total_audio_files', 0)}")
+    client = get_client()
+    if client.cache:
+        print(f"API cache: {client.cache.summary()}")
+    client.close()
     print(f"\nData saved to: {IOS_PROJECT_DIR}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Extract StorySage data for the iOS app")
+    parser.add_argument("--async", dest="async_mode", action="store_true",
+                        help="fetch categories, stories and audio concurrently")
+    parser.add_argument("--concurrency", type=int, default=API_CONCURRENCY,
+                        help=f"API requests in flight in --async mode (default: {API_CONCURRENCY})")
+    parser.add_argument("--incremental", action="store_true",
+                        help="fetch only stories changed since the last run and merge them")
+    parser.add_argument("--download-audio", action="store_true",
+                        help="download audio from the server instead of copying AUDIO_SOURCE_DIR")
+    parser.add_argument("--max-bandwidth", type=float, metavar="MB_PER_SEC",
+                        help="cap total audio download bandwidth")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the on-disk response cache and download everything")
+    args = parser.parse_args()
+    API_CONCURRENCY = args.concurrency
+    if args.no_cache:
+        API_CACHE_DIR = None
+    if args.max_bandwidth:
+        AUDIO_MAX_BYTES_PER_SECOND = args.max_bandwidth * 1024 * 1024
+    main(async_mode=args.async_mode, incremental=args.incremental, download=args.download_audio)
\ No newline at end of file
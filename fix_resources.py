@@ -1,106 +1,174 @@
 #!/usr/bin/env python3
 """
-Fix Resources in Xcode project - Add all audio files to Copy Bundle Resources
+Fix Resources in Xcode project - Keep Copy Bundle Resources in sync with the audio files
+
+Reconciles the project against Resources/Audio: MP3s that no file
+reference resolves to are added to the group mapped to that directory
+(StorySage/Resources/Audio, created if missing) and everything else is
+left untouched, so rerunning it leaves the project file byte-for-byte the
+same when nothing changed. References to MP3s that aren't in the directory are only listed
+unless --remove is given, since a checkout may hold just some of the
+audio. --dry-run prints the plan without writing anything.
 """
 
+import argparse
 import os
-import re
-import uuid
-
-def generate_uuid():
-    """Generate a 24-character uppercase hex UUID for Xcode"""
-    return uuid.uuid4().hex[:24].upper()
-
-def find_copy_bundle_resources_section(content):
-    """Find the Copy Bundle Resources section"""
-    match = re.search(r'/\* Resources \*/ = \{\s*isa = PBXResourcesBuildPhase;\s*buildActionMask = [^;]+;\s*files = \(\s*([^)]*)\s*\);', content, re.DOTALL)
-    if match:
-        return match
-    return None
-
-def add_audio_files_to_project(project_file):
-    """Add audio files to the Xcode project"""
-    
-    # Read the project file
-    with open(project_file, 'r') as f:
-        content = f.read()
-    
+import posixpath
+from pathlib import Path
+
+from pbxproj import PbxProject
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+PROJECT_FILE = PROJECT_ROOT / "StorySage.xcodeproj" / "project.pbxproj"
+AUDIO_DIR = PROJECT_ROOT / "StorySage" / "Resources" / "Audio"
+
+def source_relative(project, directory):
+    """directory relative to the project's SOURCE_ROOT, or absolute if it is outside it"""
+    directory = os.path.abspath(directory)
+    relative = os.path.relpath(directory, project.source_root)
+    if relative == os.curdir:
+        return ""
+    return directory if relative.startswith(os.pardir) else Path(relative).as_posix()
+
+def resource_group(project, directory):
+    """The group mapped to directory, created with any missing parent groups"""
+    return project.group_at(source_relative(project, directory), create=True)
+
+def registered_files(project, directory, suffix):
+    """
+    Suffix file references that resolve to a file directly in directory,
+    by name, and those with the same suffix that resolve anywhere else,
+    as {name: [references]}
+    """
+    directory = source_relative(project, directory)
+    here, elsewhere = {}, {}
+    for file_ref, path in resolved_files(project):
+        if path.endswith(suffix):
+            folder, name = posixpath.split(path)
+            if folder == directory:
+                here[name] = file_ref
+            else:
+                elsewhere.setdefault(name, []).append(file_ref)
+    return here, elsewhere
+
+def resolved_files(project):
+    """(file reference, source path) for every file reference in the group tree"""
+    paths = project.source_paths()
+    for file_ref in project.isa("PBXFileReference"):
+        path = paths.get(file_ref.id)
+        if path is not None:
+            yield file_ref, path
+
+def add_resource(project, group, phase, name, file_type, file_ref=None):
+    """
+    Register name from group's directory in phase: a new file reference
+    with its build file, or just the build file for an existing file_ref
+    that isn't built. Returns the file reference.
+    """
+    if file_ref is None:
+        file_ref, _ = project.add_file(group, name, file_type, phase)
+        return file_ref
+    build_id = project.file_ids(group, name, phase)[1]
+    build_file = project.add("PBXBuildFile", {"fileRef": file_ref.id}, f"{name} in {phase.comment}", build_id)
+    phase.append('files', build_file.id)
+    return file_ref
+
+def built_files(project, phase):
+    """IDs of the file references phase builds"""
+    return {project[build_id].get('fileRef') for build_id in phase.get('files', []) if build_id in project}
+
+def reconcile_files(project, directory, phase, names, suffix, file_type, remove=False):
+    """
+    Make the suffix files the project resolves to directory match names,
+    comparing resolved paths rather than bare names. Each missing name
+    gets a file reference in the group mapped to directory (created if
+    there is none) and a Resources build file; references that lost
+    their build file get one back. A name the phase already copies from
+    another location is left alone and returned as shadowed, since a
+    second copy would collide in the bundle. Registered names that are
+    gone are returned as removed, but their references (with build
+    files) are only dropped with remove. Returns (added, removed,
+    shadowed) names; the project is not saved.
+    """
+    registered, elsewhere = registered_files(project, directory, suffix)
+    in_phase = built_files(project, phase)
+    names = set(names)
+    added, shadowed = [], []
+    group = None
+    for name in sorted(names):
+        file_ref = registered.get(name)
+        if file_ref is not None and file_ref.id in in_phase:
+            continue
+        if any(other.id in in_phase for other in elsewhere.get(name, ())):
+            shadowed.append(name)
+            continue
+        group = group or resource_group(project, directory)
+        add_resource(project, group, phase, name, file_type, file_ref)
+        added.append(name)
+
+    removed = sorted(registered.keys() - names)
+    if remove and removed:
+        project.remove_files(registered[name].id for name in removed)
+    return added, removed, shadowed
+
+def reconcile_audio_files(project_file=PROJECT_FILE, audio_dir=AUDIO_DIR, remove=False, dry_run=False):
+    """Sync the project's MP3 references with the audio directory"""
+
+    # Parse the project file once
+    project = PbxProject.load(project_file)
+
     # Find all MP3 files in Resources/Audio
-    audio_dir = "/Users/efmbpm2/repos/StorySage/iOS/StorySage/Resources/Audio"
     mp3_files = [f for f in os.listdir(audio_dir) if f.endswith('.mp3')]
-    
-    print(f"Found {len(mp3_files)} MP3 files to add")
-    
-    # Find the PBXBuildFile section
-    build_file_section = content.find("/* End PBXBuildFile section */")
-    
-    # Find the PBXFileReference section  
-    file_ref_section = content.find("/* End PBXFileReference section */")
-    
-    # Find the Resources group
-    resources_match = re.search(r'/\* Resources \*/ = \{[^}]+files = \(([^)]*)\);', content, re.DOTALL)
-    if not resources_match:
+    print(f"Found {len(mp3_files)} MP3 files in {audio_dir}")
+
+    # Find the Copy Bundle Resources phase
+    resources_phase = project.build_phase("PBXResourcesBuildPhase")
+    if resources_phase is None:
         print("ERROR: Could not find Resources build phase")
         return
-    
-    resources_files = resources_match.group(1).strip()
-    
-    # Generate entries for each MP3 file
-    new_build_files = []
-    new_file_refs = []
-    new_resource_refs = []
-    
-    for mp3_file in mp3_files:
-        # Generate UUIDs
-        build_uuid = generate_uuid()
-        file_uuid = generate_uuid()
-        
-        # Create build file entry
-        build_entry = f"\t\t{build_uuid} /* {mp3_file} in Resources */ = {{isa = PBXBuildFile; fileRef = {file_uuid} /* {mp3_file} */; }};"
-        new_build_files.append(build_entry)
-        
-        # Create file reference entry
-        file_entry = f'\t\t{file_uuid} /* {mp3_file} */ = {{isa = PBXFileReference; lastKnownFileType = audio.mp3; path = "{mp3_file}"; sourceTree = "<group>"; }};'
-        new_file_refs.append(file_entry)
-        
-        # Add to resources list
-        resource_ref = f"\t\t\t\t{build_uuid} /* {mp3_file} in Resources */,"
-        new_resource_refs.append(resource_ref)
-    
-    # Insert build files
-    content = content[:build_file_section] + '\n'.join(new_build_files) + '\n' + content[build_file_section:]
-    
-    # Update file reference section
-    file_ref_section = content.find("/* End PBXFileReference section */")
-    content = content[:file_ref_section] + '\n'.join(new_file_refs) + '\n' + content[file_ref_section:]
-    
-    # Update resources list
-    if resources_files:
-        # Add comma after existing entries if needed
-        if not resources_files.rstrip().endswith(','):
-            resources_files += ','
-        new_resources = resources_files + '\n' + '\n'.join(new_resource_refs)
-    else:
-        new_resources = '\n'.join(new_resource_refs)
-    
-    content = re.sub(
-        r'(/\* Resources \*/ = \{[^}]+files = \()[^)]*(\);)', 
-        rf'\1{new_resources}\n\t\t\t\2',
-        content,
-        flags=re.DOTALL
-    )
-    
-    # Write back
-    with open(project_file, 'w') as f:
-        f.write(content)
-    
-    print(f"✅ Added {len(mp3_files)} MP3 files to project")
+
+    added, removed, shadowed = reconcile_files(project, audio_dir, resources_phase, mp3_files, ".mp3",
+                                               "audio.mp3", remove)
+    for name in added:
+        print(f"  + {name}")
+    for name in shadowed:
+        print(f"  = {name} (already bundled from another location)")
+    if shadowed:
+        print(f"⚠️  {len(shadowed)} MP3s are bundled from outside {audio_dir}; "
+              f"bundle_audit.py --collapse --apply moves them here")
+    # Without --remove, references to absent MP3s are only reported
+    kept = [] if remove else removed
+    removed = removed if remove else []
+    for name in removed:
+        print(f"  - {name}")
+    for name in kept:
+        print(f"  ? {name} (not in {audio_dir})")
+    if kept:
+        print(f"⚠️  Keeping {len(kept)} registered MP3s that aren't in {audio_dir}; "
+              f"pass --remove to drop their references")
+
+    if dry_run:
+        print(f"Dry run: would add {len(added)} and remove {len(removed)} MP3 files")
+        return
+
+    # Write back only if something changed
+    if not project.save():
+        print("✅ No new MP3s to add" if kept else "✅ Project already matches the audio directory")
+        return
+
+    print(f"✅ Added {len(added)} and removed {len(removed)} MP3 files")
     print("\nNext steps:")
     print("1. Close Xcode")
-    print("2. Open Xcode again") 
+    print("2. Open Xcode again")
     print("3. Clean build folder (Shift+Cmd+K)")
     print("4. Build and run (Cmd+R)")
 
 if __name__ == "__main__":
-    project_file = "/Users/efmbpm2/repos/StorySage/iOS/StorySage.xcodeproj/project.pbxproj"
-    add_audio_files_to_project(project_file)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Reconcile the project's MP3 resources with Resources/Audio")
+    parser.add_argument("--project", type=Path, default=PROJECT_FILE, help="project.pbxproj to update")
+    parser.add_argument("--audio-dir", type=Path, default=AUDIO_DIR)
+    parser.add_argument("--remove", action="store_true",
+                        help="remove references to MP3s that aren't in the audio directory")
+    parser.add_argument("--dry-run", action="store_true", help="print the changes without writing them")
+    args = parser.parse_args()
+    reconcile_audio_files(args.project, args.audio_dir, args.remove, args.dry_run)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache keyed by URL.
+Bodies are stored alongside their ETag / Last-Modified validators so a
+repeat request can be sent as a conditional GET; a 304 reuses the stored
+body instead of downloading it again. Entries not revalidated within the
+TTL are dropped, and the least recently used entries are evicted once the
+cache grows past its size limit.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+INDEX_NAME = "index.json"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Response headers kept with the body so a 304 can be served as the original
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class ResponseCache:
+    def __init__(self, directory, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_reused = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index = self._load_index()
+        self._expire()
+
+    def _load_index(self):
+        try:
+            with open(self.directory / INDEX_NAME) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Drop entries whose body has gone missing
+        return {url: entry for url, entry in index.items()
+                if (self.directory / entry['file']).exists()}
+
+    def _body_path(self, url):
+        return self.directory / (hashlib.sha256(url.encode()).hexdigest() + ".body")
+
+    def _remove(self, url):
+        entry = self._index.pop(url)
+        (self.directory / entry['file']).unlink(missing_ok=True)
+        self._dirty = True
+
+    def _expire(self, now=None):
+        now = now or time.time()
+        for url in [url for url, entry in self._index.items() if now - entry['validated'] > self.ttl]:
+            self._remove(url)
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self._index.values())
+        for url in sorted(self._index, key=lambda url: self._index[url]['used']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[url]['size']
+            self._remove(url)
+
+    def validators(self, url):
+        """Conditional request headers for url, or {} when nothing is cached"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return {}
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            return headers
+
+    def _revalidated(self, url):
+        """Entry for a 304 response, marked as just validated; call with the lock held"""
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        entry['validated'] = entry['used'] = time.time()
+        self._dirty = True
+        self.hits += 1
+        self.bytes_reused += entry['size']
+        return entry
+
+    def load(self, url):
+        """
+        Body and headers for a 304 response, marking the entry revalidated.
+        Returns None if the entry disappeared in the meantime.
+        """
+        with self._lock:
+            entry = self._revalidated(url)
+            if entry is None:
+                return None
+            try:
+                return (self.directory / entry['file']).read_bytes(), entry['headers']
+            except OSError:
+                self._remove(url)
+                return None
+
+    def open(self, url):
+        """load(), but returns an open binary file instead of the body"""
+        with self._lock:
+            entry = self._revalidated(url)
+            if entry is None:
+                return None
+            try:
+                return open(self.directory / entry['file'], 'rb'), entry['headers']
+            except OSError:
+                self._remove(url)
+                return None
+
+    def writer(self, url, headers):
+        """
+        A CacheWriter to stream a 200 response body into, or None if the
+        response has no validator to revalidate it with
+        """
+        with self._lock:
+            self.misses += 1
+        if not headers.get('ETag') and not headers.get('Last-Modified'):
+            return None
+        return CacheWriter(self, url, headers)
+
+    def store(self, url, body, headers):
+        """Keep a 200 response if it carries a validator to revalidate with"""
+        writer = self.writer(url, headers)
+        if writer:
+            writer.write(body)
+            writer.commit()
+
+    def _add(self, url, path, size, headers):
+        with self._lock:
+            now = time.time()
+            self._index[url] = {
+                "file": path.name,
+                "size": size,
+                "etag": headers.get('ETag'),
+                "last_modified": headers.get('Last-Modified'),
+                "headers": {key: headers[key] for key in KEPT_HEADERS if key in headers},
+                "validated": now,
+                "used": now,
+            }
+            self._dirty = True
+            self._evict()
+
+    def flush(self):
+        """Write the index if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            path = self.directory / INDEX_NAME
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(self._index, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+            self._dirty = False
+
+    def summary(self):
+        return (f"{self.hits} not modified ({self.bytes_reused / 1024:.1f} KB reused), "
+                f"{self.misses} downloaded")
+
+
+class CacheWriter:
+    """
+    Writes a body to a temp file as it arrives; commit() adds it to the
+    cache. Bodies larger than the cache itself are abandoned.
+    """
+
+    def __init__(self, cache, url, headers):
+        self.cache = cache
+        self.url = url
+        self.headers = headers
+        self.path = cache._body_path(url)
+        self.tmp_path = self.path.with_name(f"{self.path.name}.{threading.get_ident()}.tmp")
+        self.size = 0
+        self._file = open(self.tmp_path, 'wb')
+
+    def write(self, data):
+        if self._file is None:
+            return
+        self.size += len(data)
+        if self.size > self.cache.max_bytes:
+            self.abort()
+            return
+        self._file.write(data)
+
+    def commit(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        os.replace(self.tmp_path, self.path)
+        self.cache._add(self.url, self.path, self.size, self.headers)
+
+    def abort(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self.tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Incremental decoding of large JSON array responses.
+Reads the body chunk by chunk and yields array elements one at a time with
+json.JSONDecoder.raw_decode, so memory holds a single element plus one
+chunk rather than the whole payload. Handles a bare array body as well as
+an object whose "data" key holds the array; the object's other keys
+(pagination and the like) are decoded normally.
+"""
+
+import codecs
+import json
+
+WHITESPACE = " \t\n\r"
+# Characters that can continue a number, e.g. "-3" then "e10" in the next chunk
+NUMBER_CHARS = set("0123456789+-.eE")
+
+
+class JsonStream:
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """Append the next chunk, dropping what has been consumed. False at EOF."""
+        if self._eof:
+            return False
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buf += text
+                return True
+        self._buf += self._decoder.decode(b"", final=True)
+        self._eof = True
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or '' at EOF"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos} of the buffered body")
+        self._pos += 1
+
+    def value(self):
+        """Decode one complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if self._eof or (end < len(self._buf) and self._buf[end] not in NUMBER_CHARS):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def iter_array(self):
+        """Yield the elements of the array starting at the current position"""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == "]":
+                self._pos += 1
+                return
+            self.expect(",")
+
+
+def iter_items(chunks, meta=None, key="data"):
+    """
+    Yield the elements of a JSON array body, or of the array under `key` in
+    an object body. The object's other top-level keys are stored in meta,
+    which is complete once iteration finishes.
+    """
+    stream = JsonStream(chunks)
+    if stream.peek() == "[":
+        yield from stream.iter_array()
+        return
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        name = stream.value()
+        stream.expect(":")
+        if name == key and stream.peek() == "[":
+            yield from stream.iter_array()
+        else:
+            value = stream.value()
+            if meta is not None:
+                meta[name] = value
+        if stream.peek() == "}":
+            return
+        stream.expect(",")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the StorySage API server, backed by a synthetic catalog.
+Serves /api/categories, paginated /api/stories (page or cursor style,
+with updated_since), /api/stories/<id>/segments and /audio/<file>.mp3
+with ETag, Range and Digest support, so extract_server_data.py can be run
+and benchmarked without the real server. Latency, error rate and story
+payload size can be injected.
+
+Usage:
+    python3 mock_api_server.py --stories 10000 --latency 20 --error-rate 0.01
+    python3 extract_server_data.py   # API_BASE_URL defaults to localhost:5010
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import synthetic_catalog
+
+DEFAULT_PORT = 5010
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 1000
+
+
+def server_story(story, index, audio_sha256, payload_bytes=0):
+    """A synthetic catalog story in the API's snake_case shape"""
+    updated = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=index)
+    result = {
+        "id": story["id"],
+        "title": story["title"],
+        "description": story["description"],
+        "category": story["category"],
+        "grade_level": story["gradeLevel"],
+        "duration": story["duration"],
+        "key_lessons": story["keyLessons"],
+        "tags": story["tags"],
+        "audio_url": f"/audio/{story['id']}.mp3",
+        "audio_sha256": audio_sha256,
+        "created_at": updated.isoformat(),
+        "updated_at": updated.isoformat(),
+    }
+    if payload_bytes:
+        result["transcript"] = "x" * payload_bytes
+    return result
+
+
+class MockApiServer:
+    """
+    Threaded server on a background thread.
+    stats counts requests, injected errors and body bytes sent.
+    """
+
+    def __init__(self, stories=1000, audio_seconds=1.0, pagination="page", latency=0.0,
+                 jitter=0.0, error_rate=0.0, payload_bytes=0, seed=0,
+                 host="127.0.0.1", port=0):
+        self.audio = synthetic_catalog.mp3_stub(audio_seconds)
+        self.audio_etag = '"' + hashlib.md5(self.audio).hexdigest() + '"'
+        audio_sha256 = hashlib.sha256(self.audio).digest()
+        self.audio_digest = "sha-256=" + base64.b64encode(audio_sha256).decode()
+        self.stories = [server_story(story, index, audio_sha256.hex(), payload_bytes)
+                        for index, story in enumerate(synthetic_catalog.generate_stories(stories, seed))]
+        self.story_ids = {story["id"] for story in self.stories}
+        self.categories = synthetic_catalog.generate_categories()["categories"]
+        self.pagination = pagination
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "errors": 0, "bytes_sent": 0}
+        self._lock = threading.Lock()
+        self.httpd = _Server((host, port), _Handler)
+        self.httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, sent=0, error=False):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_sent"] += sent
+            self.stats["errors"] += error
+
+    def inject(self):
+        """Sleep for the configured latency; True if this request should fail"""
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        return self.error_rate and self.random.random() < self.error_rate
+
+    def story_page(self, query):
+        """The /api/stories response for the given query parameters"""
+        limit = min(int(query.get("limit", [DEFAULT_PAGE_LIMIT])[0]), MAX_PAGE_LIMIT)
+        stories = self.stories
+        since = query.get("updated_since", [None])[0]
+        if since:
+            stories = [story for story in stories if story["updated_at"] > since]
+
+        if self.pagination == "cursor":
+            start = int(query.get("cursor", ["0"])[0])
+            end = start + limit
+            return {"data": stories[start:end],
+                    "next_cursor": str(end) if end < len(stories) else None}
+
+        page = int(query.get("page", ["1"])[0])
+        total_pages = max(1, -(-len(stories) // limit))
+        return {"data": stories[(page - 1) * limit:page * limit],
+                "pagination": {"page": page, "total_pages": total_pages, "total": len(stories)}}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping idle keep-alive connections on exit is expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients stall on delayed ACKs and the benchmark measures that instead
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+        self.server.mock.count(len(body), error=status >= 500)
+
+    def _send_json(self, data):
+        body = json.dumps(data).encode()
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers={"ETag": etag})
+        else:
+            self._send(200, body, {"Content-Type": "application/json", "ETag": etag})
+
+    def do_GET(self):
+        mock = self.server.mock
+        url = urlparse(self.path)
+        if mock.inject():
+            self._send(503, b'{"error": "injected failure"}', {"Content-Type": "application/json"})
+            return
+
+        if url.path == "/api/categories":
+            self._send_json({"data": mock.categories})
+        elif url.path == "/api/stories":
+            self._send_json(mock.story_page(parse_qs(url.query)))
+        elif re.fullmatch(r"/api/stories/[^/]+/segments", url.path):
+            story_id = url.path.split("/")[3]
+            if story_id not in mock.story_ids:
+                self._send(404)
+            else:
+                self._send_json({"data": [{"index": i, "start": i * 60} for i in range(3)]})
+        elif url.path.startswith("/audio/") and url.path.endswith(".mp3"):
+            if url.path[len("/audio/"):-len(".mp3")] not in mock.story_ids:
+                self._send(404)
+            else:
+                self._send_audio(mock)
+        else:
+            self._send(404)
+
+    def _send_audio(self, mock):
+        headers = {"Content-Type": "audio/mpeg", "ETag": mock.audio_etag,
+                   "Accept-Ranges": "bytes", "Digest": mock.audio_digest}
+        if self.headers.get("If-None-Match") == mock.audio_etag:
+            self._send(304, headers={"ETag": mock.audio_etag})
+            return
+
+        body = mock.audio
+        match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if match and self.headers.get("If-Range", mock.audio_etag) == mock.audio_etag:
+            start = int(match.group(1))
+            if start >= len(body):
+                self._send(416, headers={"Content-Range": f"bytes */{len(body)}"})
+                return
+            headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+            self._send(206, body[start:], headers)
+        else:
+            self._send(200, body, headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic StorySage API")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--stories", type=int, default=1000)
+    parser.add_argument("--audio-seconds", type=float, default=1.0)
+    parser.add_argument("--pagination", choices=["page", "cursor"], default="page")
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random milliseconds, up to this")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="filler bytes added to every story")
+    args = parser.parse_args()
+
+    server = MockApiServer(args.stories, args.audio_seconds, args.pagination,
+                           args.latency / 1000, args.jitter / 1000, args.error_rate,
+                           args.payload_bytes, port=args.port)
+    print(f"🧪 Serving {len(server.stories)} synthetic stories at {server.url} (Ctrl-C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n📊 {server.stats['requests']} requests, {server.stats['errors']} injected errors, "
+              f"{server.stats['bytes_sent'] / 2**20:.1f} MB sent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Pure-Python MP3 frame scanner.
+Reads durations from the Xing/Info or VBRI header when the encoder wrote
+one, and otherwise walks every frame header. Files are memory-mapped so
+only the header bytes are ever touched.
+
+Run directly to print durations: python3 mp3_scan.py file.mp3 ...
+"""
+
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+# Bitrates in kbps, indexed by [version is MPEG1][layer][bitrate index]
+_BITRATES_V1 = {
+    1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+}
+_BITRATES_V2 = {
+    1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates indexed by version bits (0 = MPEG2.5, 2 = MPEG2, 3 = MPEG1)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    version: int       # version bits: 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    layer: int         # 1, 2 or 3
+    bitrate: int       # kbps
+    sample_rate: int
+    padding: int
+    channel_mode: int  # 3 = mono
+    length: int        # frame length in bytes, header included
+    samples: int       # samples per frame
+
+
+@dataclass
+class Mp3Info:
+    duration: float
+    frames: int
+    sample_rate: int
+    bitrate: int       # average kbps
+    method: str        # xing / vbri / walk
+    audio_start: int
+    audio_end: int
+
+
+def parse_header(buf, offset):
+    """Parse the 4-byte frame header at offset, or return None if invalid"""
+    if offset + 4 > len(buf):
+        return None
+    b0, b1, b2, b3 = buf[offset], buf[offset + 1], buf[offset + 2], buf[offset + 3]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    layer = 4 - layer_bits
+    table = _BITRATES_V1 if version == 3 else _BITRATES_V2
+    bitrate = table[layer][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    channel_mode = (b3 >> 6) & 0x03
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    elif layer == 2 or version == 3:
+        samples = 1152
+        length = 144 * bitrate * 1000 // sample_rate + padding
+    else:
+        samples = 576
+        length = 72 * bitrate * 1000 // sample_rate + padding
+
+    return FrameHeader(version, layer, bitrate, sample_rate, padding,
+                       channel_mode, length, samples)
+
+
+def id3v2_size(buf):
+    """Size of a leading ID3v2 tag (including footer), or 0"""
+    if len(buf) < 10 or buf[:3] != b"ID3":
+        return 0
+    size = (buf[6] << 21) | (buf[7] << 14) | (buf[8] << 7) | buf[9]
+    footer = 10 if buf[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def audio_end(buf):
+    """Offset where trailing ID3v1 / APEv2 tags start"""
+    end = len(buf)
+    if end >= 128 and buf[end - 128:end - 125] == b"TAG":
+        end -= 128
+    if end >= 32 and buf[end - 32:end - 24] == b"APETAGEX":
+        tag_size = int.from_bytes(buf[end - 20:end - 16], "little")
+        flags = int.from_bytes(buf[end - 12:end - 8], "little")
+        header = 32 if flags & 0x80000000 else 0
+        end -= tag_size + header
+    return max(end, 0)
+
+
+def find_first_frame(buf, start, end):
+    """First offset with a valid header that is followed by another valid header"""
+    offset = start
+    while offset < end - 4:
+        offset = buf.find(b"\xff", offset, end)
+        if offset < 0:
+            return -1
+        header = parse_header(buf, offset)
+        if header:
+            following = offset + header.length
+            if following >= end or parse_header(buf, following):
+                return offset
+        offset += 1
+    return -1
+
+
+def iter_frames(buf, start, end):
+    """
+    Yield (offset, header) for each frame between start and end.
+    Resynchronizes past junk bytes between frames.
+    """
+    offset = find_first_frame(buf, start, end)
+    while 0 <= offset < end:
+        header = parse_header(buf, offset)
+        if header is None or offset + header.length > end:
+            if header is not None:
+                # Truncated final frame
+                return
+            offset = find_first_frame(buf, offset + 1, end)
+            continue
+        yield offset, header
+        offset += header.length
+
+
+def _side_info_size(header):
+    if header.version == 3:
+        return 17 if header.channel_mode == 3 else 32
+    return 9 if header.channel_mode == 3 else 17
+
+
+def read_vbr_header(buf, offset, header):
+    """Frame count from a Xing/Info or VBRI header in the first frame"""
+    xing = offset + 4 + _side_info_size(header)
+    tag = buf[xing:xing + 4]
+    if tag in (b"Xing", b"Info"):
+        flags = int.from_bytes(buf[xing + 4:xing + 8], "big")
+        if flags & 0x01:
+            return "xing", int.from_bytes(buf[xing + 8:xing + 12], "big")
+
+    vbri = offset + 4 + 32
+    if buf[vbri:vbri + 4] == b"VBRI":
+        return "vbri", int.from_bytes(buf[vbri + 14:vbri + 18], "big")
+
+    return None, 0
+
+
+def scan_buffer(buf):
+    """Measure an in-memory (or mmapped) MP3; returns Mp3Info or None"""
+    start = id3v2_size(buf)
+    end = audio_end(buf)
+    first = find_first_frame(buf, start, end)
+    if first < 0:
+        return None
+
+    header = parse_header(buf, first)
+    method, frames = read_vbr_header(buf, first, header)
+    if method and frames:
+        duration = frames * header.samples / header.sample_rate
+        audio_bytes = end - first - header.length
+        bitrate = round(audio_bytes * 8 / duration / 1000) if duration else 0
+        return Mp3Info(duration, frames, header.sample_rate, bitrate, method, first, end)
+
+    frames = 0
+    samples = 0
+    audio_bytes = 0
+    sample_rate = header.sample_rate
+    for _, frame in iter_frames(buf, first, end):
+        frames += 1
+        samples += frame.samples
+        audio_bytes += frame.length
+    duration = samples / sample_rate
+    bitrate = round(audio_bytes * 8 / duration / 1000) if duration else 0
+    return Mp3Info(duration, frames, sample_rate, bitrate, "walk", first, end)
+
+
+def scan_file(path):
+    """Measure an MP3 file on disk; returns Mp3Info or None"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return scan_buffer(buf)
+
+
+def _scan_path(path):
+    try:
+        return str(path), scan_file(path)
+    except (OSError, ValueError):
+        return str(path), None
+
+
+def scan_files(paths, workers=None):
+    """Scan many files across a process pool; returns {path: Mp3Info or None}"""
+    paths = [str(p) for p in paths]
+    if len(paths) < 2:
+        return dict(_scan_path(p) for p in paths)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_scan_path, paths, chunksize=max(1, len(paths) // 64)))
+
+
+if __name__ == "__main__":
+    for path, info in scan_files(sys.argv[1:]).items():
+        if info:
+            print(f"{info.duration:8.2f}s  {info.frames:6d} frames  {info.bitrate:4d} kbps  "
+                  f"{info.method:4s}  {path}")
+        else:
+            print(f"{'?':>8}   not an MP3  {path}")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Lossless MP3 slimming.
+Rewrites a file with only its audio frames (plus the Xing/Info/VBRI frame,
+which players need for VBR duration and seeking), dropping ID3v2/ID3v1/APE
+tags, embedded artwork, padding and junk bytes between frames. Frames are
+copied byte-for-byte from an mmap, never decoded or re-encoded.
+
+Run directly to slim files in place: python3 mp3_slim.py file.mp3 ...
+"""
+
+import hashlib
+import mmap
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import mp3_scan
+
+
+@dataclass
+class SlimResult:
+    name: str
+    original_size: int
+    slimmed_size: int
+    sha256: str = ""
+    error: str = ""
+
+    @property
+    def saved(self):
+        return self.original_size - self.slimmed_size if not self.error else 0
+
+
+def frame_runs(buf):
+    """
+    (start, end) byte ranges of contiguous audio frames.
+    Adjacent frames are coalesced, so a clean file is a single range.
+    """
+    start = mp3_scan.id3v2_size(buf)
+    end = mp3_scan.audio_end(buf)
+    runs = []
+    for offset, header in mp3_scan.iter_frames(buf, start, end):
+        frame_end = offset + header.length
+        if runs and runs[-1][1] == offset:
+            runs[-1][1] = frame_end
+        else:
+            runs.append([offset, frame_end])
+    return [tuple(run) for run in runs]
+
+
+def slim_file(path):
+    """
+    Slim one file in place via a temp file and os.replace.
+    Files that are already minimal are left untouched.
+    """
+    path = Path(path)
+    original_size = path.stat().st_size
+    if original_size == 0:
+        return SlimResult(path.name, 0, 0, error="empty file")
+
+    with open(path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        runs = frame_runs(buf)
+        if not runs:
+            return SlimResult(path.name, original_size, original_size, error="no MP3 frames")
+
+        slimmed_size = sum(end - start for start, end in runs)
+        digest = hashlib.sha256()
+        view = memoryview(buf)
+        try:
+            if slimmed_size == original_size:
+                digest.update(view)
+                return SlimResult(path.name, original_size, original_size, digest.hexdigest())
+
+            tmp_path = path.with_name(f".{path.name}.slim")
+            with open(tmp_path, 'wb') as out:
+                for start, end in runs:
+                    chunk = view[start:end]
+                    digest.update(chunk)
+                    out.write(chunk)
+                    chunk.release()
+        finally:
+            view.release()
+
+    os.replace(tmp_path, path)
+    return SlimResult(path.name, original_size, slimmed_size, digest.hexdigest())
+
+
+def slim_files(paths):
+    """Slim each file; returns a list of SlimResult"""
+    results = []
+    for path in paths:
+        try:
+            results.append(slim_file(path))
+        except (OSError, ValueError) as e:
+            results.append(SlimResult(Path(path).name, 0, 0, error=str(e)))
+    return results
+
+
+if __name__ == "__main__":
+    total_saved = 0
+    for result in slim_files(sys.argv[1:]):
+        if result.error:
+            print(f"❌ {result.name}: {result.error}")
+            continue
+        total_saved += result.saved
+        print(f"✂️  {result.name}: {result.original_size} -> {result.slimmed_size} bytes "
+              f"({result.saved} saved)")
+    print(f"\n📊 Total saved: {total_saved / 1024:.1f} KB")
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Single-parse object graph for Xcode project.pbxproj files.
+The file is parsed once into PbxObjects indexed by object ID and grouped
+by isa. Edits go to the graph and the file is written back once. Every
+object keeps the exact source text it was parsed from until it is
+changed, so untouched objects come out byte-for-byte as they went in;
+changed and new objects are written the way Xcode writes them. New
+objects are merged into their isa section in ID order, as Xcode keeps it.
+
+New object IDs are derived from what the object is (target, group path,
+file path, role) rather than drawn at random, so regenerating a project
+gives the same IDs and small diffs. Each ID is checked against every ID
+already in the file, defined or merely referenced; on a collision the
+next ID in the key's fixed sequence is used.
+"""
+
+import hashlib
+import itertools
+import os
+import posixpath
+import re
+
+# Whitespace and comments, then a quoted string, a bare string or punctuation
+_TOKEN = re.compile(r'(?:\s+|/\*.*?\*/|//[^\n]*)*(?:"((?:[^"\\]|\\.)*)"|([^\s;,=(){}"]+)|(\S)|$)', re.S)
+_STRING = "string"
+_COMMENT = re.compile(r'[ \t]*/\*\s*(.*?)\s*\*/', re.S)
+_ESCAPE = re.compile(r'\\(U[0-9a-fA-F]{4}|.)', re.S)
+# Anything shaped like an object ID, defined or only referenced
+_ID_LIKE = re.compile(r'\b[0-9A-F]{24}\b')
+# Strings Xcode writes without quotes
+_BARE = re.compile(r'[A-Za-z0-9_$/:.]+')
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+# Objects Xcode writes on a single line
+INLINE_ISAS = {"PBXBuildFile", "PBXFileReference"}
+# Values that hold an object ID but are written without its comment
+UNCOMMENTED_KEYS = {"remoteGlobalIDString"}
+
+
+class PbxParseError(ValueError):
+    pass
+
+
+def _unescape(text):
+    def replace(match):
+        code = match.group(1)
+        if code[0] == 'U' and len(code) == 5:
+            return chr(int(code[1:], 16))
+        return _ESCAPES.get(code, code)
+    return _ESCAPE.sub(replace, text)
+
+
+def quote(value):
+    """A string as Xcode writes it: bare if it can be, quoted and escaped otherwise"""
+    if _BARE.fullmatch(value):
+        return value
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\t', '\\t')
+    return f'"{escaped}"'
+
+
+def derive_id(*key):
+    """24 hex digits derived from key, in the shape Xcode uses"""
+    return hashlib.sha256("\x1f".join(key).encode('utf-8')).hexdigest()[:24].upper()
+
+
+def _source_path(parent_path, obj):
+    """obj's path relative to SOURCE_ROOT, given its parent group's; None under a build-time root"""
+    tree = obj.get('sourceTree', "<group>")
+    if tree == "<group>":
+        base = parent_path
+    elif tree == "SOURCE_ROOT":
+        base = ""
+    elif tree == "<absolute>":
+        base = "/"
+    else:
+        return None
+    path = obj.get('path')
+    if base is None or not path:
+        return base
+    joined = posixpath.normpath(posixpath.join(base, path))
+    return "" if joined == "." else joined
+
+
+class _Parser:
+    """Recursive descent over tokens; each token is one _TOKEN match"""
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def error(self, message):
+        line = self.text.count('\n', 0, self.pos) + 1
+        raise PbxParseError(f"{message} on line {line}")
+
+    def next(self):
+        """(kind, string): kind is _STRING or the punctuation character, '' at the end"""
+        match = _TOKEN.match(self.text, self.pos)
+        self.pos = match.end()
+        quoted, bare, punct = match.groups()
+        if quoted is not None:
+            return _STRING, _unescape(quoted) if '\\' in quoted else quoted
+        if bare is not None:
+            return _STRING, bare
+        return punct or '', None
+
+    def expect(self, char):
+        if self.next()[0] != char:
+            self.error(f"expected {char!r}")
+
+    def value(self, token=None):
+        kind, string = token or self.next()
+        if kind is _STRING:
+            return string
+        if kind == '{':
+            return self.dict()
+        if kind == '(':
+            return self.array()
+        self.error("expected a value")
+
+    def dict(self):
+        """A dictionary whose '{' has been read"""
+        result = {}
+        while True:
+            kind, key = self.next()
+            if kind == '}':
+                return result
+            if kind is not _STRING:
+                self.error("expected a key")
+            self.expect('=')
+            result[key] = self.value()
+            self.expect(';')
+
+    def array(self):
+        """An array whose '(' has been read"""
+        result = []
+        while True:
+            token = self.next()
+            if token[0] == ')':
+                return result
+            result.append(self.value(token))
+            kind = self.next()[0]
+            if kind == ')':
+                return result
+            if kind != ',':
+                self.error("expected ',' or ')'")
+
+    def objects(self):
+        """
+        Entries of the objects dictionary as (id, comment, props, source
+        text), plus the offsets of the dictionary body
+        """
+        self.expect('{')
+        body_start = self.text.find('\n', self.pos) + 1
+        entries = []
+        while True:
+            kind, object_id = self.next()
+            line_start = self.text.rfind('\n', 0, self.pos) + 1
+            if kind == '}':
+                return entries, body_start, line_start
+            if kind is not _STRING:
+                self.error("expected an object ID")
+            match = _COMMENT.match(self.text, self.pos)
+            comment = match.group(1) if match else None
+            self.expect('=')
+            self.expect('{')
+            props = self.dict()
+            self.expect(';')
+            line_end = self.text.find('\n', self.pos) + 1 or len(self.text)
+            entries.append((object_id, comment, props, self.text[line_start:line_end]))
+
+
+class PbxObject:
+    """
+    One entry of the objects dictionary. text is its source while it is
+    unchanged; the mutators below clear it so it is re-serialized.
+    """
+
+    __slots__ = ("id", "comment", "props", "text")
+
+    def __init__(self, object_id, props, comment=None, text=None):
+        self.id = object_id
+        self.props = props
+        self.comment = comment
+        self.text = text
+
+    @property
+    def isa(self):
+        return self.props.get('isa')
+
+    def __repr__(self):
+        return f"<{self.isa} {self.id} {self.comment or ''}>"
+
+    def __getitem__(self, key):
+        return self.props[key]
+
+    def __contains__(self, key):
+        return key in self.props
+
+    def get(self, key, default=None):
+        return self.props.get(key, default)
+
+    def __setitem__(self, key, value):
+        self.props[key] = value
+        self.text = None
+
+    def __delitem__(self, key):
+        del self.props[key]
+        self.text = None
+
+    def append(self, key, *values):
+        self.props.setdefault(key, []).extend(values)
+        self.text = None
+
+    def insert_after(self, key, anchor, *values):
+        """Insert values after anchor in a list, or at its end if anchor isn't there"""
+        items = self.props.setdefault(key, [])
+        index = items.index(anchor) + 1 if anchor in items else len(items)
+        items[index:index] = values
+        self.text = None
+
+    def discard(self, key, values):
+        """Drop every member of the set values from a list; returns how many went"""
+        items = self.props.get(key)
+        if not isinstance(items, list):
+            return 0
+        kept = [item for item in items if item not in values]
+        removed = len(items) - len(kept)
+        if removed:
+            self.props[key] = kept
+            self.text = None
+        return removed
+
+
+class PbxProject:
+    def __init__(self, text, path=None):
+        self.path = path
+        self._original = text
+        parser = _Parser(text)
+        parser.expect('{')
+        self.root = {}
+        entries = None
+        while True:
+            kind, key = parser.next()
+            if kind == '}':
+                break
+            if kind is not _STRING:
+                parser.error("expected a key")
+            parser.expect('=')
+            if key == 'objects':
+                entries, body_start, body_end = parser.objects()
+            else:
+                self.root[key] = parser.value()
+            parser.expect(';')
+        if entries is None:
+            parser.error("no objects dictionary")
+
+        self._prefix = text[:body_start]
+        self._suffix = text[body_end:]
+        self.objects = {}
+        self._sections = {}
+        for object_id, comment, props, source in entries:
+            obj = PbxObject(object_id, props, comment, source)
+            self.objects[object_id] = obj
+            self._sections.setdefault(obj.isa, {})[object_id] = obj
+        self._isas = list(self._sections)
+        self._new = set()
+        self._removed = False
+        self._ids = None
+        self._group_paths = {}
+        self._source_paths = {}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(f.read(), path)
+
+    # -- lookup
+
+    def __getitem__(self, object_id):
+        return self.objects[object_id]
+
+    def __contains__(self, object_id):
+        return object_id in self.objects
+
+    def get(self, object_id):
+        return self.objects.get(object_id)
+
+    def isa(self, isa):
+        """Objects of one isa, in file order"""
+        return list(self._sections.get(isa, {}).values())
+
+    @property
+    def project(self):
+        return self.objects[self.root['rootObject']]
+
+    @property
+    def main_group(self):
+        return self.objects[self.project['mainGroup']]
+
+    def targets(self):
+        return [self.objects[target_id] for target_id in self.project.get('targets', [])]
+
+    def build_phase(self, isa, target=None):
+        """The target's (by default the first target's) build phase of this isa"""
+        target = target or self.targets()[0]
+        for phase_id in target.get('buildPhases', []):
+            phase = self.objects.get(phase_id)
+            if phase is not None and phase.isa == isa:
+                return phase
+        return None
+
+    def find_group(self, path, parent=None):
+        """The group at a '/'-separated path of group paths or names, or None"""
+        group = parent or self.main_group
+        for part in filter(None, path.split('/')):
+            group = next((child for child in map(self.objects.get, group.get('children', []))
+                          if child is not None and child.isa in ("PBXGroup", "PBXVariantGroup")
+                          and part in (child.get('path'), child.get('name'))), None)
+            if group is None:
+                return None
+        return group
+
+    @property
+    def source_root(self):
+        """The directory SOURCE_ROOT is: the one holding the .xcodeproj"""
+        return os.path.dirname(os.path.dirname(os.path.abspath(self.path))) if self.path else ""
+
+    def source_paths(self):
+        """
+        Where each group and file reference in the group tree points, as a
+        path relative to SOURCE_ROOT ('' for the main group, absolute for
+        <absolute> ones), following sourceTree and path up through the
+        parent groups. Anything under a build-time root (BUILT_PRODUCTS_DIR,
+        SDKROOT, ...) maps to None.
+        """
+        paths = {self.main_group.id: _source_path("", self.main_group)}
+        stack = [self.main_group]
+        while stack:
+            parent = stack.pop()
+            for child in map(self.objects.get, parent.get('children', [])):
+                if child is not None and child.id not in paths:
+                    paths[child.id] = _source_path(paths[parent.id], child)
+                    if 'children' in child:
+                        stack.append(child)
+        self._source_paths = paths
+        return paths
+
+    def source_path(self, obj):
+        """obj's entry in source_paths(); None if it isn't in the group tree"""
+        if obj.id not in self._source_paths:
+            # Rebuilt only when an object it hasn't seen is asked for
+            self.source_paths()
+        return self._source_paths.get(obj.id)
+
+    def disk_path(self, obj):
+        """Absolute path of obj on disk, or None if it can't be resolved"""
+        path = self.source_path(obj)
+        if path is None or not self.path:
+            return None
+        return os.path.normpath(os.path.join(self.source_root, path))
+
+    def group_at(self, path, create=False):
+        """
+        The group whose source path is path, or None. With create, the
+        missing directories are added as groups below the deepest group
+        that contains path; an absolute path outside every group gets one
+        <absolute> group in the main group.
+        """
+        path = posixpath.normpath(path) if path else ""
+        path = "" if path == "." else path
+        groups = {}
+        for object_id, source_path in self.source_paths().items():
+            if source_path is not None and self.objects[object_id].isa == "PBXGroup":
+                groups.setdefault(source_path, self.objects[object_id])
+        if path in groups or not create:
+            return groups.get(path)
+
+        parts = path.split('/')
+        # An absolute path's first part is the empty string before its '/'
+        lowest = 2 if posixpath.isabs(path) else 0
+        for depth in range(len(parts) - 1, lowest - 1, -1):
+            parent = groups.get('/'.join(parts[:depth]))
+            if parent is not None:
+                break
+        else:
+            parent, depth, parts = self.main_group, 0, [path]
+        for index in range(depth, len(parts)):
+            part = parts[index]
+            props = {"children": [], "path": part,
+                     "sourceTree": "<absolute>" if posixpath.isabs(part) else "<group>"}
+            group = self.add("PBXGroup", props, posixpath.basename(part) or part,
+                             self.allocate_id(self.group_path(parent), part, "PBXGroup"))
+            parent.append('children', group.id)
+            self._source_paths[group.id] = '/'.join(parts[:index + 1])
+            parent = group
+        return parent
+
+    def file_refs_by_path(self):
+        return {obj['path']: obj for obj in self.isa("PBXFileReference") if 'path' in obj}
+
+    def build_files_by_ref(self):
+        index = {}
+        for build_file in self.isa("PBXBuildFile"):
+            index.setdefault(build_file.get('fileRef'), []).append(build_file)
+        return index
+
+    # -- edits
+
+    def group_path(self, group):
+        """'/'-joined paths (or names) of the groups from the main group down to group"""
+        if group.id not in self._group_paths:
+            # Rebuilt only when a group it hasn't seen is asked for
+            paths = {self.main_group.id: ""}
+            stack = [self.main_group]
+            while stack:
+                parent = stack.pop()
+                for child in map(self.objects.get, parent.get('children', [])):
+                    if child is not None and child.isa in ("PBXGroup", "PBXVariantGroup") \
+                            and child.id not in paths:
+                        part = child.get('path') or child.get('name') or ""
+                        paths[child.id] = f"{paths[parent.id]}/{part}".lstrip("/")
+                        stack.append(child)
+            self._group_paths = paths
+        return self._group_paths.get(group.id, "")
+
+    def phase_target(self, phase):
+        """Name of the target a build phase belongs to, or ''"""
+        for target in self.targets():
+            if phase.id in target.get('buildPhases', []):
+                return target.get('name', "")
+        return ""
+
+    def allocate_id(self, *key):
+        """
+        A deterministic ID for key that nothing in the project uses yet.
+        On a collision the key is extended with a counter, so the same
+        project and key always give the same ID.
+        """
+        if self._ids is None:
+            self._ids = set(self.objects) | set(_ID_LIKE.findall(self._original))
+        for attempt in itertools.count():
+            object_id = derive_id(*key, str(attempt)) if attempt else derive_id(*key)
+            if object_id not in self._ids:
+                self._ids.add(object_id)
+                return object_id
+
+    def file_ids(self, group, path, phase=None):
+        """(file reference ID, build file ID or None) for path in group and phase"""
+        target = self.phase_target(phase) if phase is not None else ""
+        group_path = self.group_path(group)
+        file_id = self.allocate_id(target, group_path, path, "PBXFileReference")
+        build_id = None
+        if phase is not None:
+            build_id = self.allocate_id(target, group_path, path, phase.isa)
+        return file_id, build_id
+
+    def add(self, isa, props, comment=None, object_id=None):
+        """
+        Add an object; props are written after isa in the order given.
+        Without an object_id, one is derived from isa and comment.
+        """
+        object_id = object_id or self.allocate_id(isa, comment or "")
+        if object_id in self.objects:
+            raise ValueError(f"object ID {object_id} is already in use")
+        if self._ids is not None:
+            self._ids.add(object_id)
+        obj = PbxObject(object_id, {"isa": isa, **props}, comment)
+        self.objects[object_id] = obj
+        self._sections.setdefault(isa, {})[object_id] = obj
+        self._new.add(object_id)
+        return obj
+
+    def remove(self, *object_ids):
+        """Remove objects; references to them are the caller's to drop"""
+        for object_id in object_ids:
+            obj = self.objects.pop(object_id, None)
+            if obj is not None:
+                del self._sections[obj.isa][object_id]
+                self._new.discard(object_id)
+                self._removed = True
+
+    def add_file(self, group, path, file_type, phase=None, file_id=None, build_id=None):
+        """
+        Add a file reference to group and, with a build phase, a build file
+        for it to the phase. Returns (file reference, build file or None).
+        """
+        name = os.path.basename(path)
+        if file_id is None:
+            file_id, derived_build_id = self.file_ids(group, path, phase)
+            build_id = build_id or derived_build_id
+        file_ref = self.add("PBXFileReference", {"lastKnownFileType": file_type, "path": path,
+                                                 "sourceTree": "<group>"}, name, file_id)
+        group.append('children', file_ref.id)
+        build_file = None
+        if phase is not None:
+            build_file = self.add("PBXBuildFile", {"fileRef": file_ref.id},
+                                  f"{name} in {phase.comment}", build_id)
+            phase.append('files', build_file.id)
+        return file_ref, build_file
+
+    def remove_files(self, file_ids):
+        """
+        Remove file references with their build files and every group and
+        build phase entry for them, in one pass over the graph. Returns the
+        IDs removed.
+        """
+        file_ids = set(file_ids)
+        gone = file_ids | {build_file.id for build_file in self.isa("PBXBuildFile")
+                           if build_file.get('fileRef') in file_ids}
+        for obj in self.objects.values():
+            obj.discard('children', gone)
+            obj.discard('files', gone)
+        self.remove(*gone)
+        return gone
+
+    # -- output
+
+    def _format(self, value, key, depth, inline):
+        if isinstance(value, dict):
+            items = [f"{quote(k)} = {self._format(v, k, depth + 1, inline)};" for k, v in value.items()]
+            if inline:
+                return "{" + "".join(item + " " for item in items) + "}"
+            pad = "\t" * depth
+            return "{\n" + "".join(f"{pad}\t{item}\n" for item in items) + pad + "}"
+        if isinstance(value, list):
+            items = [self._format(item, key, depth + 1, inline) for item in value]
+            if inline:
+                return "(" + "".join(item + ", " for item in items) + ")"
+            pad = "\t" * depth
+            return "(\n" + "".join(f"{pad}\t{item},\n" for item in items) + pad + ")"
+        text = quote(value)
+        target = self.objects.get(value)
+        if target is not None and target.comment and key not in UNCOMMENTED_KEYS:
+            text += f" /* {target.comment} */"
+        return text
+
+    def format_object(self, obj):
+        comment = f" /* {obj.comment} */" if obj.comment else ""
+        body = self._format(obj.props, None, 2, obj.isa in INLINE_ISAS)
+        return f"\t\t{quote(obj.id)}{comment} = {body};\n"
+
+    @property
+    def changed(self):
+        return bool(self._new) or self._removed or any(obj.text is None for obj in self.objects.values())
+
+    def _section_entries(self, section):
+        """Existing objects in file order with new ones merged in by ID"""
+        new = sorted((obj for obj in section.values() if obj.id in self._new), key=lambda obj: obj.id)
+        index = 0
+        for obj in section.values():
+            if obj.id in self._new:
+                continue
+            while index < len(new) and new[index].id < obj.id:
+                yield new[index]
+                index += 1
+            yield obj
+        yield from new[index:]
+
+    def _section_order(self):
+        # Sections stay where they were; a new one goes where Xcode's
+        # alphabetical order puts it among the existing ones
+        order = list(self._isas)
+        for isa in sorted(set(self._sections) - set(order)):
+            order.insert(next((i for i, other in enumerate(order) if other > isa), len(order)), isa)
+        return order
+
+    def to_text(self):
+        if not self.changed:
+            return self._original
+        parts = [self._prefix]
+        for isa in self._section_order():
+            section = self._sections.get(isa)
+            if not section:
+                continue
+            parts.append(f"\n/* Begin {isa} section */\n")
+            for obj in self._section_entries(section):
+                parts.append(obj.text if obj.text is not None else self.format_object(obj))
+            parts.append(f"/* End {isa} section */\n")
+        parts.append(self._suffix)
+        return "".join(parts)
+
+    def save(self, path=None):
+        """Write the project atomically if anything changed; returns whether it was written"""
+        path = path or self.path
+        text = self.to_text()
+        if text == self._original and path == self.path:
+            return False
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        if path == self.path:
+            self._reset(text)
+        return True
+
+    def _reset(self, text):
+        """After a save, what was written is the new original"""
+        self._original = text
+        self._isas = [isa for isa in self._section_order() if self._sections.get(isa)]
+        self._sections = {isa: {obj.id: obj for obj in self._section_entries(self._sections[isa])}
+                          for isa in self._isas}
+        for obj in self.objects.values():
+            if obj.text is None:
+                obj.text = self.format_object(obj)
+        self._new.clear()
+        self._removed = False
+        self._ids = None
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Precomputed inverted search index for the story catalog.
+Tokens are normalized and lightly stemmed, then mapped to the stories
+that contain them with a field-weighted score, so on-device search is a
+few dictionary lookups instead of a scan over every story.
+
+Run directly to benchmark build time and query latency on a synthetic
+catalog: python3 search_index.py --stories 50000
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import statistics
+import time
+import unicodedata
+from functools import lru_cache
+
+INDEX_VERSION = 1
+
+# Relative weight of a token hit in each field
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.0,
+    "keyLessons": 1.5,
+    "description": 1.0,
+}
+
+# Weights are stored as integers scaled by this factor to keep the file compact
+WEIGHT_SCALE = 10
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i in is it its "
+    "of on or our she that the their them they this to us was we were what "
+    "when who will with you your".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Longest suffix first; each rule leaves a stem of at least 3 characters
+SUFFIXES = (
+    ("ational", "ate"), ("fulness", "ful"), ("iveness", "ive"),
+    ("ousness", "ous"), ("ization", "ize"), ("ments", ""), ("ness", ""),
+    ("ment", ""), ("ings", ""), ("ing", ""), ("ies", "y"), ("ied", "y"),
+    ("ers", ""), ("est", ""), ("ful", ""), ("ly", ""), ("ed", ""), ("er", ""),
+    ("es", ""), ("s", ""),
+)
+
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Light suffix-stripping stemmer; good enough for short catalog text"""
+    if len(token) <= 3 or token.isdigit():
+        return token
+    for suffix, replacement in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) + len(replacement) >= 3:
+            if suffix == "s" and token.endswith("ss"):
+                continue
+            token = token[:-len(suffix)] + replacement
+            break
+    # Collapse a doubled final consonant left behind by -ing/-ed (running -> run)
+    if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "aeiouls":
+        token = token[:-1]
+    # Normalize the endings so share/sharing and happy/happiness meet
+    if len(token) > 3 and token.endswith("e"):
+        token = token[:-1]
+    if len(token) > 3 and token.endswith("y"):
+        token = token[:-1] + "i"
+    return token
+
+
+def tokenize(text):
+    """Lowercase, strip accents, split, drop stopwords and stem"""
+    text = text.lower()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = text.encode("ascii", "ignore").decode("ascii")
+    text = text.replace("'", "")
+    return [stem(t) for t in TOKEN_RE.findall(text) if t not in STOPWORDS]
+
+
+def _field_text(story, field):
+    value = story[field]
+    return " ".join(value) if isinstance(value, list) else value
+
+
+def build_index(stories):
+    """
+    Build the index from an iterable of stories.
+    Returns a JSON-serializable dict:
+      docs:     story ids, position = doc number
+      postings: token -> flat [doc, weight, doc, weight, ...] sorted by doc
+    """
+    docs = []
+    postings = {}
+    for doc, story in enumerate(stories):
+        docs.append(story['id'])
+        scores = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(_field_text(story, field)):
+                scores[token] = scores.get(token, 0.0) + weight
+        for token, score in scores.items():
+            postings.setdefault(token, []).extend((doc, round(score * WEIGHT_SCALE)))
+
+    return {
+        "version": INDEX_VERSION,
+        "weightScale": WEIGHT_SCALE,
+        "fieldWeights": FIELD_WEIGHTS,
+        "docs": docs,
+        "postings": dict(sorted(postings.items())),
+    }
+
+
+def write_index(index, path):
+    """Write the index without whitespace; it is read by machines only"""
+    with open(path, 'w') as f:
+        json.dump(index, f, separators=(",", ":"))
+
+
+def load_index(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def query(index, text, limit=20):
+    """
+    Rank stories for a free-text query.
+    Each matching token contributes its field weight times a smoothed IDF,
+    so rare words and title/tag hits dominate. Returns (story id, score)
+    pairs, best first.
+    """
+    total_docs = len(index['docs']) or 1
+    scale = index.get('weightScale', WEIGHT_SCALE)
+    scores = {}
+    for token in set(tokenize(text)):
+        posting = index['postings'].get(token)
+        if not posting:
+            continue
+        doc_freq = len(posting) // 2
+        idf = math.log(1 + (total_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        for i in range(0, len(posting), 2):
+            doc = posting[i]
+            scores[doc] = scores.get(doc, 0.0) + posting[i + 1] / scale * idf
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [(index['docs'][doc], round(score, 3)) for doc, score in ranked]
+
+
+def main():
+    from synthetic_catalog import generate_stories, WORDS
+
+    parser = argparse.ArgumentParser(description="Benchmark the search index")
+    parser.add_argument("--stories", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    stories = list(generate_stories(args.stories))
+    start = time.perf_counter()
+    index = build_index(stories)
+    build_ms = (time.perf_counter() - start) * 1000
+    size = len(json.dumps(index, separators=(",", ":")))
+
+    rng = random.Random(1)
+    queries = [" ".join(rng.choice(WORDS) for _ in range(1 + i % 3))
+               for i in range(args.queries)]
+    latencies = []
+    for text in queries:
+        start = time.perf_counter()
+        query(index, text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    print(f"📚 {args.stories} stories, {len(index['postings'])} tokens, {size / 1024:.0f} KB")
+    print(f"🔨 Build: {build_ms:.0f} ms")
+    print(f"🔍 Query p50 {statistics.median(latencies):.2f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Time-to-byte seek tables for bundled MP3s.
+Each table holds one byte offset per SEEK_INTERVAL seconds, pointing at
+the frame that starts at or just before that time, so the player can
+resume or scrub straight to a frame boundary without scanning the file.
+Offsets are delta-encoded to keep the data file small.
+"""
+
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import mp3_scan
+from audio_sync import file_sha256, load_manifest, MANIFEST_NAME
+
+SEEK_TABLES_VERSION = 1
+SEEK_INTERVAL = 1.0
+
+
+def build_seek_table(path, interval=SEEK_INTERVAL):
+    """Walk every frame once; returns absolute byte offsets, one per interval"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            start = mp3_scan.id3v2_size(buf)
+            end = mp3_scan.audio_end(buf)
+            first = mp3_scan.find_first_frame(buf, start, end)
+            if first < 0:
+                return []
+
+            # A Xing/Info/VBRI frame carries no audio; playback starts after it
+            header = mp3_scan.parse_header(buf, first)
+            if mp3_scan.read_vbr_header(buf, first, header)[0]:
+                first += header.length
+
+            offsets = []
+            samples = 0
+            for offset, frame in mp3_scan.iter_frames(buf, first, end):
+                while len(offsets) * interval * frame.sample_rate <= samples:
+                    offsets.append(offset)
+                samples += frame.samples
+            return offsets
+
+
+def encode_offsets(offsets):
+    return [b - a for a, b in zip([0] + offsets, offsets)]
+
+
+def decode_offsets(deltas):
+    offsets = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        offsets.append(total)
+    return offsets
+
+
+def load_seek_tables(path):
+    """Previously written tables, or an empty set"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != SEEK_TABLES_VERSION or data.get('interval') != SEEK_INTERVAL:
+        return {}
+    return data.get('tables', {})
+
+
+def _build_entry(args):
+    name, path, sha256 = args
+    return name, {"sha256": sha256, "offsets": encode_offsets(build_seek_table(path))}
+
+
+def update_seek_tables(audio_dir, names, tables_path, workers=None):
+    """
+    Write seek tables for names in audio_dir to tables_path.
+    Content hashes come from the audio sync manifest when available, and
+    tables whose hash is unchanged since the last run are reused as-is.
+    Returns (built, reused).
+    """
+    audio_dir = Path(audio_dir)
+    manifest = load_manifest(audio_dir / MANIFEST_NAME)
+    previous = load_seek_tables(tables_path)
+
+    tables = {}
+    pending = []
+    for name in names:
+        path = audio_dir / name
+        if not path.exists():
+            continue
+        entry = manifest.get(name, {})
+        sha256 = entry.get('dest_sha256') or entry.get('sha256') or file_sha256(path)
+        cached = previous.get(name)
+        if cached and cached.get('sha256') == sha256:
+            tables[name] = cached
+        else:
+            pending.append((name, str(path), sha256))
+
+    reused = len(tables)
+    if len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tables.update(pool.map(_build_entry, pending))
+    else:
+        tables.update(map(_build_entry, pending))
+
+    tmp_path = Path(str(tables_path) + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            "version": SEEK_TABLES_VERSION,
+            "interval": SEEK_INTERVAL,
+            "tables": dict(sorted(tables.items())),
+        }, f, separators=(",", ":"))
+    os.replace(tmp_path, tables_path)
+    return len(pending), reused
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+SQLite export of the story catalog for the iOS bundle.
+Stories and categories go into plain tables with prebuilt indexes on
+category and gradeLevel, plus a full-text index over title, description,
+keyLessons and tags, so the app can query on demand instead of decoding
+and grouping the whole catalog at launch.
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE categories (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    color TEXT NOT NULL,
+    icon TEXT NOT NULL,
+    gradeLevels TEXT NOT NULL
+);
+
+CREATE TABLE stories (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    gradeLevel TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    audioFile TEXT NOT NULL,
+    keyLessons TEXT NOT NULL,
+    tags TEXT NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX idx_stories_category ON stories(category);
+CREATE INDEX idx_stories_grade ON stories(gradeLevel);
+CREATE INDEX idx_stories_category_grade ON stories(category, gradeLevel);
+"""
+
+STORY_COLUMNS = ("id", "title", "description", "category", "gradeLevel",
+                 "duration", "audioFile", "keyLessons", "tags")
+
+
+def _fts_module(conn):
+    """Prefer FTS5, fall back to FTS4 on SQLite builds without it"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._probe")
+        return "fts5"
+    except sqlite3.OperationalError:
+        return "fts4"
+
+
+def _story_row(story):
+    return (
+        story['id'], story['title'], story['description'], story['category'],
+        story['gradeLevel'], story['duration'], story['audioFile'],
+        json.dumps(story['keyLessons']), json.dumps(story['tags']),
+    )
+
+
+def write_catalog_db(stories, categories, db_path):
+    """
+    Build the catalog database at db_path from an iterable of stories and
+    the categories dict. The database is built in a temp file and moved
+    into place, so readers never see a half-written file.
+    Returns the number of stories written.
+    """
+    db_path = Path(db_path)
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+
+        conn.executemany(
+            "INSERT INTO categories VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((c['id'], position, c['name'], c['description'], c['color'], c['icon'],
+              json.dumps(c['gradeLevels']))
+             for position, c in enumerate(categories['categories'])))
+
+        placeholders = ", ".join("?" * len(STORY_COLUMNS))
+        cursor = conn.executemany(
+            f"INSERT INTO stories ({', '.join(STORY_COLUMNS)}) VALUES ({placeholders})",
+            (_story_row(story) for story in stories))
+        count = cursor.rowcount
+
+        # Index after the bulk load; building once is cheaper than maintaining
+        conn.executescript(INDEXES)
+        fts = _fts_module(conn)
+        conn.execute(
+            f"CREATE VIRTUAL TABLE stories_fts USING {fts}"
+            "(title, description, keyLessons, tags, content='stories')")
+        conn.execute(
+            "INSERT INTO stories_fts(rowid, title, description, keyLessons, tags) "
+            "SELECT rowid, title, description, keyLessons, tags FROM stories")
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    return count
+
+
+def _row_to_story(row):
+    story = dict(zip(STORY_COLUMNS, row))
+    story['keyLessons'] = json.loads(story['keyLessons'])
+    story['tags'] = json.loads(story['tags'])
+    return story
+
+
+def query_stories(conn, category=None, grade_level=None):
+    """Stories filtered by category and/or grade, in catalog order"""
+    clauses = []
+    params = []
+    if category is not None:
+        clauses.append("category = ?")
+        params.append(category)
+    if grade_level is not None:
+        clauses.append("gradeLevel = ?")
+        params.append(grade_level)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(
+        f"SELECT {', '.join(STORY_COLUMNS)} FROM stories{where} ORDER BY rowid", params)
+    return [_row_to_story(row) for row in rows]
+
+
+def fts_query(text):
+    """
+    User text as a MATCH expression: every word must match, as a literal
+    string, so quotes, apostrophes and operator words can't break the query
+    """
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def search_stories(conn, text, limit=20):
+    """Full-text search over title, description, keyLessons and tags"""
+    query = fts_query(text)
+    if not query:
+        return []
+    columns = ", ".join(f"s.{c}" for c in STORY_COLUMNS)
+    rows = conn.execute(
+        f"SELECT {columns} FROM stories_fts f JOIN stories s ON s.rowid = f.rowid "
+        "WHERE stories_fts MATCH ? LIMIT ?", (query, limit))
+    return [_row_to_story(row) for row in rows]
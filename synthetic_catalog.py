@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Synthetic story catalogs with the same shape as catalog/stories.jsonl,
+for benchmarking the extraction pipeline at sizes well beyond the real
+catalog.
+"""
+
+import itertools
+import json
+import random
+import uuid
+
+CATEGORY_IDS = ["firefly-forest", "rainbow-rapids", "thunder-mountain",
+                "starlight-meadow", "compass-cliff"]
+GRADE_LEVELS = ["grade_prek", "grade_2"]
+DURATIONS = {"grade_prek": 420, "grade_2": 600}
+
+BASE_WORDS = ("brave friend kind share help feel worry courage team river forest "
+              "mountain star meadow compass map journey climb listen voice gentle "
+              "patience focus leader garden wish bridge race school firefly rainbow "
+              "thunder moon dream calm honest learn grow play together careful").split()
+SYLLABLES = ("ba be bi bo bu da de di do ka ke ki ko la le li lo lu ma me mi mo "
+             "na ne ni no ra re ri ro sa se si so ta te ti to va ve vi zo").split()
+
+
+def _vocabulary(size, seed=1234):
+    """Real words first, then pronounceable filler words, in rank order"""
+    rng = random.Random(seed)
+    words = list(BASE_WORDS)
+    seen = set(words)
+    while len(words) < size:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+# Zipf-like word frequencies so token statistics resemble real text
+WORDS = _vocabulary(5000)
+WORD_WEIGHTS = list(itertools.accumulate(1.0 / rank for rank in range(1, len(WORDS) + 1)))
+
+TAGS = ("emotions friendship kindness courage teamwork sharing responsibility "
+        "gratitude focus leadership safety helping community patience").split()
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choices(WORDS, cum_weights=WORD_WEIGHTS, k=words)).capitalize()
+
+
+def generate_stories(count, seed=0):
+    """Yield count deterministic synthetic stories"""
+    rng = random.Random(seed)
+    for index in range(count):
+        grade = GRADE_LEVELS[index % len(GRADE_LEVELS)]
+        title = _sentence(rng, rng.randint(2, 5))
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "title": title,
+            "description": _sentence(rng, rng.randint(10, 18)) + ".",
+            "category": CATEGORY_IDS[rng.randrange(len(CATEGORY_IDS))],
+            "gradeLevel": grade,
+            "duration": DURATIONS[grade],
+            "audioFile": f"synthetic-{index:06d}.mp3",
+            "keyLessons": [_sentence(rng, rng.randint(4, 8)) for _ in range(5)],
+            "tags": rng.sample(TAGS, 4),
+        }
+
+
+def generate_categories():
+    """Category list matching the synthetic stories"""
+    return {"categories": [
+        {
+            "id": category_id,
+            "name": category_id.replace("-", " ").title(),
+            "description": f"Synthetic {category_id} stories",
+            "color": "#607D8B",
+            "icon": "⭐",
+            "gradeLevels": list(GRADE_LEVELS),
+        }
+        for category_id in CATEGORY_IDS
+    ]}
+
+
+def write_stories_jsonl(path, count, seed=0):
+    """Write a synthetic catalog source file; returns the story count"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for story in generate_stories(count, seed):
+            f.write(json.dumps(story, ensure_ascii=False) + "\n")
+    return count
+
+
+# MPEG1 Layer III, 128 kbps, 44.1 kHz, stereo: 417-byte frames of 1152 samples
+_FRAME_HEADER = b"\xff\xfb\x90\x64"
+_FRAME_LENGTH = 417
+
+
+def mp3_stub(seconds):
+    """A valid (silent) MP3 of roughly the given length, with an ID3 tag"""
+    frames = max(2, round(seconds * 44100 / 1152))
+    frame = _FRAME_HEADER + bytes(_FRAME_LENGTH - len(_FRAME_HEADER))
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + bytes(10)
+    return id3 + frame * frames
+
+
+def write_audio_stubs(stories, audio_dir, seconds=1.0):
+    """Write one stub per story, named <id>.mp3 like the real source audio"""
+    stub = mp3_stub(seconds)
+    count = 0
+    for story in stories:
+        with open(audio_dir / f"{story['id']}.mp3", 'wb') as f:
+            f.write(stub)
+        count += 1
+    return count, count * len(stub)
@@ -0,0 +1,30 @@
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parent.parent
+# The tools are top-level scripts rather than a package
+sys.path.insert(0, str(REPO))
+
+from mock_api_server import MockApiServer  # noqa: E402
+
+
+@pytest.fixture
+def mock_server():
+    with MockApiServer(stories=30, audio_seconds=0.5) as server:
+        yield server
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    """
+    A copy of the app sources and Xcode project to edit; returns
+    project.pbxproj. The sources are hardlinks, so add, delete or replace
+    files but never write to one in place.
+    """
+    shutil.copytree(REPO / "StorySage", tmp_path / "StorySage", copy_function=os.link)
+    shutil.copytree(REPO / "StorySage.xcodeproj", tmp_path / "StorySage.xcodeproj")
+    return tmp_path / "StorySage.xcodeproj" / "project.pbxproj"
@@ -0,0 +1,41 @@
+import pytest
+import requests
+
+from api_client import EnvCachingSession
+
+URLS = ["http://localhost:5010/api/stories", "https://cdn.example.com/a.mp3",
+        "http://internal.example/audio", "https://cdn.example.com/b.mp3"]
+
+
+@pytest.fixture
+def proxy_env(monkeypatch):
+    monkeypatch.setenv("HTTP_PROXY", "http://proxy:3128")
+    monkeypatch.setenv("HTTPS_PROXY", "http://secure-proxy:3128")
+    monkeypatch.setenv("NO_PROXY", "localhost,internal.example")
+    monkeypatch.setenv("REQUESTS_CA_BUNDLE", "/etc/ssl/custom.pem")
+
+
+@pytest.mark.parametrize("url", URLS)
+@pytest.mark.parametrize("proxies, verify", [({}, None), ({"no_proxy": "cdn.example.com"}, False)])
+def test_settings_match_requests(proxy_env, url, proxies, verify):
+    expected = requests.Session().merge_environment_settings(url, dict(proxies), None, verify, None)
+    session = EnvCachingSession()
+    for _ in range(2):
+        assert session.merge_environment_settings(url, dict(proxies), None, verify, None) == expected
+
+
+def test_proxy_environment_changes_are_seen(proxy_env, monkeypatch):
+    session = EnvCachingSession()
+    assert session.merge_environment_settings(URLS[1], {}, None, None, None)['proxies']['https'] == \
+        "http://secure-proxy:3128"
+    monkeypatch.setenv("HTTPS_PROXY", "http://other:8080")
+    assert session.merge_environment_settings(URLS[1], {}, None, None, None)['proxies']['https'] == \
+        "http://other:8080"
+
+
+def test_trust_env_off_ignores_environment(proxy_env):
+    session = EnvCachingSession()
+    session.trust_env = False
+    settings = session.merge_environment_settings(URLS[1], {}, None, None, None)
+    assert not settings['proxies']
+    assert settings['verify'] is True
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from api_client import ApiClient
+from audio_download import DOWNLOAD_MANIFEST_NAME, _part_paths, download_audio
+from audio_sync import load_manifest
+
+
+@pytest.fixture
+def client(mock_server):
+    with ApiClient(mock_server.url, retries=1, backoff=0) as client:
+        yield client
+
+
+@pytest.fixture
+def source(mock_server):
+    story = mock_server.stories[0]
+    return f"{story['id']}.mp3", story["audio_url"], story["audio_sha256"]
+
+
+def download(client, source, dest_dir):
+    report = download_audio(client, [source], dest_dir)
+    assert len(report.results) == 1
+    return report.results[0]
+
+
+def start_partial(dest_dir, name, url, content, etag):
+    part, info_path = _part_paths(dest_dir / name)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    part.write_bytes(content)
+    info_path.write_text(json.dumps({"url": url, "etag": etag, "last_modified": None}))
+    return part, info_path
+
+
+def test_download_then_skip(client, source, mock_server, tmp_path):
+    name, _, sha256 = source
+    result = download(client, source, tmp_path)
+    assert (result.status, result.method, result.sha256) == ("copied", "download", sha256)
+    assert (tmp_path / name).read_bytes() == mock_server.audio
+    assert load_manifest(tmp_path / DOWNLOAD_MANIFEST_NAME)[name]["etag"] == mock_server.audio_etag
+
+    requests_before = mock_server.stats["requests"]
+    assert download(client, source, tmp_path).status == "skipped"
+    assert mock_server.stats["requests"] == requests_before
+
+
+def test_resumes_from_part_file_when_validator_matches(client, source, mock_server, tmp_path):
+    name, url, _ = source
+    part, info_path = start_partial(tmp_path, name, url, mock_server.audio[:1000], mock_server.audio_etag)
+    bytes_before = mock_server.stats["bytes_sent"]
+
+    result = download(client, source, tmp_path)
+    assert (result.status, result.method) == ("copied", "resumed")
+    assert (tmp_path / name).read_bytes() == mock_server.audio
+    assert mock_server.stats["bytes_sent"] - bytes_before < len(mock_server.audio)
+    assert not part.exists() and not info_path.exists()
+
+
+def test_if_range_mismatch_restarts_instead_of_appending(client, source, mock_server, tmp_path):
+    name, url, sha256 = source
+    # Left over from an older version of the file
+    part, _ = start_partial(tmp_path, name, url, b"stale bytes" * 100, '"old-version"')
+
+    result = download(client, source, tmp_path)
+    assert (result.status, result.method, result.sha256) == ("copied", "download", sha256)
+    assert (tmp_path / name).read_bytes() == mock_server.audio
+    assert not part.exists()
+
+
+def test_part_file_for_another_url_is_not_resumed(client, source, mock_server, tmp_path):
+    name, _, _ = source
+    start_partial(tmp_path, name, "/audio/someone-else.mp3", mock_server.audio[:1000], mock_server.audio_etag)
+
+    result = download(client, source, tmp_path)
+    assert (result.status, result.method) == ("copied", "download")
+    assert (tmp_path / name).read_bytes() == mock_server.audio
+
+
+def test_unknown_audio_is_reported_missing(client, tmp_path):
+    result = download(client, ("gone.mp3", "/audio/not-a-story.mp3", None), tmp_path)
+    assert result.status == "missing"
+    assert not (tmp_path / "gone.mp3").exists()
@@ -0,0 +1,120 @@
+import os
+
+import pytest
+
+from audio_sync import MANIFEST_NAME, load_manifest, remove_audio_files, sync_audio_files
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    return src, dst
+
+
+def make(directory, name, content):
+    path = directory / name
+    path.write_bytes(content)
+    return path
+
+
+def names(results):
+    return sorted(result.name for result in results)
+
+
+def test_first_sync_copies_and_second_skips(dirs):
+    src, dst = dirs
+    file_map = {name: make(src, name, name.encode() * 100) for name in ("a.mp3", "b.mp3")}
+
+    report = sync_audio_files(file_map, dst)
+    assert names(report.copied) == ["a.mp3", "b.mp3"]
+    assert (dst / "a.mp3").read_bytes() == b"a.mp3" * 100
+    assert set(load_manifest(dst / MANIFEST_NAME)) == {"a.mp3", "b.mp3"}
+
+    report = sync_audio_files(file_map, dst)
+    assert names(report.skipped) == ["a.mp3", "b.mp3"]
+    assert report.copied == []
+    # Stat-only skips read nothing
+    assert report.bytes_processed == 0
+
+
+def test_changed_source_is_replaced_and_touched_one_is_rehashed(dirs):
+    src, dst = dirs
+    a, b = make(src, "a.mp3", b"old"), make(src, "b.mp3", b"same")
+    sync_audio_files({"a.mp3": a, "b.mp3": b}, dst)
+
+    a.write_bytes(b"new content")
+    stat = b.stat()
+    os.utime(b, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    report = sync_audio_files({"a.mp3": a, "b.mp3": b}, dst)
+
+    assert names(report.copied) == ["a.mp3"]
+    assert names(report.skipped) == ["b.mp3"]
+    assert (dst / "a.mp3").read_bytes() == b"new content"
+    # The new mtime is recorded, so the next run is stat-only again
+    assert load_manifest(dst / MANIFEST_NAME)["b.mp3"]["mtime_ns"] == b.stat().st_mtime_ns
+
+
+def test_prune_removes_files_no_longer_mapped(dirs):
+    src, dst = dirs
+    a, b = make(src, "a.mp3", b"a"), make(src, "b.mp3", b"b")
+    sync_audio_files({"a.mp3": a, "b.mp3": b}, dst)
+    make(dst, ".hidden", b"tool state")
+
+    report = sync_audio_files({"a.mp3": a}, dst)
+    assert report.removed == ["b.mp3"]
+    assert not (dst / "b.mp3").exists()
+    assert (dst / ".hidden").exists()
+    assert set(load_manifest(dst / MANIFEST_NAME)) == {"a.mp3"}
+
+
+def test_without_prune_other_files_and_their_entries_stay(dirs):
+    src, dst = dirs
+    a, b = make(src, "a.mp3", b"a"), make(src, "b.mp3", b"b")
+    sync_audio_files({"a.mp3": a, "b.mp3": b}, dst)
+    make(dst, "foreign.mp3", b"placed by hand")
+
+    report = sync_audio_files({"a.mp3": a}, dst, prune=False)
+    assert report.removed == []
+    assert (dst / "b.mp3").exists() and (dst / "foreign.mp3").exists()
+    # b.mp3 keeps its entry, so a later full sync doesn't copy it again
+    assert set(load_manifest(dst / MANIFEST_NAME)) == {"a.mp3", "b.mp3"}
+    assert names(sync_audio_files({"a.mp3": a, "b.mp3": b}, dst, prune=False).skipped) == ["a.mp3", "b.mp3"]
+
+
+def test_producer_prune_only_removes_its_own_files(dirs):
+    src, dst = dirs
+    a, b, c = make(src, "a.mp3", b"a"), make(src, "b.mp3", b"b"), make(src, "c.mp3", b"c")
+    sync_audio_files({"a.mp3": a, "b.mp3": b}, dst, producer="one")
+    sync_audio_files({"c.mp3": c}, dst, producer="two")
+    make(dst, "foreign.mp3", b"placed by hand")
+
+    report = sync_audio_files({"a.mp3": a}, dst, producer="one")
+    assert report.removed == ["b.mp3"]
+    assert sorted(p.name for p in dst.iterdir() if not p.name.startswith('.')) == ["a.mp3", "c.mp3", "foreign.mp3"]
+    manifest = load_manifest(dst / MANIFEST_NAME)
+    assert {name: entry["producer"] for name, entry in manifest.items()} == {"a.mp3": "one", "c.mp3": "two"}
+
+
+def test_missing_source_keeps_the_placed_copy(dirs):
+    src, dst = dirs
+    a = make(src, "a.mp3", b"a")
+    sync_audio_files({"a.mp3": a}, dst)
+    a.unlink()
+
+    report = sync_audio_files({"a.mp3": a}, dst)
+    assert names(report.missing) == ["a.mp3"]
+    assert (dst / "a.mp3").exists()
+    assert "a.mp3" in load_manifest(dst / MANIFEST_NAME)
+
+
+def test_remove_audio_files_skips_other_producers(dirs):
+    src, dst = dirs
+    sync_audio_files({"a.mp3": make(src, "a.mp3", b"a")}, dst, producer="one")
+    sync_audio_files({"b.mp3": make(src, "b.mp3", b"b")}, dst, producer="two")
+
+    assert remove_audio_files(dst, ["a.mp3", "b.mp3"], producer="one") == ["a.mp3"]
+    assert not (dst / "a.mp3").exists()
+    assert (dst / "b.mp3").exists()
+    assert set(load_manifest(dst / MANIFEST_NAME)) == {"b.mp3"}
@@ -0,0 +1,45 @@
+import pytest
+
+import bundle_audit
+from check_project import ProjectScanner, resource_dirs
+from pbxproj import PbxProject
+
+
+@pytest.fixture
+def app_dir(checkout, monkeypatch):
+    app_dir = checkout.parent.parent / "StorySage"
+    monkeypatch.setattr(bundle_audit, "CANONICAL_DIRS", {
+        ".mp3": app_dir / "Resources" / "Audio",
+        ".json": app_dir / "Resources" / "Data",
+    })
+    return app_dir
+
+
+def plan(app_dir):
+    # Name and size stand in for the content hash; the copies in this tree are identical
+    hashes = {path: (path.stat().st_size, path.name + str(path.stat().st_size))
+              for path in bundle_audit.iter_resources(app_dir)}
+    return bundle_audit.plan_collapse(hashes)
+
+
+def test_collapse_repoints_the_references_to_removed_copies(checkout, app_dir):
+    actions = plan(app_dir)
+    assert ("delete", app_dir / "stories.json", app_dir / "Resources" / "Data" / "stories.json") in actions
+
+    repointer = bundle_audit.apply_collapse(actions, PbxProject.load(checkout))
+    assert len(repointer.moved) == 11 and repointer.dropped == []
+    assert not (app_dir / "stories.json").exists()
+
+    project = PbxProject.load(checkout)
+    file_ref = next(ref for ref in project.isa("PBXFileReference") if ref.get('path') == "stories.json")
+    assert project.disk_path(file_ref) == str(app_dir / "Resources" / "Data" / "stories.json")
+    # Nothing the project uses went missing, and the Resources copies are registered
+    scanner = ProjectScanner(project).scan(resource_dirs(checkout))
+    assert len(scanner.by_kind()["missing-file"]) == 12
+    assert "unregistered-file" not in scanner.by_kind()
+
+
+def test_references_to_copies_are_found_before_anything_is_deleted(checkout, app_dir):
+    referenced = bundle_audit.referenced_copies(PbxProject.load(checkout), plan(app_dir))
+    assert app_dir / "zoes-brave-voice.mp3" in referenced
+    assert app_dir / "Data" / "stories.json" not in referenced
@@ -0,0 +1,56 @@
+from check_project import ProjectScanner, resource_dirs
+from pbxproj import PbxProject
+
+
+def scan(project_file):
+    project = PbxProject.load(project_file)
+    return project, ProjectScanner(project).scan(resource_dirs(project_file))
+
+
+def findings(scanner, kind):
+    return sorted(scanner.by_kind().get(kind, []))
+
+
+def test_checkout_has_only_the_known_findings(checkout):
+    _, scanner = scan(checkout)
+    # The root copies this tree lacks; the Resources copies aren't what the project bundles
+    assert len(findings(scanner, "missing-file")) == 12
+    assert all("but the project uses StorySage/" in detail
+               for _, detail in findings(scanner, "unregistered-file"))
+    assert not findings(scanner, "dangling-reference") and not findings(scanner, "duplicate-resource")
+
+
+def test_deleted_file_is_reported_at_its_resolved_path(checkout):
+    _, before = scan(checkout)
+    (checkout.parent.parent / "StorySage" / "zoes-brave-voice.mp3").unlink()
+
+    project, scanner = scan(checkout)
+    missing = set(findings(scanner, "missing-file")) - set(findings(before, "missing-file"))
+    assert [detail for _, detail in missing] == ["StorySage/zoes-brave-voice.mp3 is not on disk"]
+    # The copy in Resources/Audio doesn't count, since the project doesn't point there
+    assert (checkout.parent.parent / "StorySage" / "Resources" / "Audio" / "zoes-brave-voice.mp3").exists()
+
+
+def test_prune_drops_missing_files_with_their_build_files(checkout):
+    (checkout.parent.parent / "StorySage" / "zoes-brave-voice.mp3").unlink()
+    project, scanner = scan(checkout)
+    scanner.prune()
+    project.save()
+
+    project, scanner = scan(checkout)
+    assert findings(scanner, "missing-file") == []
+    assert findings(scanner, "dangling-reference") == []
+    assert not any("zoes-brave-voice.mp3" in (obj.comment or "") for obj in project.objects.values())
+    # Files that are where the project looks for them stay registered
+    assert any(ref.get('path') == "daisys-sharing-day.mp3" for ref in project.isa("PBXFileReference"))
+
+
+def test_dangling_and_duplicate_entries(checkout):
+    project = PbxProject.load(checkout)
+    phase = project.build_phase("PBXResourcesBuildPhase")
+    phase.append('files', phase['files'][0], "0123456789ABCDEF01234567")
+    project.save()
+
+    _, scanner = scan(checkout)
+    assert any("0123456789ABCDEF01234567" in detail for _, detail in findings(scanner, "dangling-reference"))
+    assert len(findings(scanner, "duplicate-resource")) == 1
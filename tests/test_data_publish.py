@@ -0,0 +1,98 @@
+import json
+
+from data_publish import json_diff, publish_files, recover
+
+
+def write(path, value):
+    path.write_text(json.dumps(value, indent=2))
+    return path
+
+
+def test_diff_of_story_lists_is_keyed_by_id(tmp_path):
+    old = write(tmp_path / "old.json", [{"id": 1, "title": "A"}, {"id": 2, "title": "B"}, {"id": 3, "title": "C"}])
+    new = write(tmp_path / "new.json", [{"title": "A", "id": 1}, {"id": 3, "title": "C2"}, {"id": 4, "title": "D"}])
+    assert json_diff(old, new) == "+1 -1 ~1 items"
+
+
+def test_diff_of_objects_is_keyed_by_key(tmp_path):
+    old = write(tmp_path / "old.json", {"version": "1.0", "stories_count": 10, "dropped": True})
+    new = write(tmp_path / "new.json", {"version": "1.0", "stories_count": 11, "added": 1})
+    assert json_diff(old, new) == "+1 -1 ~1 keys"
+
+
+def test_list_without_ids_is_not_comparable(tmp_path):
+    old = write(tmp_path / "old.json", [1, 2])
+    new = write(tmp_path / "new.json", [1, 2, 3])
+    assert json_diff(old, new) == ""
+
+
+def test_malformed_or_missing_file_is_not_comparable(tmp_path):
+    good = write(tmp_path / "good.json", [{"id": 1}])
+    bad = tmp_path / "bad.json"
+    bad.write_text('[{"id": 1}, {"id": ')
+    assert json_diff(good, bad) == ""
+    assert json_diff(tmp_path / "missing.json", good) == ""
+
+
+def test_large_list_is_read_across_chunks(tmp_path):
+    stories = [{"id": f"story-{i}", "description": "x" * 2000} for i in range(2000)]
+    old = write(tmp_path / "old.json", stories)
+    stories[10] = dict(stories[10], description="changed")
+    new = write(tmp_path / "new.json", stories[1:])
+    assert json_diff(old, new) == "+0 -1 ~1 items"
+
+
+def make_set(directory, files):
+    directory.mkdir()
+    for name, content in files.items():
+        (directory / name).write_text(content)
+    return directory
+
+
+def contents(directory):
+    return {path.name: path.read_text() for path in directory.iterdir()}
+
+
+def test_recover_rolls_forward_a_swap_interrupted_after_the_backup(tmp_path):
+    dest = tmp_path / "Data"
+    make_set(tmp_path / ".Data.old", {"stories.json": "old"})
+    make_set(tmp_path / ".Data.staging", {"stories.json": "new"})
+
+    recover(dest)
+    assert contents(dest) == {"stories.json": "new"}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["Data"]
+
+
+def test_recover_restores_the_backup_without_a_staged_set(tmp_path):
+    dest = tmp_path / "Data"
+    make_set(tmp_path / ".Data.old", {"stories.json": "old"})
+
+    recover(dest)
+    assert contents(dest) == {"stories.json": "old"}
+
+
+def test_recover_discards_leftovers_next_to_a_live_set(tmp_path):
+    dest = make_set(tmp_path / "Data", {"stories.json": "live"})
+    make_set(tmp_path / ".Data.staging", {"stories.json": "half written"})
+
+    recover(dest)
+    assert contents(dest) == {"stories.json": "live"}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["Data"]
+
+
+def test_publish_writes_only_changed_files(tmp_path):
+    dest = make_set(tmp_path / "Data", {"stories.json": "[]", "metadata.json": "{}", "extra.txt": "kept"})
+    unchanged_mtime = (dest / "metadata.json").stat().st_mtime_ns
+    src = make_set(tmp_path / "src", {"stories.json": '[{"id": 1}]', "metadata.json": "{}",
+                                      "categories.json": "[]"})
+
+    report = publish_files(src.glob("*.json"), dest)
+    assert {f.name: f.status for f in report.files} == {
+        "categories.json": "added", "metadata.json": "unchanged", "stories.json": "changed"}
+    assert report.method in ("exchange", "rename")
+    assert contents(dest) == {"stories.json": '[{"id": 1}]', "metadata.json": "{}", "categories.json": "[]",
+                              "extra.txt": "kept"}
+    assert (dest / "metadata.json").stat().st_mtime_ns == unchanged_mtime
+
+    again = publish_files(src.glob("*.json"), dest)
+    assert again.method == "" and not again.written
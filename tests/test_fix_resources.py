@@ -0,0 +1,66 @@
+from fix_resources import reconcile_audio_files, reconcile_files
+from pbxproj import PbxProject
+
+
+def audio_dir(project_file):
+    return project_file.parent.parent / "StorySage" / "Resources" / "Audio"
+
+
+def reconcile(project_file, remove=False):
+    project = PbxProject.load(project_file)
+    phase = project.build_phase("PBXResourcesBuildPhase")
+    directory = audio_dir(project_file)
+    names = [path.name for path in directory.glob("*.mp3")]
+    result = reconcile_files(project, directory, phase, names, ".mp3", "audio.mp3", remove)
+    project.save()
+    return project, result
+
+
+def test_new_file_is_registered_where_it_is_on_disk(checkout):
+    (audio_dir(checkout) / "new-story.mp3").write_bytes(b"mp3")
+
+    project, (added, removed, shadowed) = reconcile(checkout)
+    assert added == ["new-story.mp3"]
+    assert removed == []
+    # Already bundled from the StorySage/ root, so not added a second time
+    assert "zoes-brave-voice.mp3" in shadowed
+
+    file_ref = next(ref for ref in project.isa("PBXFileReference") if ref.get('path') == "new-story.mp3")
+    assert project.disk_path(file_ref) == str(audio_dir(checkout) / "new-story.mp3")
+    assert project.source_path(project.group_at("StorySage/Resources/Audio")) == "StorySage/Resources/Audio"
+
+
+def test_reconcile_is_idempotent(checkout):
+    (audio_dir(checkout) / "new-story.mp3").write_bytes(b"mp3")
+    reconcile(checkout)
+    text = checkout.read_text()
+
+    _, (added, removed, _) = reconcile(checkout)
+    assert (added, removed) == ([], [])
+    assert checkout.read_text() == text
+    reconcile_audio_files(checkout, audio_dir(checkout))
+    assert checkout.read_text() == text
+
+
+def test_missing_files_are_only_dropped_with_remove(checkout):
+    new_file = audio_dir(checkout) / "new-story.mp3"
+    new_file.write_bytes(b"mp3")
+    reconcile(checkout)
+    new_file.unlink()
+    text = checkout.read_text()
+
+    _, (_, removed, _) = reconcile(checkout)
+    assert removed == ["new-story.mp3"]
+    assert checkout.read_text() == text
+
+    project, (_, removed, _) = reconcile(checkout, remove=True)
+    assert removed == ["new-story.mp3"]
+    assert not any(ref.get('path') == "new-story.mp3" for ref in project.isa("PBXFileReference"))
+    assert not any("new-story.mp3" in (build_file.comment or "") for build_file in project.isa("PBXBuildFile"))
+
+
+def test_dry_run_writes_nothing(checkout):
+    (audio_dir(checkout) / "new-story.mp3").write_bytes(b"mp3")
+    text = checkout.read_text()
+    reconcile_audio_files(checkout, audio_dir(checkout), dry_run=True)
+    assert checkout.read_text() == text
@@ -0,0 +1,69 @@
+import time
+
+from api_client import ApiClient
+from http_cache import ResponseCache
+
+HEADERS = {"ETag": '"v1"', "Content-Type": "application/json"}
+
+
+def test_validators_round_trip(tmp_path):
+    cache = ResponseCache(tmp_path)
+    assert cache.validators("http://api/a") == {}
+    headers = {**HEADERS, "Last-Modified": "Sat, 17 Oct 2026 00:00:00 GMT", "X-Request-Id": "1"}
+    cache.store("http://api/a", b"body", headers)
+    assert cache.validators("http://api/a") == {"If-None-Match": '"v1"',
+                                                "If-Modified-Since": "Sat, 17 Oct 2026 00:00:00 GMT"}
+    # Only the headers needed to serve a 304 as the original are kept
+    assert cache.load("http://api/a") == (b"body", {k: v for k, v in headers.items() if k != "X-Request-Id"})
+    assert cache.hits == 1 and cache.bytes_reused == 4
+
+
+def test_response_without_validator_is_not_kept(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.store("http://api/a", b"body", {"Content-Type": "application/json"})
+    assert cache.validators("http://api/a") == {}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=250)
+    for name in "abc":
+        cache.store(f"http://api/{name}", b"x" * 100, HEADERS)
+        time.sleep(0.01)
+    # c pushed the total past the limit, so a (oldest) went
+    assert cache.validators("http://api/a") == {}
+    cache.load("http://api/b")
+    time.sleep(0.01)
+    cache.store("http://api/d", b"x" * 100, HEADERS)
+    # b was just used, so c goes instead
+    assert cache.validators("http://api/b") and cache.validators("http://api/d")
+    assert cache.validators("http://api/c") == {}
+    assert len(list(tmp_path.glob("*.body"))) == 2
+
+
+def test_index_survives_a_reopen_and_expires_by_ttl(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.store("http://api/a", b"body", HEADERS)
+    cache.flush()
+    assert ResponseCache(tmp_path).validators("http://api/a")
+    assert ResponseCache(tmp_path, ttl=-1).validators("http://api/a") == {}
+
+
+def test_client_serves_304_from_the_cache(tmp_path, mock_server):
+    with ApiClient(mock_server.url, cache=ResponseCache(tmp_path)) as client:
+        first = client.get_json("/api/categories")
+        sent = mock_server.stats["bytes_sent"]
+        response = client.get("/api/categories")
+        assert response.status_code == 200
+        assert response.from_cache
+        assert response.json()["data"] == first
+        assert client.cache.hits == 1
+    # The revalidation itself carried no body
+    assert mock_server.stats["bytes_sent"] == sent
+
+
+def test_streamed_pages_are_cached_and_revalidated(tmp_path, mock_server):
+    with ApiClient(mock_server.url, cache=ResponseCache(tmp_path), page_size=10) as client:
+        first = list(client.stream_items("/api/stories"))
+        second = list(client.stream_items("/api/stories"))
+        assert second == first and len(first) == 30
+        assert client.cache.hits == 3
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+import extract_server_data
+from audio_sync import MANIFEST_NAME, load_manifest, sync_audio_files
+
+
+class FakeClient:
+    """Serves one delta of /api/stories and records what was asked for"""
+
+    def __init__(self, delta):
+        self.delta = delta
+        self.params = None
+
+    def stream_items(self, endpoint, params=None):
+        self.params = params
+        return iter(self.delta)
+
+
+def story(story_id, updated_at, audio=None, **fields):
+    item = {"id": story_id, "title": story_id.title(), "updated_at": updated_at, **fields}
+    if audio:
+        item["audio_url"] = f"http://cdn/audio/{audio}"
+    return item
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    output = tmp_path / "extracted_data"
+    output.mkdir()
+    monkeypatch.setattr(extract_server_data, "OUTPUT_DIR", output)
+    monkeypatch.setattr(extract_server_data, "STATE_FILE", output / ".extract_state")
+    monkeypatch.setattr(extract_server_data, "IOS_PROJECT_DIR", tmp_path / "Resources")
+
+    stories = [extract_server_data.localize_audio_url(s, {}) for s in (
+        story("a", "2026-01-01", "a.mp3"), story("b", "2026-01-02", "shared.mp3"),
+        story("c", "2026-01-03", "shared.mp3"), story("d", "2026-01-04", "d.mp3"))]
+    (output / "stories.json").write_text(json.dumps(stories, indent=2))
+    (output / "audio_mapping.json").write_text(json.dumps({s["id"]: s["local_audio_file"] for s in stories}))
+    extract_server_data.save_state({"high_water_mark": "2026-01-04"})
+    return output
+
+
+def run(monkeypatch, delta):
+    client = FakeClient(delta)
+    monkeypatch.setattr(extract_server_data, "get_client", lambda: client)
+    return client, extract_server_data.extract_stories_incremental()
+
+
+def test_changes_are_merged_in_place_and_tombstones_removed(workdir, monkeypatch):
+    client, (count, changed, deleted, orphaned) = run(monkeypatch, [
+        story("b", "2026-02-01", "shared.mp3", title="B2"),
+        story("a", "2026-02-02", deleted=True),
+        story("e", "2026-02-03", "e.mp3"),
+        story("zzz", "2026-02-04", deleted_at="2026-02-04"),
+    ])
+    assert client.params == {extract_server_data.DELTA_PARAM: "2026-01-04"}
+    assert (count, changed, deleted) == (4, ["b", "e"], ["a"])
+    assert orphaned == {"a.mp3"}
+
+    stories = json.loads((workdir / "stories.json").read_text())
+    assert [s["id"] for s in stories] == ["b", "c", "d", "e"]
+    assert stories[0]["title"] == "B2" and stories[0]["local_audio_file"] == "shared.mp3"
+    mapping = json.loads((workdir / "audio_mapping.json").read_text())
+    assert mapping == {"b": "shared.mp3", "c": "shared.mp3", "d": "d.mp3", "e": "e.mp3"}
+    assert extract_server_data.load_state()["high_water_mark"] == "2026-02-04"
+
+
+def test_audio_still_used_by_another_story_is_not_orphaned(workdir, monkeypatch):
+    _, (_, _, deleted, orphaned) = run(monkeypatch, [story("b", "2026-02-01", deleted=True)])
+    assert deleted == ["b"] and orphaned == set()
+
+    _, (_, _, deleted, orphaned) = run(monkeypatch, [story("c", "2026-02-02", deleted=True)])
+    assert deleted == ["c"] and orphaned == {"shared.mp3"}
+
+
+def test_empty_delta_leaves_files_alone(workdir, monkeypatch):
+    before = (workdir / "stories.json").stat().st_mtime_ns
+    _, result = run(monkeypatch, [])
+    assert result == (4, [], [], set())
+    assert (workdir / "stories.json").stat().st_mtime_ns == before
+
+
+def test_orphaned_audio_is_removed_with_its_manifest_entry(workdir, monkeypatch, tmp_path):
+    source = tmp_path / "audio_files"
+    source.mkdir()
+    for name in ("a.mp3", "d.mp3"):
+        (source / name).write_bytes(name.encode())
+    audio_dir = extract_server_data.IOS_PROJECT_DIR / "Audio"
+    audio_dir.mkdir(parents=True)
+    sync_audio_files({name: source / name for name in ("a.mp3", "d.mp3")}, audio_dir,
+                     producer=extract_server_data.AUDIO_PRODUCER)
+
+    _, (_, _, _, orphaned) = run(monkeypatch, [story("a", "2026-02-01", deleted=True)])
+    assert extract_server_data.remove_orphaned_audio(orphaned) == ["a.mp3"]
+    assert not (audio_dir / "a.mp3").exists() and (audio_dir / "d.mp3").exists()
+    assert set(load_manifest(audio_dir / MANIFEST_NAME)) == {"d.mp3"}
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from json_stream import iter_items
+
+PAGE = {"data": [{"id": 1, "title": "Zoë's \"Brave\" Voice", "duration": -3.5e2},
+                 {"id": 2, "tags": ["a", "b"], "nested": {"x": [1, 2, {}]}},
+                 {"id": 30000000001, "score": 12345}],
+        "pagination": {"page": 1, "total_pages": 3, "has_more": True}}
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+def test_items_split_across_chunks(size):
+    body = json.dumps(PAGE, ensure_ascii=False).encode('utf-8')
+    meta = {}
+    assert list(iter_items(chunked(body, size), meta)) == PAGE["data"]
+    assert meta == {"pagination": PAGE["pagination"]}
+
+
+@pytest.mark.parametrize("size", [1, 4])
+def test_number_at_chunk_boundary_is_not_cut_short(size):
+    assert list(iter_items(chunked(b"[12345, 6.5e10, -7]", size))) == [12345, 6.5e10, -7]
+
+
+def test_multibyte_character_split_between_chunks():
+    body = json.dumps([{"title": "café ☕"}], ensure_ascii=False).encode('utf-8')
+    split = body.index("☕".encode('utf-8')) + 1
+    assert list(iter_items([body[:split], body[split:]])) == [{"title": "café ☕"}]
+
+
+def test_bare_array_and_empty_bodies():
+    assert list(iter_items([b" [ ] "])) == []
+    assert list(iter_items([b'{"data": []}'])) == []
+    assert list(iter_items([b"{}"])) == []
+    assert list(iter_items([b"[1,", b" 2]"])) == [1, 2]
+
+
+def test_keys_after_the_array_are_collected():
+    meta = {}
+    items = list(iter_items(chunked(b'{"data": [{"id": 1}], "next_cursor": "abc"}', 5), meta))
+    assert items == [{"id": 1}]
+    assert meta == {"next_cursor": "abc"}
+
+
+def test_truncated_body_raises():
+    with pytest.raises(ValueError):
+        list(iter_items(chunked(b'{"data": [{"id": 1}, {"id":', 4)))
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from pbxproj import PbxParseError, PbxProject, derive_id
+
+PROJECT_FILE = Path(__file__).resolve().parent.parent / "StorySage.xcodeproj" / "project.pbxproj"
+
+
+@pytest.fixture
+def text():
+    return PROJECT_FILE.read_text(encoding='utf-8')
+
+
+def test_unchanged_project_round_trips_byte_for_byte(text, tmp_path):
+    project = PbxProject(text)
+    assert project.to_text() == text
+
+    path = tmp_path / "project.pbxproj"
+    path.write_text(text, encoding='utf-8')
+    project = PbxProject.load(path)
+    assert project.save() is False
+    assert path.read_text(encoding='utf-8') == text
+
+
+def test_only_edited_objects_are_reserialized(text):
+    project = PbxProject(text)
+    group = project.find_group("StorySage/App")
+    group['children'] = list(group['children'])
+    # Rewritten the way Xcode writes it, so the file is unchanged
+    assert project.to_text() == text
+
+
+def test_added_file_is_merged_in_id_order_and_survives_a_reparse(text):
+    project = PbxProject(text)
+    group = project.find_group("StorySage/App")
+    phase = project.build_phase("PBXSourcesBuildPhase")
+    file_ref, build_file = project.add_file(group, "Extra File.swift", "sourcecode.swift", phase)
+
+    output = project.to_text()
+    assert f'{file_ref.id} /* Extra File.swift */ = {{isa = PBXFileReference; lastKnownFileType = ' \
+           f'sourcecode.swift; path = "Extra File.swift"; sourceTree = "<group>"; }};' in output
+    reparsed = PbxProject(output)
+    assert reparsed[build_file.id]['fileRef'] == file_ref.id
+    assert file_ref.id in reparsed[group.id]['children']
+    # New objects go in among the existing ones in ID order
+    following = min((ref.id for ref in PbxProject(text).isa("PBXFileReference") if ref.id > file_ref.id),
+                    default=None)
+    if following:
+        assert output.index(f"\t\t{file_ref.id} ") < output.index(f"\t\t{following} ")
+    # Everything else is still byte-identical
+    reparsed.remove_files([file_ref.id])
+    assert reparsed.to_text() == text
+
+
+def test_ids_are_deterministic(text):
+    ids = []
+    for _ in range(2):
+        project = PbxProject(text)
+        ids.append(project.add_file(project.main_group, "a.mp3", "audio.mp3")[0].id)
+    assert ids[0] == ids[1]
+
+
+def test_allocate_id_skips_ids_already_in_the_file(text):
+    key = ("StorySage", "", "a.mp3", "PBXFileReference")
+    taken = derive_id(*key)
+    # Not defined here, only mentioned, e.g. by an object in another project
+    text += f"// {taken}\n"
+    project = PbxProject(text)
+    assert project.allocate_id(*key) == derive_id(*key, "1")
+    # Handed out IDs are taken too
+    assert project.allocate_id(*key) == derive_id(*key, "2")
+
+
+def test_allocate_id_skips_defined_objects(text):
+    project = PbxProject(text)
+    existing = project.add("PBXGroup", {"children": []}, "Probe", derive_id("probe"))
+    assert project.allocate_id("probe") != existing.id
+
+
+def test_parse_error_names_the_line():
+    with pytest.raises(PbxParseError, match="line 3"):
+        PbxProject("// !$*UTF8*$!\n{\n\tobjects = { ABC = ; };\n}\n")
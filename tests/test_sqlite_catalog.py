@@ -0,0 +1,51 @@
+import sqlite3
+
+import pytest
+
+from sqlite_catalog import fts_query, search_stories, write_catalog_db
+
+CATEGORIES = {"categories": [{"id": "firefly-forest", "name": "Firefly Forest", "description": "",
+                              "color": "#000000", "icon": "sparkles", "gradeLevels": ["grade_prek"]}]}
+
+
+def story(story_id, title, tags=()):
+    return {"id": story_id, "title": title, "description": "A story.", "category": "firefly-forest",
+            "gradeLevel": "grade_prek", "duration": 60, "audioFile": f"{story_id}.mp3",
+            "keyLessons": ["Be kind"], "tags": list(tags)}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    db_path = tmp_path / "catalog.db"
+    write_catalog_db([story("a", "Don't Give Up", ["courage"]), story("b", "Luna's Worried Night", ["worry"]),
+                      story("c", "The Tiny Climber", ["NOT", "courage"])], CATEGORIES, db_path)
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
+
+
+def ids(stories):
+    return sorted(s['id'] for s in stories)
+
+
+def test_plain_words_match(conn):
+    assert ids(search_stories(conn, "courage")) == ["a", "c"]
+    assert ids(search_stories(conn, "tiny courage")) == ["c"]
+
+
+@pytest.mark.parametrize("text", ["don't", '"foo', "luna's", "NOT", "AND OR", "tiny*", "title:", "(", "-"])
+def test_fts_syntax_in_user_text_does_not_raise(conn, text):
+    search_stories(conn, text)
+
+
+def test_apostrophe_and_operator_words_are_literal(conn):
+    assert ids(search_stories(conn, "don't")) == ["a"]
+    assert ids(search_stories(conn, "NOT courage")) == ["c"]
+
+
+def test_blank_text_finds_nothing(conn):
+    assert search_stories(conn, "   ") == []
+
+
+def test_fts_query_escapes_quotes():
+    assert fts_query('say "hi"') == '"say" """hi"""'
@@ -0,0 +1,50 @@
+import pytest
+
+from watch_resources import AUDIO_DIR, DATA_DIR, RESCAN, WATCHED, ProjectSync
+
+
+@pytest.fixture
+def sync(checkout):
+    resources = checkout.parent.parent / "StorySage" / "Resources"
+    watched = {resources / "Audio": WATCHED[AUDIO_DIR], resources / "Data": WATCHED[DATA_DIR]}
+    sync = ProjectSync(checkout, watched)
+    sync.reconcile()
+    return sync
+
+
+def test_batches_add_and_remove_at_the_watched_path(sync):
+    audio = next(iter(sync.watched))
+    (audio / "new-story.mp3").write_bytes(b"mp3")
+    assert sync.apply({audio: {"new-story.mp3"}}) == (["new-story.mp3"], [])
+
+    file_ref = sync.registered[audio]["new-story.mp3"]
+    assert sync.project.disk_path(file_ref) == str(audio / "new-story.mp3")
+    # Already registered, so nothing to write
+    text = sync.project_file.read_text()
+    assert sync.apply({audio: {"new-story.mp3"}}) == ([], [])
+    assert sync.project_file.read_text() == text
+
+    (audio / "new-story.mp3").unlink()
+    assert sync.apply({audio: {"new-story.mp3"}}) == ([], ["new-story.mp3"])
+    assert file_ref.id not in sync.project
+
+
+def test_names_bundled_from_elsewhere_are_not_added_again(sync):
+    audio = next(iter(sync.watched))
+    text = sync.project_file.read_text()
+    assert sync.apply({audio: {"zoes-brave-voice.mp3"}}) == ([], [])
+    assert sync.project_file.read_text() == text
+
+
+def test_rescan_picks_up_a_replaced_directory(sync):
+    data = list(sync.watched)[1]
+    (data / "extra.json").write_text("{}")
+    assert sync.apply({data: {RESCAN}}) == (["extra.json"], [])
+
+
+def test_project_rewritten_elsewhere_is_reloaded(sync):
+    audio = next(iter(sync.watched))
+    sync.project_file.write_text(sync.project_file.read_text() + "\n")
+    (audio / "new-story.mp3").write_bytes(b"mp3")
+    assert sync.apply({audio: {"new-story.mp3"}}) == (["new-story.mp3"], [])
+    assert "new-story.mp3" in sync.project_file.read_text()
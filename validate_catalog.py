@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Referential-integrity check for the bundled catalog.
+Indexes categories.json, the audio directory and audio_mapping.json once,
+then checks every story against them in a single pass: its category
+exists, the category's gradeLevels cover the story's grade, and its audio
+file is on disk. Reads both the extract_data.py layout ({"stories": [...]},
+camelCase fields) and the extract_server_data.py one (bare arrays,
+snake_case fields, audio_mapping.json). Every violation is collected, so
+one run reports them all; the exit status is 1 if there were any, so it
+can gate a build.
+
+Usage:
+    python3 validate_catalog.py
+    python3 validate_catalog.py --data-dir extracted_data --audio-dir StorySage/Resources/Audio
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+DATA_DIR = PROJECT_ROOT / "StorySage" / "Resources" / "Data"
+AUDIO_DIR = PROJECT_ROOT / "StorySage" / "Resources" / "Audio"
+DEFAULT_LIMIT = 20
+
+
+def _field(item, *names):
+    for name in names:
+        value = item.get(name)
+        if value:
+            return value
+    return None
+
+
+def load_items(path, key):
+    """The array in a JSON file that is either bare or wrapped as {key: [...]}"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get(key, data.get('data', []))
+    return data
+
+
+def audio_index(audio_dir):
+    """Names of the files in the audio directory, from one directory scan"""
+    try:
+        with os.scandir(audio_dir) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
+class CatalogValidator:
+    """
+    Collects violations as (kind, subject, detail). Each check is a dict or
+    set lookup, so a run is linear in stories + categories + audio files.
+    """
+
+    def __init__(self, categories, audio_files):
+        self.violations = []
+        self.categories = {}
+        for category in categories:
+            category_id = category.get('id')
+            if category_id in self.categories:
+                self.add("duplicate-category", category_id, "category id appears more than once")
+            grades = _field(category, 'gradeLevels', 'grade_levels')
+            self.categories[category_id] = set(grades) if grades is not None else None
+        self.audio_files = audio_files
+        self.story_ids = set()
+        self.story_audio = {}
+
+    def add(self, kind, subject, detail):
+        self.violations.append((kind, subject, detail))
+
+    def check_story(self, story):
+        story_id = story.get('id')
+        if story_id is None:
+            self.add("missing-id", story.get('title', '?'), "story has no id")
+        elif str(story_id) in self.story_ids:
+            self.add("duplicate-story", story_id, "story id appears more than once")
+        else:
+            # audio_mapping.json keys are strings, so index ids as strings
+            self.story_ids.add(str(story_id))
+
+        category = _field(story, 'category', 'category_id')
+        grade = _field(story, 'gradeLevel', 'grade_level')
+        if category not in self.categories:
+            self.add("unknown-category", story_id, f"category {category!r} is not in categories.json")
+        else:
+            grades = self.categories[category]
+            # A category without a gradeLevels list accepts every grade
+            if grades is not None and grade not in grades:
+                self.add("grade-not-covered", story_id,
+                         f"{grade!r} is not among {category!r} gradeLevels {sorted(grades)}")
+
+        audio = _field(story, 'audioFile', 'local_audio_file')
+        if audio:
+            self.story_audio[str(story_id)] = audio
+            if audio not in self.audio_files:
+                self.add("missing-audio", story_id, f"{audio} is not in the audio directory")
+
+    def check_audio_mapping(self, mapping):
+        for story_id, audio in mapping.items():
+            story_id = str(story_id)
+            if story_id not in self.story_ids:
+                self.add("mapping-unknown-story", story_id, f"mapped to {audio} but not in stories.json")
+                continue
+            story_audio = self.story_audio.get(story_id)
+            if story_audio and story_audio != audio:
+                self.add("mapping-mismatch", story_id,
+                         f"audio_mapping says {audio}, the story says {story_audio}")
+            # The story's own file was checked with the story
+            if audio != story_audio and audio not in self.audio_files:
+                self.add("missing-audio", story_id, f"audio_mapping target {audio} is not on disk")
+
+    def by_kind(self):
+        grouped = defaultdict(list)
+        for kind, subject, detail in self.violations:
+            grouped[kind].append((subject, detail))
+        return grouped
+
+
+def validate(data_dir=DATA_DIR, audio_dir=AUDIO_DIR):
+    """Run every check over one data directory; returns the CatalogValidator"""
+    data_dir = Path(data_dir)
+    validator = CatalogValidator(load_items(data_dir / "categories.json", "categories"),
+                                 audio_index(audio_dir))
+    for story in load_items(data_dir / "stories.json", "stories"):
+        validator.check_story(story)
+
+    mapping_path = data_dir / "audio_mapping.json"
+    if mapping_path.exists():
+        with open(mapping_path, encoding='utf-8') as f:
+            validator.check_audio_mapping(json.load(f))
+    return validator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check references between stories, categories and audio")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="directory holding stories.json and categories.json")
+    parser.add_argument("--audio-dir", type=Path, default=AUDIO_DIR)
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT,
+                        help=f"violations listed per kind, 0 for all (default: {DEFAULT_LIMIT})")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        validator = validate(args.data_dir, args.audio_dir)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read the catalog: {e}")
+        sys.exit(2)
+    elapsed = time.perf_counter() - start
+
+    print(f"🔍 Checked {len(validator.story_ids)} stories, {len(validator.categories)} categories "
+          f"and {len(validator.audio_files)} audio files in {elapsed:.2f}s")
+    grouped = validator.by_kind()
+    if not grouped:
+        print("✅ No integrity violations")
+        return
+
+    print(f"\n❌ {len(validator.violations)} violations")
+    for kind, items in sorted(grouped.items()):
+        print(f"\n  {kind}: {len(items)}")
+        shown = items if args.limit <= 0 else items[:args.limit]
+        for subject, detail in shown:
+            print(f"    {subject}: {detail}")
+        if len(shown) < len(items):
+            print(f"    ... and {len(items) - len(shown)} more")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Watch Resources/Audio and Resources/Data and keep project.pbxproj in sync
+as files come and go, instead of rerunning fix_resources.py or
+add_json_to_project.py by hand.
+
+Events only record the touched file name, so each one costs the same
+however large the project is. Once the directories have been quiet for
+--debounce seconds the batch is applied: each name is added or removed
+according to whether it is on disk now, through an in-memory index of
+the registered files, and the project is written once, atomically. The
+parsed project is kept between batches and only re-read if something
+else (Xcode) rewrote the file.
+
+Uses inotify/FSEvents through watchdog when it is installed and falls
+back to polling the two directories otherwise.
+
+Registered files that are already missing at startup are kept unless
+--remove-missing is given; files deleted while it runs are dropped.
+
+Usage:
+    python3 watch_resources.py                 # reconcile, then watch
+    python3 watch_resources.py --poll 1.0      # force polling
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from fix_resources import (PROJECT_FILE, AUDIO_DIR, add_resource, built_files, reconcile_files, registered_files,
+                           resource_group)
+from pbxproj import PbxProject
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+DATA_DIR = AUDIO_DIR.parent / "Data"
+# Watched directory -> (suffix, lastKnownFileType)
+WATCHED = {
+    AUDIO_DIR: (".mp3", "audio.mp3"),
+    DATA_DIR: (".json", "text.json"),
+}
+DEBOUNCE = 0.5
+# Queued in place of a name when a whole watched directory was replaced
+RESCAN = None
+
+
+class ChangeQueue:
+    """Touched names per directory, coalesced until the watch goes quiet"""
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self._pending = {}
+        self._last = 0.0
+
+    def add(self, directory, name):
+        with self._changed:
+            self._pending.setdefault(directory, set()).add(name)
+            self._last = time.monotonic()
+            self._changed.notify()
+
+    def wait(self, debounce, stop):
+        """Block until there are changes and none for debounce seconds; returns {directory: names}"""
+        with self._changed:
+            while not stop.is_set():
+                if not self._pending:
+                    self._changed.wait(0.5)
+                    continue
+                quiet = time.monotonic() - self._last
+                if quiet >= debounce:
+                    batch, self._pending = self._pending, {}
+                    return batch
+                self._changed.wait(debounce - quiet)
+            return {}
+
+
+class _EventHandler(FileSystemEventHandler):
+    """
+    Feeds watchdog events for watched suffixes into the queue. It is
+    also scheduled on the parents of the watched directories: data_publish
+    swaps Resources/Data for a staged copy, which silently ends the watch
+    on the old directory, so a watched directory being created, moved or
+    deleted queues a rescan, and watch() re-schedules it.
+    """
+
+    def __init__(self, queue, watched):
+        super().__init__()
+        self.queue = queue
+        self.watched = {str(directory): suffix for directory, (suffix, _) in watched.items()}
+
+    def on_any_event(self, event):
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if not path:
+                continue
+            path = os.fsdecode(path)
+            if event.is_directory:
+                if path in self.watched:
+                    self.queue.add(Path(path), RESCAN)
+                continue
+            directory, name = os.path.split(path)
+            suffix = self.watched.get(directory)
+            if suffix and name.endswith(suffix):
+                self.queue.add(Path(directory), name)
+
+
+def _snapshot(directory, suffix):
+    snapshot = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(suffix) and entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        pass
+    return snapshot
+
+
+def poll(queue, watched, interval, stop):
+    """Polling fallback: diff a directory listing every interval seconds"""
+    snapshots = {directory: _snapshot(directory, suffix) for directory, (suffix, _) in watched.items()}
+    while not stop.wait(interval):
+        for directory, (suffix, _) in watched.items():
+            current = _snapshot(directory, suffix)
+            previous = snapshots[directory]
+            for name in current.keys() ^ previous.keys():
+                queue.add(directory, name)
+            for name in current.keys() & previous.keys():
+                if current[name] != previous[name]:
+                    queue.add(directory, name)
+            snapshots[directory] = current
+
+
+class ProjectSync:
+    """The parsed project plus an index of the resources registered in it"""
+
+    def __init__(self, project_file=PROJECT_FILE, watched=WATCHED, remove_missing=False):
+        self.project_file = Path(project_file)
+        self.watched = watched
+        self.remove_missing = remove_missing
+        self.project = None
+        self._stat = None
+        # Watched directory -> names last seen there, for rescans
+        self.on_disk = {directory: set(_snapshot(directory, suffix))
+                        for directory, (suffix, _) in watched.items()}
+
+    def _file_stat(self):
+        stat = self.project_file.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        self.project = PbxProject.load(self.project_file)
+        self._stat = self._file_stat()
+        self.phase = self.project.build_phase("PBXResourcesBuildPhase")
+        if self.phase is None:
+            raise ValueError(f"{self.project_file} has no Resources build phase")
+        self.in_phase = built_files(self.project, self.phase)
+        # Watched directory -> {name: file reference resolving there}, the
+        # names the phase copies from somewhere else, and its group once needed
+        self.registered, self.shadowed, self.groups = {}, {}, {}
+        for directory, (suffix, _) in self.watched.items():
+            here, elsewhere = registered_files(self.project, directory, suffix)
+            self.registered[directory] = here
+            self.shadowed[directory] = {name for name, file_refs in elsewhere.items()
+                                        if any(file_ref.id in self.in_phase for file_ref in file_refs)}
+
+    def _current(self):
+        """The project, re-read if the file changed since it was last read or written"""
+        if self.project is None or self._file_stat() != self._stat:
+            self._load()
+        return self.project
+
+    def _save(self):
+        if self.project.save(self.project_file):
+            self._stat = self._file_stat()
+            return True
+        return False
+
+    def reconcile(self):
+        """
+        Full pass over both directories with fix_resources.reconcile_files.
+        Registered files that were already missing are only dropped with
+        remove_missing; returns (added, removed, kept missing, shadowed).
+        """
+        project = self._current()
+        added, removed, missing, shadowed = [], [], [], []
+        for directory, (suffix, file_type) in self.watched.items():
+            names = list(_snapshot(directory, suffix))
+            batch_added, batch_removed, batch_shadowed = reconcile_files(project, directory, self.phase, names,
+                                                                         suffix, file_type, self.remove_missing)
+            added += batch_added
+            (removed if self.remove_missing else missing).extend(batch_removed)
+            shadowed += batch_shadowed
+        if self._save():
+            self._load()
+        return added, removed, missing, shadowed
+
+    def apply(self, batch):
+        """Add or remove each touched name by whether it is on disk; one write per batch"""
+        project = self._current()
+        added, removed = [], {}
+        for directory, names in batch.items():
+            suffix, file_type = self.watched[directory]
+            known = self.on_disk[directory]
+            registered = self.registered[directory]
+            if RESCAN in names:
+                # The directory was replaced wholesale; diff its listing
+                names = (names - {RESCAN}) | (set(_snapshot(directory, suffix)) ^ known)
+            for name in sorted(names):
+                file_ref = registered.get(name)
+                if (directory / name).is_file():
+                    known.add(name)
+                    if (file_ref is not None and file_ref.id in self.in_phase) or name in self.shadowed[directory]:
+                        continue
+                    if directory not in self.groups:
+                        self.groups[directory] = resource_group(project, directory)
+                    file_ref = add_resource(project, self.groups[directory], self.phase, name, file_type, file_ref)
+                    registered[name] = file_ref
+                    self.in_phase.add(file_ref.id)
+                    added.append(name)
+                else:
+                    known.discard(name)
+                    if file_ref is not None:
+                        del registered[name]
+                        self.in_phase.discard(file_ref.id)
+                        removed[file_ref.id] = name
+        if removed:
+            project.remove_files(removed)
+        self._save()
+        return added, list(removed.values())
+
+
+def report(added, removed):
+    for name in added:
+        print(f"  + {name}")
+    for name in removed:
+        print(f"  - {name}")
+    if added or removed:
+        print(f"✅ Project updated: {len(added)} added, {len(removed)} removed", flush=True)
+
+
+def _reschedule(observer, watches, handler, directory):
+    """Watch the directory now at a watched path, replacing the watch on the one that left"""
+    try:
+        observer.unschedule(watches.pop(directory))
+    except (KeyError, OSError):
+        pass
+    try:
+        watches[directory] = observer.schedule(handler, str(directory), recursive=False)
+    except OSError:
+        # Gone for now; the parent's watch queues another rescan when it's back
+        pass
+
+
+def watch(project_file=PROJECT_FILE, watched=WATCHED, debounce=DEBOUNCE, poll_interval=None, stop=None,
+          remove_missing=False):
+    """Reconcile once, then apply debounced batches until stop is set (or Ctrl-C)"""
+    stop = stop or threading.Event()
+    sync = ProjectSync(project_file, watched, remove_missing)
+    queue = ChangeQueue()
+
+    added, removed, missing, shadowed = sync.reconcile()
+    report(added, removed)
+    if shadowed:
+        print(f"⚠️  Not adding {len(shadowed)} files the project already bundles from another location "
+              f"({', '.join(shadowed[:5])}{', ...' if len(shadowed) > 5 else ''}); "
+              f"bundle_audit.py --collapse --apply moves them", flush=True)
+    if missing:
+        print(f"⚠️  Keeping {len(missing)} registered files that aren't on disk "
+              f"({', '.join(missing[:5])}{', ...' if len(missing) > 5 else ''}); "
+              f"pass --remove-missing to drop them", flush=True)
+
+    if Observer is not None and poll_interval is None:
+        observer = Observer()
+        handler = _EventHandler(queue, watched)
+        # Not recursive: watchdog's recursive inotify bookkeeping breaks on
+        # the RENAME_EXCHANGE data_publish uses
+        for parent in {directory.parent for directory in watched}:
+            observer.schedule(handler, str(parent), recursive=False)
+        watches = {directory: observer.schedule(handler, str(directory), recursive=False)
+                   for directory in watched}
+        observer.start()
+        print(f"👀 Watching {', '.join(str(d) for d in watched)}", flush=True)
+    else:
+        observer = None
+        interval = poll_interval or 1.0
+        threading.Thread(target=poll, args=(queue, watched, interval, stop), daemon=True).start()
+        print(f"👀 Polling {', '.join(str(d) for d in watched)} every {interval}s", flush=True)
+
+    try:
+        while not stop.is_set():
+            batch = queue.wait(debounce, stop)
+            if observer is not None:
+                for directory, names in batch.items():
+                    if RESCAN in names:
+                        _reschedule(observer, watches, handler, directory)
+            if batch:
+                report(*sync.apply(batch))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep project.pbxproj in sync with Resources/Audio and Resources/Data")
+    parser.add_argument("--project", type=Path, default=PROJECT_FILE, help="project.pbxproj to update")
+    parser.add_argument("--audio-dir", type=Path, default=AUDIO_DIR)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE,
+                        help="seconds without changes before a batch is applied")
+    parser.add_argument("--poll", type=float, metavar="SECONDS",
+                        help="poll instead of using watchdog (the default when it isn't installed)")
+    parser.add_argument("--remove-missing", action="store_true",
+                        help="at startup, drop references to files that are already gone")
+    args = parser.parse_args()
+
+    watched = {
+        args.audio_dir.resolve(): WATCHED[AUDIO_DIR],
+        args.data_dir.resolve(): WATCHED[DATA_DIR],
+    }
+    try:
+        watch(args.project, watched, args.debounce, args.poll, remove_missing=args.remove_missing)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()